@@ -0,0 +1,122 @@
+"""
+Cache persistente das análises do Gemini, para não reenviar a mesma vaga.
+
+A chave é um hash (SHA-256) do texto enviado (descrição limpa, título e empresa),
+do prompt do sistema (que inclui o currículo), do modelo e da configuração de
+geração: mudar o currículo, o prompt ou o modelo gera chaves novas, e as entradas
+antigas deixam de ser usadas até saírem pelo limite de tamanho.
+
+O cache é opcional: ANALYSIS_CACHE_PATH vazio ou ausente (padrão) o desativa.
+Para ativar, defina o caminho do arquivo SQLite, por exemplo
+ANALYSIS_CACHE_PATH=/var/lib/scraper/analysis_cache.sqlite3 (o diretório precisa
+existir e aceitar escrita). Acima de ANALYSIS_CACHE_MAX_ENTRIES, as entradas usadas
+há mais tempo são removidas (LRU).
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_CACHE_PATH = os.environ.get("ANALYSIS_CACHE_PATH", "")
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.environ.get("ANALYSIS_CACHE_MAX_ENTRIES", "20000"))
+EVICTION_SLACK = 0.1  # Fração removida além do limite, para não limpar a cada gravação
+
+
+def analysis_cache_key(input_text, system_prompt, model_name, generation_config):
+    """Hash que identifica uma análise: entrada, prompt do sistema, modelo e configuração"""
+    digest = hashlib.sha256()
+    for part in (input_text, system_prompt, model_name, generation_config):
+        encoded = part.encode('utf-8')
+        # Prefixo com o tamanho: as partes não se confundem ao serem concatenadas
+        digest.update(len(encoded).to_bytes(8, 'little'))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Cache de análises em SQLite com limite de entradas e remoção LRU.
+    Seguro para várias threads (uma conexão protegida por lock).
+    """
+
+    def __init__(self, path, max_entries=ANALYSIS_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS analyses ("
+                " key TEXT PRIMARY KEY,"
+                " analysis TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_used_at REAL NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS analyses_last_used ON analyses (last_used_at)")
+            self.entries = self.connection.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def __len__(self):
+        return self.entries
+
+    def get(self, key):
+        """Análise armazenada para a chave (dict), ou None"""
+        with self.lock, self.connection:
+            row = self.connection.execute("SELECT analysis FROM analyses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute("UPDATE analyses SET last_used_at = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key, analysis):
+        """Armazena a análise e, acima do limite, remove as entradas usadas há mais tempo"""
+        now = time.time()
+        with self.lock, self.connection:
+            exists = self.connection.execute("SELECT 1 FROM analyses WHERE key = ?", (key,)).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO analyses (key, analysis, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(analysis, ensure_ascii=False), now, now)
+            )
+            if not exists:
+                self.entries += 1
+            if self.entries > self.max_entries:
+                # A contagem local não vê gravações de outros processos: recontar antes de remover
+                self.entries = self.connection.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+            if self.entries > self.max_entries:
+                excess = self.entries - self.max_entries + int(self.max_entries * EVICTION_SLACK)
+                removed = self.connection.execute(
+                    "DELETE FROM analyses WHERE key IN "
+                    "(SELECT key FROM analyses ORDER BY last_used_at LIMIT ?)", (excess,)
+                ).rowcount
+                self.entries -= removed
+                logger.info(f"Cache de análises: {removed} entradas antigas removidas")
+
+    def clear(self):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM analyses")
+            self.entries = 0
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_analysis_cache():
+    """Cache de análises compartilhado (aberto na primeira utilização), ou None se desativado"""
+    global _cache
+    if not ANALYSIS_CACHE_PATH:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnalysisCache(ANALYSIS_CACHE_PATH)
+                logger.info(f"Cache de análises em {ANALYSIS_CACHE_PATH} ({len(_cache)} entradas)")
+    return _cache
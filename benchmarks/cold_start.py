@@ -0,0 +1,105 @@
+"""
+Mede o tempo de inicialização a frio (cold start) da aplicação.
+
+Cada medição roda em um interpretador Python novo, importando o módulo indicado
+(por padrão main.py e linkedin_scraper.py), em três cenários de rede:
+
+- network:   rede do ambiente, sem alterações
+- offline:   sem rede; toda conexão falha imediatamente (ex.: sem rota)
+- blackhole: rede "pendurada"; toda conexão espera o timeout antes de falhar
+
+Uso:
+    python benchmarks/cold_start.py [--runs 5] [--modules main linkedin_scraper]
+                                    [--modes network offline blackhole] [--json saida.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Código executado no processo filho antes da importação, para simular cada cenário de rede
+NETWORK_PATCHES = {
+    'network': '',
+    'offline': '''
+import socket
+def _no_network(*args, **kwargs):
+    raise OSError(101, "Network is unreachable (cold_start offline)")
+socket.socket.connect = _no_network
+socket.getaddrinfo = _no_network
+''',
+    'blackhole': '''
+import socket, time
+def _resolve(host, port, *args, **kwargs):
+    # Endereço de documentação (TEST-NET-1): a resolução "funciona", a conexão não
+    return [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', ('192.0.2.1', port or 0))]
+def _blackhole(self, *args, **kwargs):
+    timeout = self.gettimeout()
+    time.sleep(timeout if timeout is not None else 60)
+    raise socket.timeout("timed out (cold_start blackhole)")
+socket.getaddrinfo = _resolve
+socket.socket.connect = _blackhole
+''',
+}
+
+CHILD_TEMPLATE = '''
+import logging, time
+logging.disable(logging.CRITICAL)
+{patch}
+started_at = time.perf_counter()
+import {module}
+print("COLD_START_SECONDS", time.perf_counter() - started_at)
+'''
+
+
+def measure_once(module, mode, timeout):
+    """Importa o módulo em um interpretador novo e retorna o tempo de importação em segundos"""
+    env = dict(os.environ)
+    # main.py cria as tabelas na importação; sem banco configurado, usar SQLite em memória
+    env.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+    code = CHILD_TEMPLATE.format(patch=NETWORK_PATCHES[mode], module=module)
+    completed = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=timeout
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith('COLD_START_SECONDS'):
+            return float(line.split()[1])
+    raise RuntimeError(f"Falha ao importar {module} ({mode}): {completed.stderr.strip()[-500:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Medições por módulo e cenário')
+    parser.add_argument('--modules', nargs='+', default=['main', 'linkedin_scraper'])
+    parser.add_argument('--modes', nargs='+', default=list(NETWORK_PATCHES), choices=list(NETWORK_PATCHES))
+    parser.add_argument('--timeout', type=float, default=120, help='Tempo máximo (s) de cada importação')
+    parser.add_argument('--json', dest='json_path', help='Arquivo para gravar os resultados em JSON')
+    args = parser.parse_args()
+
+    results = []
+    for module in args.modules:
+        for mode in args.modes:
+            samples = [measure_once(module, mode, args.timeout) for _ in range(args.runs)]
+            result = {
+                'module': module,
+                'mode': mode,
+                'runs': args.runs,
+                'median_s': statistics.median(samples),
+                'min_s': min(samples),
+                'max_s': max(samples),
+            }
+            results.append(result)
+            print(f"{module:<20} {mode:<10} mediana {result['median_s']:.3f}s  "
+                  f"mín {result['min_s']:.3f}s  máx {result['max_s']:.3f}s")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Compara o custo de CPU por página da extração de campos de uma vaga.
+
+- before: pipeline anterior, que analisava o mesmo HTML várias vezes
+          (BeautifulSoup + requests-html para a descrição + seletores do BeautifulSoup)
+- after:  parse_job_page, com uma única árvore lxml e seletores pré-compilados
+
+Nenhum acesso à rede: a página é lida do disco (por padrão linkedin_sample.html).
+
+Uso:
+    python benchmarks/extraction_cpu.py [--page linkedin_sample.html] [--iterations 50]
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from bs4 import BeautifulSoup
+from requests_html import HTML
+
+from linkedin_scraper import parse_job_page
+
+
+def legacy_parse(page):
+    """Reproduz as análises feitas pelo extract_company_info antes da árvore única"""
+    soup = BeautifulSoup(page, 'html.parser')
+    company = soup.select_one('a.topcard__org-name-link')
+    title = soup.select_one('h1.top-card-layout__title')
+
+    description = ''
+    job_details = HTML(html=page).find('#job-details')
+    if job_details:
+        description = job_details[0].text
+    else:
+        elements = HTML(html=page).find('div.description__text, div.show-more-less-html')
+        if elements:
+            description = elements[0].text
+
+    container = soup.select_one(".job-details-jobs-unified-top-card__primary-description-container") or \
+        soup.select_one(".job-details-jobs-unified-top-card__tertiary-description-container")
+    spans = container.select('.tvm__text') if container else []
+    location = soup.select('.job-details-jobs-unified-top-card__bullet, .topcard__flavor--bullet, .job-details-jobs-unified-top-card__workplace-type')
+    dates = soup.select('.job-details-jobs-unified-top-card__subtitle-secondary-grouping .tvm__text, .posted-time-ago__text, .job-details-jobs-unified-top-card__posted-date')
+    applicants = soup.select('.num-applicants__caption, .jobs-unified-top-card__applicant-count, .job-details-jobs-unified-top-card__applicant-count')
+    return (company.get_text(strip=True) if company else None,
+            title.get_text(strip=True) if title else None,
+            description, len(spans), len(location), len(dates), len(applicants))
+
+
+def measure(function, page, iterations):
+    """Retorna a lista de tempos de CPU (s) de cada execução"""
+    samples = []
+    for _ in range(iterations):
+        started_at = time.process_time()
+        function(page)
+        samples.append(time.process_time() - started_at)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--page', default=os.path.join(REPO_ROOT, 'linkedin_sample.html'))
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with open(args.page, encoding='utf-8') as f:
+        page = f.read()
+
+    # Aquecimento (imports preguiçosos, caches de seletores)
+    legacy_parse(page)
+    parse_job_page(page)
+
+    results = {
+        'before': measure(legacy_parse, page, args.iterations),
+        'after': measure(parse_job_page, page, args.iterations),
+    }
+    print(f"Página: {os.path.basename(args.page)} ({len(page) / 1024:.0f} KB), {args.iterations} execuções")
+    for name, samples in results.items():
+        print(f"{name:<7} CPU por página: mediana {statistics.median(samples) * 1000:.1f} ms  "
+              f"mín {min(samples) * 1000:.1f} ms")
+    speedup = statistics.median(results['before']) / statistics.median(results['after'])
+    print(f"Ganho: {speedup:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
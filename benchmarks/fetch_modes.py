@@ -0,0 +1,86 @@
+"""
+Compara os modos de download de vagas: página pública completa ('page') e
+fragmento do endpoint de convidado ('guest').
+
+Sobe o servidor local de standin_server.py (sem acesso à rede) e mede, por vaga,
+os bytes baixados e o tempo de CPU do parse_job_page em cada modo, conferindo se
+os campos extraídos são os mesmos.
+
+Uso:
+    python benchmarks/fetch_modes.py [--page linkedin_sample.html] [--jobs 30]
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from linkedin_scraper import _response_html, parse_job_page
+from standin_server import build_guest_fragment, make_handler
+
+JOB_ID = '4197948497'
+FIELDS = ['company_name', 'job_title', 'job_description', 'city', 'announced_at', 'candidates']
+
+
+def measure_mode(session, url, jobs):
+    sizes, parse_times = [], []
+    parsed = None
+    for _ in range(jobs):
+        response = session.get(url, timeout=10)
+        response.raise_for_status()
+        sizes.append(len(response.content))
+        started_at = time.process_time()
+        parsed = parse_job_page(_response_html(response), url)
+        parse_times.append(time.process_time() - started_at)
+    return sizes, parse_times, parsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--page', default=os.path.join(REPO_ROOT, 'linkedin_sample.html'))
+    parser.add_argument('--jobs', type=int, default=30)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with open(args.page, 'rb') as f:
+        page_body = f.read()
+    fragment_body = build_guest_fragment(page_body.decode('utf-8'))
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(page_body, fragment_body))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = {
+        'page': f"{base_url}/jobs/view/{JOB_ID}",
+        'guest': f"{base_url}/jobs-guest/jobs/api/jobPosting/{JOB_ID}",
+    }
+
+    results = {}
+    with requests.Session() as session:
+        for mode, url in urls.items():
+            measure_mode(session, url, 1)  # Aquecimento
+            results[mode] = measure_mode(session, url, args.jobs)
+    server.shutdown()
+
+    for mode, (sizes, parse_times, _) in results.items():
+        print(f"{mode:<6} {statistics.mean(sizes) / 1024:7.1f} KB por vaga  "
+              f"parse mediana {statistics.median(parse_times) * 1000:.1f} ms")
+
+    page_sizes, page_times, page_fields = results['page']
+    guest_sizes, guest_times, guest_fields = results['guest']
+    print(f"Redução: {statistics.mean(page_sizes) / statistics.mean(guest_sizes):.1f}x em bytes, "
+          f"{statistics.median(page_times) / statistics.median(guest_times):.1f}x no parse")
+    different = [field for field in FIELDS if page_fields[field] != guest_fields[field]]
+    print("Campos idênticos nos dois modos" if not different else f"Campos diferentes: {different}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+"""
+Suíte de benchmarks offline da extração, sobre um corpus de páginas salvas.
+
+Etapas medidas (nenhum acesso à rede):
+
+- parse:      decodificação do corpo + parse_job_page (a etapa de análise do extract_company_info)
+- normalize:  normalize_linkedin_url sobre variações de URLs de vagas
+- announced:  calculate_announced_date sobre os textos de data mais comuns
+- table:      build_results_table (tabela HTML do get_results_html) com as linhas extraídas
+
+Para cada etapa são reportados itens/s, latência por item (p50/p99) e o pico de
+memória (tracemalloc, medido em uma passada separada para não distorcer os tempos).
+Com --json os resultados são gravados em um arquivo, e --compare mostra a
+variação em relação a um arquivo gravado antes (ex.: em outro commit).
+
+O corpus são arquivos .html ou diretórios com arquivos .html (padrão: linkedin_sample.html).
+
+Uso:
+    python benchmarks/offline_suite.py [--corpus linkedin_sample.html paginas/] [--repeat 20]
+                                       [--stages parse normalize announced table]
+                                       [--json resultados.json] [--compare anterior.json]
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd
+import requests
+
+from linkedin_scraper import (
+    _response_html, build_results_table, calculate_announced_date,
+    normalize_linkedin_url, parse_job_page
+)
+
+SAMPLE_URLS = [
+    'https://www.linkedin.com/jobs/view/4197948497',
+    'https://www.linkedin.com/jobs/view/4197948497/?alternateChannel=search&refId=abc%3D%3D&trackingId=xyz',
+    'https://br.linkedin.com/jobs/view/4197948497?trk=public_jobs_topcard-title',
+    'https://www.linkedin.com/jobs/view/gerente-de-projetos-at-neoris-4197948497',
+    'https://www.linkedin.com/jobs/search/?currentJobId=4197948497&keywords=gerente',
+    'not a url',
+]
+
+SAMPLE_DATES = [
+    ('8 hours ago', None),
+    ('3 days ago', None),
+    ('2 weeks ago', None),
+    ('1 month ago', None),
+    ('yesterday', None),
+    ('Jan 15, 2023', None),
+    ('2023-01-15', None),
+    ('Not found', None),
+    ('8 hours ago', '2025-03-27T15:17:16.000Z'),
+]
+
+TABLE_MIN_ROWS = 20  # Linhas mínimas por tabela (o corpus é repetido até alcançar)
+
+TABLE_COLUMNS = ['link', 'company_name', 'job_title', 'job_description',
+                 'announced_at', 'announced_calc', 'city', 'candidates']
+
+
+def load_corpus(paths):
+    """Lê as páginas do corpus como bytes (como chegariam da rede)"""
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.html'))
+        else:
+            files = [path]
+        for file_path in files:
+            with open(file_path, 'rb') as f:
+                pages.append((os.path.basename(file_path), f.read()))
+    if not pages:
+        raise SystemExit(f"Nenhuma página .html encontrada em: {paths}")
+    return pages
+
+
+def make_response(body):
+    """Resposta HTTP em memória, para medir a decodificação como no extract_company_info"""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.headers['Content-Type'] = 'text/html'
+    return response
+
+
+def parse_page(item):
+    name, body = item
+    return parse_job_page(_response_html(make_response(body)), name)
+
+
+def build_rows(pages):
+    """Linhas da tabela no formato que o get_results_html passa ao build_results_table"""
+    searched_at = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    rows = []
+    for item in pages:
+        result = parse_page(item)
+        link = f"https://www.linkedin.com/jobs/view/{len(rows):010d}"
+        result['link'] = f'<a href="{link}" target="_blank">{link}</a>'
+        result['announced_calc'] = calculate_announced_date(searched_at, result['announced_at'],
+                                                            result.get('date_posted'))
+        rows.append(result)
+    df = pd.DataFrame(rows, columns=TABLE_COLUMNS)
+    df['nota_requisitos'] = ""
+    df['nota_responsabilidades'] = ""
+    df['pontos_fracos'] = ""
+    return df
+
+
+def stage_items(stage, pages, repeat):
+    """Retorna (função aplicada a cada item, itens, unidade) da etapa"""
+    searched_at = '2025-03-28 10:00:00'
+    if stage == 'parse':
+        return parse_page, pages * repeat, 'páginas'
+    if stage == 'normalize':
+        return normalize_linkedin_url, SAMPLE_URLS * (repeat * 50), 'URLs'
+    if stage == 'announced':
+        return (lambda item: calculate_announced_date(searched_at, *item)), SAMPLE_DATES * (repeat * 50), 'datas'
+    if stage == 'table':
+        # Um item = uma tabela completa (corpus repetido até ter TABLE_MIN_ROWS linhas)
+        df = build_rows(pages * -(-TABLE_MIN_ROWS // len(pages)))
+        return (lambda frame: build_results_table(frame)), [df] * repeat, 'tabelas'
+    raise ValueError(f"Etapa desconhecida: {stage}")
+
+
+def percentile(sorted_samples, fraction):
+    """Percentil pelo método do posto mais próximo"""
+    index = max(0, min(len(sorted_samples) - 1, int(round(fraction * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[index]
+
+
+def run_stage(stage, pages, repeat):
+    function, items, unit = stage_items(stage, pages, repeat)
+
+    # Aquecimento (plano de extração, imports preguiçosos, caches de regex)
+    function(items[0])
+
+    samples = []
+    started_at = time.perf_counter()
+    for item in items:
+        item_started_at = time.perf_counter()
+        function(item)
+        samples.append(time.perf_counter() - item_started_at)
+    elapsed = time.perf_counter() - started_at
+
+    # Pico de memória em uma passada separada (o tracemalloc deixa tudo mais lento)
+    tracemalloc.start()
+    for item in items[:max(1, len(items) // repeat)]:
+        function(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    result = {
+        'stage': stage,
+        'unit': unit,
+        'items': len(items),
+        'items_per_s': len(items) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(samples, 0.50) * 1000,
+        'p99_ms': percentile(samples, 0.99) * 1000,
+        'peak_memory_kb': peak / 1024,
+    }
+    if stage == 'table':
+        result['rows_per_table'] = len(items[0])
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_comparison(results, previous_path):
+    with open(previous_path) as f:
+        previous = {result['stage']: result for result in json.load(f)['results']}
+    print(f"\nComparação com {previous_path}:")
+    for result in results:
+        before = previous.get(result['stage'])
+        if not before:
+            continue
+        speedup = result['items_per_s'] / before['items_per_s'] if before['items_per_s'] else float('nan')
+        print(f"{result['stage']:<10} vazão {speedup:.2f}x  "
+              f"p50 {before['p50_ms']:.3f} -> {result['p50_ms']:.3f} ms  "
+              f"p99 {before['p99_ms']:.3f} -> {result['p99_ms']:.3f} ms  "
+              f"memória {before['peak_memory_kb']:.0f} -> {result['peak_memory_kb']:.0f} KB")
+
+
+def main():
+    stages = ['parse', 'normalize', 'announced', 'table']
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', nargs='+', default=[os.path.join(REPO_ROOT, 'linkedin_sample.html')])
+    parser.add_argument('--repeat', type=int, default=20, help='Passadas sobre o corpus em cada etapa')
+    parser.add_argument('--stages', nargs='+', default=stages, choices=stages)
+    parser.add_argument('--json', dest='json_path', help='Arquivo para gravar os resultados em JSON')
+    parser.add_argument('--compare', help='JSON de uma execução anterior para comparar')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    pages = load_corpus(args.corpus)
+    print(f"Corpus: {len(pages)} páginas ({sum(len(body) for _, body in pages) / 1024:.0f} KB), "
+          f"{args.repeat} passadas")
+
+    results = []
+    for stage in args.stages:
+        result = run_stage(stage, pages, max(1, args.repeat))
+        results.append(result)
+        print(f"{stage:<10} {result['items_per_s']:>10.1f} {result['unit']}/s  "
+              f"p50 {result['p50_ms']:.3f} ms  p99 {result['p99_ms']:.3f} ms  "
+              f"pico de memória {result['peak_memory_kb']:.0f} KB")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({
+                'revision': git_revision(),
+                'python': platform.python_version(),
+                'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+                'corpus': [name for name, _ in pages],
+                'repeat': args.repeat,
+                'results': results,
+            }, f, indent=2)
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
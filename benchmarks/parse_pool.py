@@ -0,0 +1,66 @@
+"""
+Vazão do parse com as threads de download fazendo o parse (SCRAPER_PARSE_WORKERS=0)
+e com o pool de processos de parse, em páginas já baixadas (sem rede).
+
+Cada thread simula um worker de download: entrega o corpo bruto (RawPage) ao
+_parse_page, como o extract_company_info faz. Com o parse nas threads, o GIL
+serializa o trabalho; com o pool, a vazão deve crescer com o número de núcleos.
+
+Uso:
+    python benchmarks/parse_pool.py [--page linkedin_sample.html] [--pages 400]
+                                    [--threads 8] [--workers 1 2 4 8]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import linkedin_scraper
+from linkedin_scraper import RawPage, _parse_page
+
+
+def measure(page, pages, threads):
+    url = 'https://www.linkedin.com/jobs/view/4197948497'
+    _parse_page(page, url)  # Aquecimento (plano de extração e, com o pool, os processos)
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda _: _parse_page(page, url)[1], range(pages)))
+    elapsed = time.perf_counter() - started_at
+    return pages / elapsed, results[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--page', default=os.path.join(REPO_ROOT, 'linkedin_sample.html'))
+    parser.add_argument('--pages', type=int, default=400)
+    parser.add_argument('--threads', type=int, default=8, help='Threads de download simuladas')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with open(args.page, 'rb') as f:
+        page = RawPage(f.read(), 'utf-8')
+    print(f"{os.cpu_count()} CPUs, {args.pages} páginas, {args.threads} threads de download")
+
+    linkedin_scraper.PARSE_WORKERS = 0
+    baseline, expected = measure(page, args.pages, args.threads)
+    print(f"parse nas threads      {baseline:8.1f} páginas/s")
+
+    for workers in sorted(set(args.workers)):
+        # Um pool novo para cada quantidade de processos
+        linkedin_scraper.PARSE_WORKERS = workers
+        linkedin_scraper.PARSE_QUEUE_SIZE = max(2, workers * 2)
+        linkedin_scraper._parse_pool = None
+        rate, parsed = measure(page, args.pages, args.threads)
+        linkedin_scraper._parse_pool.shutdown()
+        same = 'campos idênticos' if parsed == expected else 'CAMPOS DIFERENTES'
+        print(f"pool com {workers:2d} processos  {rate:8.1f} páginas/s  {rate / baseline:.2f}x  ({same})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Servidor local que imita o LinkedIn para testes e benchmarks sem rede.
+
+Rotas:
+    /jobs/view/<id>                           página pública completa (linkedin_sample.html)
+    /jobs-guest/jobs/api/jobPosting/<id>      fragmento do endpoint de convidado, montado a
+                                              partir da mesma página (top card + descrição)
+
+Com --guest-missing description (ou company/title) o fragmento sai sem aquele
+trecho, para exercitar a volta para a página completa.
+
+Para apontar o scraper para este servidor:
+    SCRAPER_FETCH_MODE=guest \\
+    LINKEDIN_GUEST_JOB_URL=http://127.0.0.1:8780/jobs-guest/jobs/api/jobPosting/{job_id}
+
+Uso:
+    python benchmarks/standin_server.py [--port 8780] [--page linkedin_sample.html]
+                                        [--guest-missing description]
+"""
+import argparse
+import os
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lxml import html as lxml_html
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Trechos da página que o endpoint de convidado devolve
+GUEST_SECTIONS = {
+    'top_card': 'section.top-card-layout',
+    'details': 'div.decorated-job-posting__details',
+}
+# Elementos removidos do fragmento com --guest-missing
+MISSING_SELECTORS = {
+    'description': 'div.description__text',
+    'company': 'a.topcard__org-name-link',
+    'title': '.top-card-layout__title',
+}
+
+JOB_VIEW_RE = re.compile(r'^/jobs/view/(\d+)/?$')
+GUEST_RE = re.compile(r'^/jobs-guest/jobs/api/jobPosting/(\d+)/?$')
+
+
+def build_guest_fragment(page, missing=()):
+    """Monta o fragmento do endpoint de convidado a partir da página completa"""
+    tree = lxml_html.fromstring(page)
+    parts = []
+    for selector in GUEST_SECTIONS.values():
+        for element in tree.cssselect(selector):
+            # No fragmento real o título é um <h2>, não um <h1>
+            for title in element.cssselect('h1.top-card-layout__title'):
+                title.tag = 'h2'
+            for name in missing:
+                for removed in element.cssselect(MISSING_SELECTORS[name]):
+                    removed.getparent().remove(removed)
+            parts.append(lxml_html.tostring(element, encoding='unicode'))
+    return '\n'.join(parts).encode('utf-8')
+
+
+def make_handler(page_body, fragment_body):
+    class StandInHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split('?', 1)[0]
+            if JOB_VIEW_RE.match(path):
+                self._send(page_body)
+            elif GUEST_RE.match(path):
+                self._send(fragment_body)
+            else:
+                self.send_error(404)
+
+        def _send(self, body):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StandInHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8780)
+    parser.add_argument('--page', default=os.path.join(REPO_ROOT, 'linkedin_sample.html'))
+    parser.add_argument('--guest-missing', nargs='*', default=[], choices=list(MISSING_SELECTORS))
+    args = parser.parse_args()
+
+    with open(args.page, 'rb') as f:
+        page_body = f.read()
+    fragment_body = build_guest_fragment(page_body.decode('utf-8'), args.guest_missing)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(page_body, fragment_body))
+    print(f"Servindo em http://{args.host}:{args.port} "
+          f"(página {len(page_body) / 1024:.0f} KB, fragmento {len(fragment_body) / 1024:.0f} KB)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
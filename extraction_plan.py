@@ -0,0 +1,412 @@
+"""
+Planos de extração declarativos para as páginas de vagas do LinkedIn.
+
+Cada campo (empresa, título, descrição, cidade...) tem uma lista ordenada de
+extratores CSS/XPath definida em um arquivo JSON (extraction_plan.json, ou o
+caminho em EXTRACTION_PLAN_PATH). Os seletores são compilados uma única vez no
+carregamento e o arquivo é recarregado quando muda, sem novo deploy.
+
+O plano registra qual extrator acertou cada campo: os mais certeiros sobem na
+ordem e os que erram seguidamente são rebaixados, rodando apenas quando todos
+os demais falham.
+"""
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import trafilatura
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PLAN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extraction_plan.json')
+EXTRACTION_PLAN_PATH = os.environ.get("EXTRACTION_PLAN_PATH", DEFAULT_PLAN_PATH)
+PLAN_RELOAD_INTERVAL = 5   # Intervalo mínimo (s) entre verificações de alteração do arquivo
+PLAN_PROMOTE_EVERY = 50    # Páginas entre reordenações dos extratores de cada campo
+PLAN_DEAD_AFTER = 200      # Erros seguidos até o extrator ser rebaixado
+
+# Tags inline (não quebram linha) na extração de texto com blocos, como no requests-html/pyquery
+INLINE_TAGS = frozenset({
+    'a', 'abbr', 'acronym', 'b', 'bdo', 'big', 'br', 'button', 'cite',
+    'code', 'dfn', 'em', 'i', 'img', 'input', 'kbd', 'label', 'map',
+    'object', 'q', 'samp', 'script', 'select', 'small', 'span', 'strong',
+    'sub', 'sup', 'textarea', 'time', 'tt', 'var'
+})
+HTML_WHITESPACE_RE = re.compile('[\x20\x09\x0C\u200B\x0A\x0D]+')
+
+TEXT_MODES = ('strip', 'block', 'join')
+
+def _strip_text(element):
+    """Texto do elemento com cada trecho sem espaços nas pontas (equivale a get_text(strip=True))"""
+    return ''.join(text.strip() for text in element.itertext())
+
+def _block_text(element):
+    """
+    Texto do elemento preservando quebras de linha entre elementos de bloco
+    (mesmo resultado do .text do requests-html).
+    """
+    # Partes: str = texto, None = quebra entre blocos, True = <br>
+    parts = []
+
+    def walk(node):
+        if not isinstance(node.tag, str):  # Comentários e instruções de processamento
+            return
+        is_block = node.tag not in INLINE_TAGS
+        if node.tag == 'br':
+            parts.append(True)
+        elif is_block:
+            parts.append(None)
+        if node.text is not None:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail is not None:
+                parts.append(child.tail)
+        if is_block:
+            parts.append(None)
+
+    walk(element)
+
+    # Juntar textos consecutivos, normalizar espaços e descartar trechos vazios
+    merged, buffer = [], []
+    for part in parts + [None]:
+        if isinstance(part, str):
+            buffer.append(part)
+            continue
+        if buffer:
+            text = HTML_WHITESPACE_RE.sub(' ', ''.join(buffer)).strip()
+            if text:
+                merged.append(text)
+            buffer = []
+        # Quebras de bloco consecutivas contam como uma só
+        if part is None and merged and merged[-1] is None:
+            continue
+        merged.append(part)
+
+    # Remover quebras antes do primeiro e depois do último texto
+    texts = [i for i, part in enumerate(merged) if isinstance(part, str)]
+    if not texts:
+        return ''
+    merged = merged[texts[0]:texts[-1] + 1]
+    return ''.join('\n' if not isinstance(part, str) else part for part in merged).strip()
+
+def html_fragment_text(markup):
+    """Texto de um trecho de HTML (ex.: descrição do JSON-LD), com as mesmas quebras do _block_text"""
+    if not markup or not markup.strip():
+        return ''
+    # Alguns sites publicam o HTML da descrição escapado (&lt;p&gt;...)
+    if '<' not in markup and '&lt;' in markup:
+        markup = html.unescape(markup)
+    return _block_text(lxml_html.fragment_fromstring(markup, create_parent='div'))
+
+def _node_text(node, mode):
+    """Texto de um resultado de seletor (elemento ou string do XPath) no modo indicado"""
+    if not isinstance(node, etree._Element):
+        return str(node).strip()
+    if mode == 'block':
+        return _block_text(node)
+    return _strip_text(node)
+
+
+class Extractor:
+    """
+    Um extrator de um campo: seletor CSS/XPath pré-compilado (ou o Trafilatura)
+    e os filtros que o texto encontrado precisa satisfazer.
+    """
+
+    def __init__(self, spec, keywords, priority):
+        kind = spec.get('type', 'css')
+        expr = spec.get('expr', '')
+        if kind not in ('css', 'xpath', 'trafilatura'):
+            raise ValueError(f"Tipo de extrator desconhecido: {kind}")
+        if kind != 'trafilatura' and not expr:
+            raise ValueError(f"Extrator {kind} sem 'expr'")
+
+        self.kind = kind
+        self.name = spec.get('name') or (f"{kind}:{expr}" if expr else kind)
+        self.priority = priority
+        self.text_mode = spec.get('text', 'strip')
+        if self.text_mode not in TEXT_MODES:
+            raise ValueError(f"Modo de texto desconhecido em {self.name}: {self.text_mode}")
+
+        try:
+            if kind == 'css':
+                self.selector = CSSSelector(expr, translator='html')
+            elif kind == 'xpath':
+                self.selector = etree.XPath(expr)
+            else:
+                self.selector = None
+        except Exception as e:
+            raise ValueError(f"Seletor inválido em {self.name}: {str(e)}")
+
+        self.min_length = spec.get('min_length', 1)
+        self.max_length = spec.get('max_length')
+        self.skip = set(spec.get('skip', []))
+        self.require_any = _expand_keywords(spec.get('require_any', []), keywords)
+        self.exclude_any = _expand_keywords(spec.get('exclude_any', []), keywords)
+        self.start_markers = spec.get('start_markers', [])
+        # Varreduras amplas (ex.: todos os <span> da página), dispensáveis quando há dados estruturados
+        self.heuristic = bool(spec.get('heuristic', False))
+
+        # Estatísticas (total e da janela atual, usada na reordenação)
+        self.hits = 0
+        self.tries = 0
+        self.window_hits = 0
+        self.consecutive_misses = 0
+
+    @property
+    def is_dead(self):
+        return self.consecutive_misses >= PLAN_DEAD_AFTER
+
+    def accepts(self, text):
+        """Verifica se o texto satisfaz os filtros do extrator"""
+        if not text or text in self.skip:
+            return False
+        if len(text) < self.min_length or (self.max_length and len(text) > self.max_length):
+            return False
+        lower_text = text.lower()
+        if self.require_any and not any(keyword in lower_text for keyword in self.require_any):
+            return False
+        if any(keyword in lower_text for keyword in self.exclude_any):
+            return False
+        return True
+
+    def extract(self, tree):
+        """Retorna o primeiro texto que satisfaz os filtros, ou None"""
+        if self.kind == 'trafilatura':
+            return self._extract_trafilatura(tree)
+
+        nodes = self.selector(tree)
+        if not isinstance(nodes, list):  # XPath que retorna string/número
+            nodes = [nodes]
+
+        if self.text_mode == 'join':
+            text = ' '.join(text for text in (_node_text(node, 'strip') for node in nodes) if text)
+            return text if self.accepts(text) else None
+
+        for node in nodes:
+            text = _node_text(node, self.text_mode)
+            if self.accepts(text):
+                return text
+        return None
+
+    def _extract_trafilatura(self, tree):
+        """Texto principal da página pelo Trafilatura, a partir do primeiro marcador encontrado"""
+        full_text = trafilatura.extract(tree, include_comments=False, include_tables=True,
+                                        no_fallback=False, include_links=False, include_formatting=False)
+        if not full_text:
+            return None
+        logger.debug(f"Trafilatura extraiu {len(full_text)} caracteres")
+        for marker in self.start_markers:
+            pos = full_text.find(marker)
+            if pos > -1:
+                full_text = full_text[pos:]
+                break
+        return full_text if self.accepts(full_text) else None
+
+
+def _expand_keywords(entries, keywords):
+    """Expande referências '@nome' para as listas de palavras-chave nomeadas do plano"""
+    expanded = []
+    for entry in entries:
+        if entry.startswith('@'):
+            if entry[1:] not in keywords:
+                raise ValueError(f"Lista de palavras-chave desconhecida: {entry}")
+            expanded.extend(keywords[entry[1:]])
+        else:
+            expanded.append(entry.lower())
+    return tuple(expanded)
+
+
+class FieldPlan:
+    """Extratores ordenados de um campo, reordenados conforme os acertos"""
+
+    def __init__(self, name, spec, keywords):
+        self.name = name
+        # Valor aceito de imediato a partir deste tamanho; abaixo dele continua
+        # tentando os próximos extratores e fica com o texto mais longo
+        self.accept_length = spec.get('accept_length', 0)
+        self.extractors = [Extractor(extractor_spec, keywords, priority)
+                           for priority, extractor_spec in enumerate(spec.get('extractors', []))]
+        if not self.extractors:
+            raise ValueError(f"Campo {name} sem extratores")
+        self.order = list(self.extractors)
+
+    def extract(self, tree, skip_heuristic=False):
+        """
+        Retorna (texto ou None, passos), onde passos é a lista de
+        (posição original do extrator, acertou) na ordem em que foram tentados.
+        """
+        best = None
+        steps = []
+        # Os extratores rebaixados ficam no fim da ordem: só rodam quando todos os ativos falharam
+        for extractor in self.order:
+            if skip_heuristic and extractor.heuristic:
+                continue
+            try:
+                text = extractor.extract(tree)
+            except Exception as e:
+                logger.warning(f"Erro no extrator {extractor.name} do campo {self.name}: {str(e)}")
+                text = None
+
+            hit = text is not None and len(text) >= self.accept_length
+            steps.append((extractor.priority, hit))
+            if hit:
+                logger.debug(f"Campo {self.name} extraído por {extractor.name}")
+                return text, steps
+            if text is not None and (best is None or len(text) > len(best)):
+                best = text
+        return best, steps
+
+    def record(self, steps):
+        for priority, hit in steps:
+            extractor = self.extractors[priority]
+            extractor.tries += 1
+            if hit:
+                extractor.hits += 1
+                extractor.window_hits += 1
+                extractor.consecutive_misses = 0
+            else:
+                extractor.consecutive_misses += 1
+
+    def reorder(self):
+        """Promove os extratores que mais acertaram na última janela e rebaixa os mortos"""
+        live = [extractor for extractor in self.extractors if not extractor.is_dead]
+        dead = [extractor for extractor in self.extractors if extractor.is_dead]
+        live.sort(key=lambda extractor: (-extractor.window_hits, extractor.priority))
+        order = live + dead
+        if order != self.order:
+            logger.info(f"Nova ordem dos extratores de {self.name}: "
+                        f"{[extractor.name for extractor in order]}")
+        self.order = order
+        for extractor in self.extractors:
+            extractor.window_hits = 0
+
+
+class ExtractionPlan:
+    """Plano completo: um FieldPlan por campo, carregado de um arquivo JSON"""
+
+    def __init__(self, spec, source=None, version=None):
+        self.source = source
+        # Hash do conteúdo: igual em todos os processos que carregaram o mesmo arquivo
+        self.version = version or hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        keywords = {name: tuple(keyword.lower() for keyword in values)
+                    for name, values in spec.get('keywords', {}).items()}
+        self.fields = {}
+        for name, field_spec in spec.get('fields', {}).items():
+            self.fields[name] = FieldPlan(name, field_spec, keywords)
+        if not self.fields:
+            raise ValueError("Plano de extração sem campos")
+        self.pages = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        return cls(json.loads(raw.decode('utf-8')), source=path, version=hashlib.sha256(raw).hexdigest()[:16])
+
+    def extract(self, tree, fields=None, skip_heuristic=False):
+        """
+        Extrai os campos da árvore.
+
+        Args:
+            tree: árvore lxml da página
+            fields (iterable, optional): campos a extrair (padrão: todos os do plano)
+            skip_heuristic (bool): não rodar os extratores marcados como heurísticos
+
+        Returns:
+            tuple: (valores {campo: texto ou None}, rastro para record())
+        """
+        values = {}
+        trace = {}
+        for name, field in self.fields.items():
+            if fields is not None and name not in fields:
+                continue
+            values[name], trace[name] = field.extract(tree, skip_heuristic)
+        return values, trace
+
+    def record(self, trace):
+        """Contabiliza os acertos de uma página e reordena os campos periodicamente"""
+        with self.lock:
+            for name, steps in trace.items():
+                self.fields[name].record(steps)
+            self.pages += 1
+            if self.pages % PLAN_PROMOTE_EVERY == 0:
+                for field in self.fields.values():
+                    field.reorder()
+
+    def order_state(self):
+        """Versão do plano e ordem atual dos extratores de cada campo (posições originais)"""
+        with self.lock:
+            return self.version, {name: [extractor.priority for extractor in field.order]
+                                  for name, field in self.fields.items()}
+
+    def apply_order(self, version, orders):
+        """
+        Adota a ordem dos extratores vinda de outro processo (order_state), se a versão
+        do plano for a mesma. Retorna False (sem mudar nada) se for outra.
+        """
+        if version != self.version:
+            return False
+        with self.lock:
+            for name, priorities in orders.items():
+                field = self.fields[name]
+                field.order = [field.extractors[priority] for priority in priorities]
+        return True
+
+    def snapshot(self):
+        """Acertos e tentativas de cada extrator, na ordem atual"""
+        with self.lock:
+            return {
+                name: [{'name': extractor.name, 'hits': extractor.hits, 'tries': extractor.tries,
+                        'dead': extractor.is_dead} for extractor in field.order]
+                for name, field in self.fields.items()
+            }
+
+
+_plan = None
+_plan_mtime = None
+_plan_checked_at = 0.0
+_plan_lock = threading.Lock()
+
+def get_extraction_plan():
+    """
+    Retorna o plano de extração atual, recarregando o arquivo se ele mudou.
+    Se a nova versão do arquivo for inválida, mantém o plano anterior.
+    """
+    global _plan, _plan_mtime, _plan_checked_at
+
+    now = time.monotonic()
+    if _plan is not None and now - _plan_checked_at < PLAN_RELOAD_INTERVAL:
+        return _plan
+
+    with _plan_lock:
+        if _plan is not None and now - _plan_checked_at < PLAN_RELOAD_INTERVAL:
+            return _plan
+        _plan_checked_at = now
+        try:
+            mtime = os.path.getmtime(EXTRACTION_PLAN_PATH)
+        except OSError as e:
+            if _plan is None:
+                raise
+            logger.error(f"Plano de extração inacessível, mantendo o anterior: {str(e)}")
+            return _plan
+
+        if mtime != _plan_mtime:
+            try:
+                _plan = ExtractionPlan.from_file(EXTRACTION_PLAN_PATH)
+                logger.info(f"Plano de extração carregado de {EXTRACTION_PLAN_PATH}")
+            except (ValueError, OSError) as e:
+                if _plan is None:
+                    raise
+                logger.error(f"Plano de extração inválido, mantendo o anterior: {str(e)}")
+            _plan_mtime = mtime
+    return _plan
@@ -4,13 +4,215 @@ import logging
 import time
 import re
 import base64
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from google import genai
 from google.genai import types
 
+from analysis_cache import analysis_cache_key, get_analysis_cache
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Análise concorrente: chamadas simultâneas ao Gemini, limitadas pela cota do projeto.
+# GEMINI_MAX_CONCURRENCY=1 mantém a análise sequencial (uma vaga por vez, com pausa entre chamadas).
+GEMINI_MAX_CONCURRENCY = int(os.environ.get("GEMINI_MAX_CONCURRENCY", "4"))
+# Cotas por minuto do projeto no Gemini (0 = sem limite). Os padrões são os do nível
+# gratuito para o modelo usado (gemini-2.5-flash-preview: 10 RPM, 250.000 TPM); em
+# projetos com faturamento ativo, use os valores da página de cotas do AI Studio.
+GEMINI_RPM = float(os.environ.get("GEMINI_RPM", "10"))          # Requisições por minuto da cota
+GEMINI_TPM = float(os.environ.get("GEMINI_TPM", "250000"))      # Tokens por minuto da cota
+GEMINI_OUTPUT_TOKENS_ESTIMATE = 1024  # Tokens de saída (e de raciocínio) presumidos por análise
+
+# Modo em pacotes: várias vagas na mesma requisição, para não reenviar o prompt do sistema
+# (com o currículo) a cada vaga. GEMINI_PACK_SIZE=1 desativa.
+GEMINI_PACK_SIZE = int(os.environ.get("GEMINI_PACK_SIZE", "1"))
+GEMINI_PACK_MAX_TOKENS = int(os.environ.get("GEMINI_PACK_MAX_TOKENS", "30000"))  # Vagas e respostas por pacote
+GEMINI_PACK_WAIT = 5.0  # Espera (s) por mais vagas antes de enviar um pacote incompleto
+
+# Pré-processamento das descrições: remoção de trechos padrão (benefícios, apresentação
+# da empresa, declarações de igualdade de oportunidades) e limite de tokens por vaga
+GEMINI_DESCRIPTION_MAX_TOKENS = int(os.environ.get("GEMINI_DESCRIPTION_MAX_TOKENS", "1500"))
+TOKEN_RE = re.compile(r"\w{1,4}|[^\w\s]")   # Estimador local: palavras em pedaços de até 4 letras e pontuação
+HEADING_MAX_LENGTH = 60                     # Blocos curtos, sem ponto final, são tratados como títulos de seção
+BOILERPLATE_HEADING_RE = re.compile(
+    r"^(?:nossos |our |os )?(?:benef[ií]cios|benefits|perks|vantagens|o que oferecemos|oferecemos|"
+    r"what we offer|we offer|sobre (?:a empresa|n[óo]s)|quem somos|about us|about the company|"
+    r"who we are|diversidade(?: e inclus[ãa]o)?|diversity(?:,? equity)?(?: (?:&|and) inclusion)?|"
+    r"equal (?:employment )?opportunit(?:y|ies)(?: employer)?)\b",
+    re.IGNORECASE
+)
+# Títulos que encerram uma seção padrão (itens curtos de uma lista de benefícios não encerram)
+CONTENT_HEADINGS = (
+    r"(?:principais |main |key )?(?:responsabilidades|atribui[çc][õo]es|atividades|requisitos|qualifica[çc][õo]es|"
+    r"diferenciais|conhecimentos|compet[êe]ncias|habilidades|experi[êe]ncia|forma[çc][ãa]o|sobre a vaga|"
+    r"descri[çc][ãa]o|o que (?:voc[êe] )?(?:vai|ir[áa]) fazer|about the (?:job|role|position)|responsibilities|"
+    r"requirements|qualifications|skills|what you(?:'ll| will) do|nice to have|preferred|job description|"
+    r"local|localiza[çc][ãa]o|location|modelo de (?:trabalho|contrata[çc][ãa]o))"
+)
+CONTENT_HEADING_RE = re.compile(r"^" + CONTENT_HEADINGS + r"\b", re.IGNORECASE)
+# Título de conteúdo seguido de ':' no meio de um bloco (ex.: "Requirements: 5+ years ...")
+CONTENT_LABEL_RE = re.compile(r"(?:^|[.!?;]\s+)[-–—•*#\s]*" + CONTENT_HEADINGS + r"\s*:", re.IGNORECASE)
+BOILERPLATE_BLOCK_MARKERS = (
+    "equal opportunity employer", "equal employment opportunity", "without regard to race",
+    "regardless of race", "igualdade de oportunidades", "não discriminamos", "nao discriminamos",
+    "independentemente de raça", "pessoas com deficiência (pcd)", "show more show less",
+)
+TRUNCATION_MARK = " [...]"
+
+# Análise em fluxo (AnalysisPipeline): vagas aguardando análise antes de a extração ter que esperar
+GEMINI_PIPELINE_QUEUE_SIZE = int(os.environ.get("GEMINI_PIPELINE_QUEUE_SIZE", "50"))
+
+
+class TokenBucket:
+    """
+    Balde de fichas: acumula `rate` fichas por segundo até `capacity`, e acquire
+    bloqueia até haver fichas suficientes. Pedidos maiores que a capacidade são
+    limitados a ela, para não bloquear para sempre. Taxa 0 (ou negativa) = sem limite.
+    """
+    def __init__(self, capacity, rate):
+        self.unlimited = rate <= 0 or capacity <= 0
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.condition = threading.Condition()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    def acquire(self, amount=1):
+        if self.unlimited:
+            return
+        amount = min(amount, self.capacity)
+        with self.condition:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                self.condition.wait((amount - self.tokens) / self.rate)
+    
+    def adjust(self, amount):
+        """Devolve (amount > 0) ou desconta (amount < 0) fichas após saber o custo real"""
+        if self.unlimited:
+            return
+        with self.condition:
+            self._refill()
+            # O saldo pode ficar negativo: o excesso é pago pelas próximas chamadas
+            self.tokens = min(self.capacity, self.tokens + amount)
+            self.condition.notify_all()
+
+
+class GeminiRateLimiter:
+    """
+    Limita as chamadas ao Gemini às cotas de requisições e de tokens por minuto.
+    O custo em tokens é estimado antes da chamada e corrigido com o usage_metadata
+    da resposta.
+    """
+    def __init__(self, rpm=GEMINI_RPM, tpm=GEMINI_TPM):
+        self.requests = TokenBucket(rpm, rpm / 60)
+        self.tokens = TokenBucket(tpm, tpm / 60)
+    
+    def acquire(self, estimated_tokens):
+        self.requests.acquire(1)
+        self.tokens.acquire(estimated_tokens)
+    
+    def settle(self, estimated_tokens, actual_tokens):
+        if actual_tokens:
+            self.tokens.adjust(estimated_tokens - actual_tokens)
+
+
+def estimate_text_tokens(text):
+    """Estimativa local de tokens de um texto (sem chamar a API)"""
+    return len(TOKEN_RE.findall(text)) if text else 0
+
+
+def _is_heading(block):
+    return len(block) <= HEADING_MAX_LENGTH and not block.endswith(('.', ';', '!', '?'))
+
+
+def _has_job_content(block):
+    """Se alguma linha do bloco abre uma seção de conteúdo da vaga (requisitos, responsabilidades...)"""
+    for line in block.split('\n'):
+        if _is_heading(line) and CONTENT_HEADING_RE.match(line.strip(' :-–—•*#')):
+            return True
+        if CONTENT_LABEL_RE.search(line):
+            return True
+    return False
+
+
+def prepare_description(description, max_tokens=None):
+    """
+    Prepara a descrição da vaga para o Gemini: converte <br> em quebras de linha, remove
+    seções padrão (benefícios, apresentação da empresa, igualdade de oportunidades),
+    compacta os espaços e limita o texto a max_tokens tokens estimados.
+    
+    Args:
+        description (str): Descrição da vaga, como extraída (com <br>)
+        max_tokens (int, optional): Limite de tokens (padrão: GEMINI_DESCRIPTION_MAX_TOKENS; 0 desativa)
+        
+    Returns:
+        tuple: (texto preparado, tokens da descrição original, tokens do texto preparado)
+    """
+    if max_tokens is None:
+        max_tokens = GEMINI_DESCRIPTION_MAX_TOKENS
+    text = (description or '').replace('<br><br>', '\n\n').replace('<br>', '\n')
+    original_tokens = estimate_text_tokens(text)
+    
+    # Blocos separados por linhas em branco, com os espaços compactados
+    blocks = []
+    for block in re.split(r'\n\s*\n', text):
+        block = '\n'.join(' '.join(line.split()) for line in block.splitlines() if line.strip())
+        if block:
+            blocks.append(block)
+    
+    kept = []
+    skipping = False  # Dentro de uma seção padrão, até o próximo título de conteúdo da vaga
+    for block in blocks:
+        first_line = block.split('\n', 1)[0]
+        if _is_heading(first_line):
+            heading = first_line.strip(' :-–—•*#')
+            if BOILERPLATE_HEADING_RE.match(heading):
+                skipping = True
+            elif CONTENT_HEADING_RE.match(heading) or first_line.endswith(':'):
+                skipping = False
+        if skipping and _has_job_content(block):
+            # Só blocos inteiramente padrão são removidos: um título padrão emendado
+            # com requisitos ou responsabilidades mantém o bloco e encerra a seção
+            skipping = False
+        if skipping:
+            continue
+        lowered = block.lower()
+        if any(marker in lowered for marker in BOILERPLATE_BLOCK_MARKERS):
+            continue
+        kept.append(block)
+    
+    # Limite de tokens: blocos inteiros enquanto couberem, e o último cortado no fim de uma frase
+    if max_tokens:
+        budget = max_tokens
+        for n, block in enumerate(kept):
+            tokens = estimate_text_tokens(block)
+            if tokens <= budget:
+                budget -= tokens
+                continue
+            cut = block[:max(0, len(block) * budget // tokens)]
+            sentence_end = max(cut.rfind('. '), cut.rfind('\n'))
+            cut = cut[:sentence_end + 1] if sentence_end > 0 else cut[:cut.rfind(' ') + 1]
+            kept = kept[:n] + ([cut.rstrip() + TRUNCATION_MARK] if cut.strip() else [TRUNCATION_MARK.strip()])
+            break
+    
+    prepared = '\n\n'.join(kept)
+    if not prepared and text.strip():
+        # Nada sobrou (descrição só com trechos padrão): enviar o texto compactado
+        prepared = ' '.join(text.split())
+    return prepared, original_tokens, estimate_text_tokens(prepared)
+
+
 class JobAnalyzer:
     """
     Esta classe utiliza a API do Gemini para analisar descrições de vagas de emprego e
@@ -58,6 +260,35 @@ class JobAnalyzer:
             
             # Configurar o prompt base
             self.system_prompt = self._get_system_prompt()
+            self.system_prompt_tokens = estimate_text_tokens(self.system_prompt)
+            self.generation_config.system_instruction = [
+                types.Part.from_text(text=self.system_prompt)
+            ]
+            
+            # Configuração do modo em pacotes: uma lista de análises, cada uma com o ID da vaga no pacote
+            self.pack_generation_config = self.generation_config.model_copy(update={
+                "response_schema": types.Schema(
+                    type=types.Type.ARRAY,
+                    items=types.Schema(
+                        type=types.Type.OBJECT,
+                        required=["id_vaga", "pontuacao_requisitos", "pontuacao_responsabilidades", "pontos_fracos"],
+                        properties={
+                            "id_vaga": types.Schema(
+                                type=types.Type.STRING,
+                            ),
+                            **self.generation_config.response_schema.properties,
+                        },
+                    ),
+                ),
+            })
+            
+            # Cache persistente das análises (o prompt do sistema entra na chave à parte)
+            self.cache_config = self.generation_config.model_dump_json(exclude={'system_instruction'}, exclude_none=True)
+            try:
+                self.cache = get_analysis_cache()
+            except Exception as e:
+                logger.error(f"Cache de análises indisponível: {str(e)}")
+                self.cache = None
             
             logger.info(f"Analisador de vagas inicializado com o modelo {self.model_name}")
         except Exception as e:
@@ -165,7 +396,87 @@ ERP e Gestão de Serviços: SAP S/4HANA, TOTVS, Fluig, ServiceNow.
 Pacote Office: Excel avançado (procv, tabelas dinâmicas, VBA, etc.), PowerPoint, etc.
 """
 
-    def analyze_job(self, job_data):
+    def estimate_tokens(self, input_text, outputs=1):
+        """Tokens presumidos de uma chamada: prompt do sistema, vaga(s) e resposta(s)"""
+        return self.system_prompt_tokens + estimate_text_tokens(input_text) + GEMINI_OUTPUT_TOKENS_ESTIMATE * outputs
+
+    @staticmethod
+    def _prepare_job(job_data):
+        """
+        Descrição limpa da vaga (tags HTML, trechos padrão e excesso de tokens) e contagens
+        de tokens, calculadas uma vez e guardadas em job_data
+        """
+        if 'clean_description' not in job_data:
+            text, original_tokens, sent_tokens = prepare_description(job_data.get('job_description', ''))
+            job_data['clean_description'] = text
+            job_data['description_tokens'] = original_tokens
+            job_data['clean_description_tokens'] = sent_tokens
+        return job_data['clean_description']
+
+    def _job_section(self, job_data):
+        """Título, empresa e descrição limpa da vaga, no formato enviado ao Gemini"""
+        job_title = job_data.get('job_title', 'Não informado')
+        company_name = job_data.get('company_name', 'Não informado') 
+        clean_description = self._prepare_job(job_data)
+        
+        return f"""# VAGA: {job_title}
+# EMPRESA: {company_name}
+
+# DESCRIÇÃO DA VAGA:
+{clean_description}
+"""
+
+    def _build_input_text(self, job_data):
+        """Prompt do usuário para a vaga (título, empresa e descrição limpa)"""
+        # Construir o prompt do usuário para análise
+        return f"""
+{self._job_section(job_data)}
+Analisar a compatibilidade entre o currículo do candidato modelo (fornecido no seu contexto) e esta vaga de emprego.
+            """
+
+    def _build_pack_text(self, jobs):
+        """Prompt do usuário com várias vagas, cada uma identificada pelo seu ID no pacote (1, 2, ...)"""
+        sections = "\n".join(
+            f"=== ID_VAGA: {n} ===\n{self._job_section(job_data)}" for n, job_data in enumerate(jobs, 1)
+        )
+        return f"""
+Analisar a compatibilidade entre o currículo do candidato modelo (fornecido no seu contexto) e cada uma das {len(jobs)} vagas de emprego abaixo, separadamente e com o mesmo rigor de uma análise individual.
+Retorne um item por vaga, com o campo id_vaga igual ao ID_VAGA indicado.
+
+{sections}
+            """
+
+    def _cache_key(self, input_text):
+        return analysis_cache_key(input_text, self.system_prompt, self.model_name, self.cache_config)
+
+    def cached_analysis(self, job_data):
+        """
+        Análise já armazenada no cache para esta vaga (mesma descrição, currículo,
+        prompt e modelo), ou None.
+        """
+        if self.cache is None or not job_data or 'job_description' not in job_data:
+            return None
+        try:
+            analysis_data = self.cache.get(self._cache_key(self._build_input_text(job_data)))
+        except Exception as e:
+            logger.error(f"Erro ao consultar o cache de análises: {str(e)}")
+            return None
+        if analysis_data is None:
+            return None
+        analysis_data["system_instructions"] = self.system_prompt
+        analysis_data["job_link"] = job_data.get('link', 'Não informado')
+        return analysis_data
+
+    def _store_analysis(self, input_text, analysis_data):
+        if self.cache is None:
+            return
+        stored = {k: v for k, v in analysis_data.items() if k not in ("system_instructions", "job_link")}
+        try:
+            self.cache.put(self._cache_key(input_text), stored)
+        except Exception as e:
+            logger.error(f"Erro ao gravar no cache de análises: {str(e)}")
+
+    def analyze_job(self, job_data, rate_limiter=None, check_cache=True):
         """
         Analisa uma vaga de emprego usando a API do Gemini.
         
@@ -177,6 +488,9 @@ Pacote Office: Excel avançado (procv, tabelas dinâmicas, VBA, etc.), PowerPoin
                     'job_description': 'Descrição completa da vaga...',
                     'link': 'https://www.linkedin.com/jobs/view/123456789'
                 }
+            rate_limiter (GeminiRateLimiter, optional): Limitador das cotas por minuto
+            check_cache (bool): Consultar o cache antes da chamada (False quando quem
+                chama já consultou, como a AnalysisPipeline)
                 
         Returns:
             dict: Resultado da análise com notas e recomendações
@@ -190,96 +504,24 @@ Pacote Office: Excel avançado (procv, tabelas dinâmicas, VBA, etc.), PowerPoin
         try:
             # Preparar o conteúdo para enviar ao Gemini
             job_title = job_data.get('job_title', 'Não informado')
-            company_name = job_data.get('company_name', 'Não informado') 
-            job_description = job_data.get('job_description', '')
             job_link = job_data.get('link', 'Não informado')
+            input_text = self._build_input_text(job_data)
             
-            # Limpar a descrição da vaga para remover tags HTML
-            clean_description = job_description.replace('<br><br>', '\n\n').replace('<br>', '\n')
-            
-            # Construir o prompt do usuário para análise
-            input_text = f"""
-# VAGA: {job_title}
-# EMPRESA: {company_name}
-
-# DESCRIÇÃO DA VAGA:
-{clean_description}
-
-Analisar a compatibilidade entre o currículo do candidato modelo (fornecido no seu contexto) e esta vaga de emprego.
-            """
+            # Mesma vaga já analisada com o mesmo currículo, prompt e modelo
+            cached = self.cached_analysis(job_data) if check_cache else None
+            if cached is not None:
+                logger.info(f"Análise da vaga {job_title} obtida do cache")
+                return cached
             
             # Fazer a chamada à API do Gemini
             logger.info(f"Enviando solicitação de análise para vaga: {job_title}")
-            
-            try:
-                # Preparar o conteúdo como Content struct
-                contents = [
-                    types.Content(
-                        role="user",
-                        parts=[
-                            types.Part.from_text(text=input_text),
-                        ],
-                    ),
-                ]
-                
-                # Adicionar system_instruction ao config
-                self.generation_config.system_instruction = [
-                    types.Part.from_text(text=self.system_prompt)
-                ]
-                
-                # Gerar conteúdo - seguindo exatamente o exemplo fornecido
-                response_stream = self.client.models.generate_content_stream(
-                    model=self.model_name,
-                    contents=contents,
-                    config=self.generation_config,
-                )
-                
-                # Coletar todo o texto da resposta
-                result_json = ""
-                for chunk in response_stream:
-                    if chunk.text:
-                        result_json += chunk.text
-                
-            except Exception as e:
-                logger.error(f"Erro na chamada à API do Gemini: {str(e)}")
-                raise Exception(f"Falha na análise com Gemini API: {str(e)}")
+            result_json = self._generate(input_text, self.generation_config, rate_limiter)
             
             # Analisar e retornar o resultado
             if result_json:
                 try:
-                    # Tentar extrair o JSON da resposta, verificando se há código de formatação
-                    # ao redor da resposta JSON
-                    json_content = result_json
-                    
-                    # Tentar encontrar conteúdo JSON entre marcadores de código
-                    json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', result_json)
-                    if json_match:
-                        json_content = json_match.group(1).strip()
-                        logger.info("Encontrado JSON entre marcadores de código")
-                    
-                    # Se não encontrar entre marcadores de código, procurar por chaves { } externas
-                    if not json_match:
-                        json_match = re.search(r'(\{[\s\S]*\})', result_json)
-                        if json_match:
-                            json_content = json_match.group(1).strip()
-                            logger.info("Encontrado JSON entre chaves externas")
-                    
-                    # Processar o resultado como JSON
-                    analysis_data = json.loads(json_content)
-                    
-                    # Mapear campos para manter compatibilidade com o código existente
-                    if "pontuacao_requisitos" in analysis_data:
-                        analysis_data["nota_requisitos"] = analysis_data["pontuacao_requisitos"]
-                    
-                    if "pontuacao_responsabilidades" in analysis_data:
-                        analysis_data["nota_responsabilidades"] = analysis_data["pontuacao_responsabilidades"]
-                    
-                    # Adicionar informações de sistema às análises para exibição
-                    analysis_data["system_instructions"] = self.system_prompt
-                    analysis_data["job_link"] = job_link
-                    
-                    # Retornar o resultado processado
-                    return analysis_data
+                    analysis_data = self._extract_json(result_json)
+                    return self._finish_analysis(job_data, analysis_data)
                     
                 except json.JSONDecodeError as e:
                     logger.error(f"Erro ao decodificar JSON: {str(e)}")
@@ -299,82 +541,444 @@ Analisar a compatibilidade entre o currículo do candidato modelo (fornecido no
                 "error": f"Erro ao analisar vaga: {str(e)}"
             }
     
-    def analyze_jobs_batch(self, jobs_data, max_retries=5, delay_between_calls=2, progress_callback=None):
+    def _generate(self, input_text, config, rate_limiter=None, outputs=1):
+        """
+        Envia o prompt do usuário ao Gemini (em streaming) e retorna o texto completo da resposta.
+        outputs é a quantidade de análises pedidas, usada na estimativa de tokens.
+        """
+        try:
+            # Preparar o conteúdo como Content struct
+            contents = [
+                types.Content(
+                    role="user",
+                    parts=[
+                        types.Part.from_text(text=input_text),
+                    ],
+                ),
+            ]
+            
+            # Respeitar as cotas de requisições e tokens por minuto (análise concorrente)
+            estimated_tokens = self.estimate_tokens(input_text, outputs)
+            if rate_limiter:
+                rate_limiter.acquire(estimated_tokens)
+            
+            # Gerar conteúdo - seguindo exatamente o exemplo fornecido
+            response_stream = self.client.models.generate_content_stream(
+                model=self.model_name,
+                contents=contents,
+                config=config,
+            )
+            
+            # Coletar todo o texto da resposta
+            result_json = ""
+            usage = None
+            for chunk in response_stream:
+                if chunk.text:
+                    result_json += chunk.text
+                if chunk.usage_metadata:
+                    usage = chunk.usage_metadata
+            
+            if rate_limiter:
+                rate_limiter.settle(estimated_tokens, usage.total_token_count if usage else None)
+            return result_json
+            
+        except Exception as e:
+            logger.error(f"Erro na chamada à API do Gemini: {str(e)}")
+            raise Exception(f"Falha na análise com Gemini API: {str(e)}")
+    
+    @staticmethod
+    def _extract_json(result_json):
+        """Decodifica o JSON da resposta (levanta json.JSONDecodeError se inválido)"""
+        # Tentar extrair o JSON da resposta, verificando se há código de formatação
+        # ao redor da resposta JSON
+        json_content = result_json
+        
+        # Tentar encontrar conteúdo JSON entre marcadores de código
+        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', result_json)
+        if json_match:
+            json_content = json_match.group(1).strip()
+            logger.info("Encontrado JSON entre marcadores de código")
+        
+        # Se não encontrar entre marcadores de código, procurar por chaves { } (ou colchetes [ ]) externas
+        if not json_match:
+            json_match = re.search(r'(\{[\s\S]*\}|\[[\s\S]*\])', result_json)
+            if json_match:
+                json_content = json_match.group(1).strip()
+                logger.info("Encontrado JSON entre chaves externas")
+        
+        # Processar o resultado como JSON
+        return json.loads(json_content)
+    
+    def _finish_analysis(self, job_data, analysis_data, store=True):
+        """
+        Completa a análise decodificada, grava no cache (se store) e acrescenta os dados para exibição.
+        Análises vindas de um pacote não são gravadas: o prompt e o schema do pacote são
+        outros, e a chave do cache identifica a análise individual.
+        """
+        # Mapear campos para manter compatibilidade com o código existente
+        if "pontuacao_requisitos" in analysis_data:
+            analysis_data["nota_requisitos"] = analysis_data["pontuacao_requisitos"]
+        
+        if "pontuacao_responsabilidades" in analysis_data:
+            analysis_data["nota_responsabilidades"] = analysis_data["pontuacao_responsabilidades"]
+        
+        # Tokens da descrição enviada e economizados pelo pré-processamento
+        self._prepare_job(job_data)
+        analysis_data["tokens_descricao"] = job_data['clean_description_tokens']
+        analysis_data["tokens_economizados"] = job_data['description_tokens'] - job_data['clean_description_tokens']
+        
+        # Adicionar informações de sistema às análises para exibição
+        if store:
+            self._store_analysis(self._build_input_text(job_data), analysis_data)
+        analysis_data["system_instructions"] = self.system_prompt
+        analysis_data["job_link"] = job_data.get('link', 'Não informado')
+        
+        # Retornar o resultado processado
+        return analysis_data
+    
+    def analyze_job_pack(self, jobs, rate_limiter=None):
+        """
+        Analisa várias vagas em uma única requisição ao Gemini (modo em pacotes).
+        
+        Args:
+            jobs (list): Dicionários das vagas, como em analyze_job
+            rate_limiter (GeminiRateLimiter, optional): Limitador das cotas por minuto
+            
+        Returns:
+            list: Um item por vaga, na mesma ordem: a análise (como a de analyze_job),
+                ou None se o pacote falhou ou a resposta não trouxe aquela vaga
+        """
+        results = [None] * len(jobs)
+        try:
+            logger.info(f"Enviando pacote de {len(jobs)} vagas para análise")
+            result_json = self._generate(self._build_pack_text(jobs), self.pack_generation_config,
+                                         rate_limiter, outputs=len(jobs))
+            items = self._extract_json(result_json) if result_json else []
+        except Exception as e:
+            logger.error(f"Erro ao analisar pacote de {len(jobs)} vagas: {str(e)}")
+            return results
+        
+        if not isinstance(items, list):
+            logger.error("Resposta do pacote não é uma lista de análises")
+            return results
+        
+        required = self.pack_generation_config.response_schema.items.required
+        for item in items:
+            try:
+                index = int(str(item.get("id_vaga", "")).strip()) - 1
+            except (AttributeError, ValueError):
+                continue
+            # IDs fora do pacote, repetidos ou itens incompletos ficam para a análise individual
+            if not 0 <= index < len(jobs) or results[index] is not None or any(key not in item for key in required):
+                continue
+            analysis_data = {key: value for key, value in item.items() if key != "id_vaga"}
+            job_data = jobs[index]
+            results[index] = self._finish_analysis(job_data, analysis_data, store=False)
+        
+        missing = sum(result is None for result in results)
+        if missing:
+            logger.warning(f"Pacote de {len(jobs)} vagas: {missing} sem análise na resposta")
+        return results
+    
+    def _pack_tokens(self, job_data):
+        """Tokens estimados de uma vaga dentro de um pacote (descrição e resposta)"""
+        return estimate_text_tokens(self._job_section(job_data)) + GEMINI_OUTPUT_TOKENS_ESTIMATE
+    
+    def _analyze_unit(self, indices, jobs_data, max_retries, delay_between_calls, rate_limiter=None):
+        """
+        Analisa uma vaga ou um pacote de vagas. As vagas de um pacote que falhou
+        (ou que faltaram na resposta) são analisadas individualmente.
+        
+        Returns:
+            list: Pares (posição em jobs_data, resultado)
+        """
+        if len(indices) > 1:
+            results = self.analyze_job_pack([jobs_data[i] for i in indices], rate_limiter)
+        else:
+            results = [None]
+        return [
+            (i, result if result is not None
+             else self._analyze_with_retries(jobs_data[i], max_retries, delay_between_calls, rate_limiter))
+            for i, result in zip(indices, results)
+        ]
+    
+    def _analyze_with_retries(self, job_data, max_retries, delay_between_calls, rate_limiter=None):
+        """
+        Analisa uma vaga, repetindo com backoff exponencial em caso de erro.
+        Esgotadas as tentativas, retorna o resultado com erro.
+        """
+        retry_count = 0
+        while True:
+            try:
+                # O cache já foi consultado pela AnalysisPipeline
+                result = self.analyze_job(job_data, rate_limiter=rate_limiter, check_cache=False)
+                
+                # Verificar se houve erro específico na análise
+                if "error" not in result:
+                    return result
+                retry_count += 1
+                error_msg = result.get("error", "Erro desconhecido")
+                logger.warning(f"Tentativa {retry_count}/{max_retries} falhou: {error_msg}")
+                if retry_count >= max_retries:
+                    # Se esgotaram as tentativas, aceitar o resultado com erro
+                    return result
+            
+            except Exception as e:
+                retry_count += 1
+                logger.error(f"Erro na tentativa {retry_count}/{max_retries}: {str(e)}")
+                if retry_count >= max_retries:
+                    return {
+                        "error": f"Erro após {max_retries} tentativas: {str(e)}"
+                    }
+            
+            # Esperar tempo progressivo entre tentativas (backoff exponencial)
+            wait_time = delay_between_calls * (2 ** (retry_count - 1))
+            logger.info(f"Aguardando {wait_time}s antes da próxima tentativa...")
+            time.sleep(wait_time)
+    
+    def start_pipeline(self, **kwargs):
+        """
+        Inicia uma análise em fluxo (AnalysisPipeline): as vagas são enviadas com put
+        à medida que ficam prontas, e close indica o fim. Aceita os mesmos parâmetros
+        de analyze_jobs_batch, mais expected_total (para o progresso).
+        """
+        return AnalysisPipeline(self, **kwargs)
+    
+    def analyze_jobs_batch(self, jobs_data, max_retries=5, delay_between_calls=2, progress_callback=None,
+                           max_concurrency=None, rate_limiter=None, pack_size=None):
         """
         Analisa um lote de vagas de emprego.
         
+        Com max_concurrency > 1, até max_concurrency requisições são feitas ao mesmo tempo,
+        e o ritmo das chamadas é dado pelas cotas de requisições e tokens por minuto
+        (GEMINI_RPM/GEMINI_TPM) em vez da pausa fixa entre chamadas. Com pack_size > 1,
+        cada requisição leva até pack_size vagas (analyze_job_pack).
+        
         Args:
             jobs_data (list): Lista de dicionários contendo os dados das vagas
             max_retries (int): Número máximo de tentativas em caso de erro
             delay_between_calls (int): Tempo de espera entre chamadas para evitar limites de API
+                (no modo concorrente, apenas a base do backoff entre tentativas)
             progress_callback (function, optional): Função de callback para atualizar o progresso
                 com assinatura (current, total, message)
+            max_concurrency (int, optional): Requisições simultâneas (padrão: GEMINI_MAX_CONCURRENCY)
+            rate_limiter (GeminiRateLimiter, optional): Limitador compartilhado (padrão: um novo,
+                com as cotas das variáveis de ambiente)
+            pack_size (int, optional): Vagas por requisição (padrão: GEMINI_PACK_SIZE)
             
         Returns:
-            list: Lista de resultados de análise para cada vaga
+            list: Lista de resultados de análise para cada vaga, na mesma ordem de jobs_data
         """
-        results = []
-        total_jobs = len(jobs_data)
+        pipeline = self.start_pipeline(
+            max_retries=max_retries, delay_between_calls=delay_between_calls,
+            progress_callback=progress_callback, max_concurrency=max_concurrency,
+            rate_limiter=rate_limiter, pack_size=pack_size, expected_total=len(jobs_data)
+        )
+        for job_data in jobs_data:
+            pipeline.put(job_data)
+        pipeline.close()
+        return pipeline.join()
+
+
+class AnalysisPipeline:
+    """
+    Análise em fluxo: as vagas entram por put enquanto outras ainda estão sendo
+    extraídas, e são analisadas em segundo plano, com até max_concurrency requisições
+    simultâneas (uma vaga ou um pacote de vagas cada). A fila de entrada é limitada
+    (GEMINI_PIPELINE_QUEUE_SIZE): se a análise atrasar, put espera.
+    
+    close indica que não há mais vagas; join espera o fim e retorna os resultados
+    na ordem em que as vagas entraram. Se o dispatcher falhar, as vagas pendentes
+    recebem um resultado de erro, a fila continua sendo esvaziada, e put e close
+    levantam a exceção em vez de esperar.
+    """
+    _END = object()
+    
+    def __init__(self, analyzer, max_retries=5, delay_between_calls=2, progress_callback=None,
+                 max_concurrency=None, rate_limiter=None, pack_size=None, expected_total=None):
+        self.analyzer = analyzer
+        self.max_retries = max_retries
+        self.delay_between_calls = delay_between_calls
+        self.progress_callback = progress_callback
+        self.max_concurrency = GEMINI_MAX_CONCURRENCY if max_concurrency is None else max_concurrency
+        self.pack_size = GEMINI_PACK_SIZE if pack_size is None else pack_size
+        self.expected_total = expected_total or 0
         
-        for i, job_data in enumerate(jobs_data):
-            current = i + 1
-            job_title = job_data.get('job_title', 'Sem título')
-            
-            # Atualizar progresso
-            if progress_callback:
-                progress_callback(current, total_jobs, f"Analisando vaga {current}/{total_jobs}: {job_title}")
+        # Sem concorrência, as chamadas seguem espaçadas por delay_between_calls, como antes
+        self.sequential = self.max_concurrency <= 1
+        if rate_limiter is None and not self.sequential:
+            rate_limiter = GeminiRateLimiter()
+        self.rate_limiter = rate_limiter
+        self.last_call_at = None
+        
+        self.queue = queue.Queue(maxsize=GEMINI_PIPELINE_QUEUE_SIZE)
+        self.lock = threading.Lock()
+        self.jobs = []       # Vagas na ordem de entrada
+        self.results = []    # Resultado de cada vaga (mesma posição de self.jobs)
+        self.submitted = 0   # Vagas recebidas por put (incluindo as que ainda estão na fila)
+        self.completed = 0
+        self.cache_hits = 0
+        self.requests = 0
+        self.error = None    # Exceção que interrompeu o dispatcher
+        self.closed = False  # O dispatcher já recebeu _END (fim da fila)
+        
+        workers = max(1, self.max_concurrency)
+        self.slots = threading.BoundedSemaphore(workers)  # Requisições em andamento
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='gemini-analysis')
+        self.dispatcher = threading.Thread(target=self._dispatch, name='gemini-dispatch', daemon=True)
+        self.dispatcher.start()
+    
+    def put(self, job_data):
+        """Envia uma vaga para análise (espera se a fila estiver cheia)"""
+        self._raise_error()
+        with self.lock:
+            self.submitted += 1
+        self.queue.put(job_data)
+    
+    def close(self):
+        """Indica que não há mais vagas"""
+        # Mesmo após uma falha: o dispatcher só termina de esvaziar a fila ao receber _END
+        self.queue.put(self._END)
+        self._raise_error()
+    
+    def _raise_error(self):
+        if self.error is not None:
+            raise RuntimeError(f"Análise em fluxo interrompida: {str(self.error)}") from self.error
+    
+    def join(self):
+        """Espera o fim das análises e retorna os resultados, na ordem de entrada das vagas"""
+        self.dispatcher.join()
+        tokens_saved = sum(result.get("tokens_economizados", 0) for result in self.results if result)
+        logger.info(f"Análise em fluxo concluída: {len(self.results)} vagas, {self.cache_hits} do cache, "
+                    f"{self.requests} requisições ao Gemini, {tokens_saved} tokens de descrição economizados")
+        return self.results
+    
+    def _dispatch(self):
+        """Lê a fila de entrada, resolve o cache e envia vagas (ou pacotes) aos workers"""
+        try:
+            self._dispatch_jobs()
+        except Exception as e:
+            logger.error(f"Erro no despacho das análises: {str(e)}")
+            self.error = e
+            # Com _END já consumido (falha no envio do último pacote), a fila está vazia
+            if not self.closed:
+                self._drain()
+        self.executor.shutdown(wait=True)
+        
+        if self.error is not None:
+            # Vagas que não chegaram a ser enviadas (inclusive as esvaziadas da fila):
+            # todos os resultados preenchidos antes de avisar o progresso
+            error = {"error": f"Erro ao analisar vaga: {str(self.error)}"}
+            with self.lock:
+                pending = [i for i, result in enumerate(self.results) if result is None]
+                for i in pending:
+                    self.results[i] = dict(error)
+                self.completed += len(pending)
+                completed = self.completed
+                total = max(self.expected_total, self.submitted)
+            if pending:
+                self._report_progress(completed, total, f"{len(pending)} vagas não analisadas: {str(self.error)}")
+    
+    def _drain(self):
+        """Após uma falha, consome a fila até close, para que put não fique bloqueado"""
+        while True:
+            job_data = self.queue.get()
+            if job_data is self._END:
+                return
+            with self.lock:
+                self.jobs.append(job_data)
+                self.results.append(None)
+    
+    def _dispatch_jobs(self):
+        pack, pack_tokens = [], 0
+        while True:
+            try:
+                # Com um pacote incompleto, não esperar indefinidamente por mais vagas
+                job_data = self.queue.get(timeout=GEMINI_PACK_WAIT if pack else None)
+            except queue.Empty:
+                self._submit(pack)
+                pack, pack_tokens = [], 0
+                continue
+            if job_data is self._END:
+                self.closed = True
+                break
             
-            # Tentativas com retry
-            retry_count = 0
-            success = False
-            result = None
+            with self.lock:
+                i = len(self.jobs)
+                self.jobs.append(job_data)
+                self.results.append(None)
             
-            while not success and retry_count < max_retries:
-                try:
-                    result = self.analyze_job(job_data)
-                    
-                    # Verificar se houve erro específico na análise
-                    if "error" in result:
-                        retry_count += 1
-                        error_msg = result.get("error", "Erro desconhecido")
-                        logger.warning(f"Tentativa {retry_count}/{max_retries} falhou: {error_msg}")
-                        
-                        if retry_count < max_retries:
-                            # Esperar tempo progressivo entre tentativas (backoff exponencial)
-                            wait_time = delay_between_calls * (2 ** (retry_count - 1))
-                            logger.info(f"Aguardando {wait_time}s antes da próxima tentativa...")
-                            time.sleep(wait_time)
-                        else:
-                            # Se esgotaram as tentativas, aceitar o resultado com erro
-                            success = True
-                    else:
-                        # Sucesso na análise
-                        success = True
-                
-                except Exception as e:
-                    retry_count += 1
-                    logger.error(f"Erro na tentativa {retry_count}/{max_retries}: {str(e)}")
-                    
-                    if retry_count < max_retries:
-                        # Esperar antes da próxima tentativa
-                        wait_time = delay_between_calls * (2 ** (retry_count - 1))
-                        logger.info(f"Aguardando {wait_time}s antes da próxima tentativa...")
-                        time.sleep(wait_time)
-                    else:
-                        # Se esgotaram as tentativas, criar um resultado de erro
-                        result = {
-                            "error": f"Erro após {max_retries} tentativas: {str(e)}"
-                        }
-                        success = True  # Para sair do loop
+            # Vagas já analisadas (cache persistente) não ocupam chamadas nem esperas
+            cached = self.analyzer.cached_analysis(job_data)
+            if cached is not None:
+                self.cache_hits += 1
+                self._complete([i], [(i, cached)], cached=True)
+                continue
             
-            # Adicionar o resultado à lista
-            results.append(result)
+            if self.pack_size <= 1:
+                self._submit([i])
+                continue
             
-            # Esperar entre chamadas para evitar rate limits
-            if i < total_jobs - 1:  # Não esperar após o último item
-                time.sleep(delay_between_calls)
+            tokens = self.analyzer._pack_tokens(job_data)
+            if pack and pack_tokens + tokens > GEMINI_PACK_MAX_TOKENS:
+                self._submit(pack)
+                pack, pack_tokens = [], 0
+            pack.append(i)
+            pack_tokens += tokens
+            if len(pack) >= self.pack_size:
+                self._submit(pack)
+                pack, pack_tokens = [], 0
         
-        return results
+        if pack:
+            self._submit(pack)
+    
+    def _submit(self, unit):
+        self.slots.acquire()
+        self.requests += 1
+        self.executor.submit(self._run, unit)
+    
+    def _run(self, unit):
+        try:
+            if self.sequential and self.last_call_at is not None:
+                # Esperar entre chamadas para evitar rate limits
+                time.sleep(max(0, self.last_call_at + self.delay_between_calls - time.time()))
+            pairs = self.analyzer._analyze_unit(unit, self.jobs, self.max_retries,
+                                                self.delay_between_calls, self.rate_limiter)
+        except Exception as e:
+            logger.error(f"Erro ao analisar vagas: {str(e)}")
+            pairs = [(i, {"error": f"Erro ao analisar vaga: {str(e)}"}) for i in unit]
+        finally:
+            self.last_call_at = time.time()
+            self.slots.release()
+        self._complete(unit, pairs)
+    
+    def _complete(self, unit, pairs, cached=False):
+        with self.lock:
+            for i, result in pairs:
+                self.results[i] = result
+            self.completed += len(pairs)
+            completed = self.completed
+            total = max(self.expected_total, self.submitted)
+        
+        # Atualizar progresso
+        if self.progress_callback:
+            title = self.jobs[unit[0]].get('job_title', 'Sem título')
+            if len(unit) > 1:
+                message = f"Analisado pacote de {len(unit)} vagas ({completed}/{total})"
+            elif cached:
+                message = f"Vaga {completed}/{total} obtida do cache: {title}"
+            else:
+                message = f"Analisada vaga {completed}/{total}: {title}"
+            self._report_progress(completed, total, message)
+    
+    def _report_progress(self, completed, total, message):
+        """Chama o progress_callback; um erro nele não interrompe a análise"""
+        if not self.progress_callback:
+            return
+        try:
+            self.progress_callback(completed, total, message)
+        except Exception as e:
+            logger.error(f"Erro no callback de progresso da análise: {str(e)}")
 
 def format_text_with_breaks(text):
     """
@@ -4,12 +4,14 @@ import logging
 
 import pandas as pd
 print("pandas carregado com sucesso")
-import trafilatura
 import os
 import datetime
 import csv
+import codecs
+import hashlib
 from io import BytesIO
-from requests_html import HTMLSession
+from lxml import etree
+from lxml import html as lxml_html
 import re
 import openpyxl
 from openpyxl.styles import Alignment
@@ -17,27 +19,555 @@ import json
 import random
 import time
 import socket
+import heapq
+import threading
+import multiprocessing
+from functools import partial
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
 from requests.exceptions import RequestException, ProxyError, ConnectTimeout
+from extraction_plan import get_extraction_plan, html_fragment_text
+from page_archive import KIND_GUEST, KIND_PAGE, get_page_archive
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Modo de download das vagas: 'page' (página pública completa) ou 'guest'
+# (fragmento do endpoint de convidado, bem menor; volta para a página completa se faltar algum campo)
+FETCH_MODE = os.environ.get("SCRAPER_FETCH_MODE", "page")
+LINKEDIN_GUEST_JOB_URL = os.environ.get(
+    "LINKEDIN_GUEST_JOB_URL", "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+)
+# Campos que o fragmento precisa trazer para dispensar a página completa
+GUEST_REQUIRED_FIELDS = ('company_name', 'job_title', 'job_description')
+
+# Leitura do corpo em streaming, parando assim que o top card e a descrição fecharem
+STREAMING_FETCH = os.environ.get("SCRAPER_STREAMING", "1") != "0"
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Número de requisições simultâneas na extração (configurável via variável de ambiente)
+DEFAULT_MAX_WORKERS = int(os.environ.get("SCRAPER_MAX_WORKERS", "8"))
+
+# Processos de parse (0 = parse nas próprias threads de download). Com processos, as
+# threads só baixam o corpo e o entregam por uma fila limitada a PARSE_QUEUE_SIZE páginas
+PARSE_WORKERS = int(os.environ.get("SCRAPER_PARSE_WORKERS", "0"))
+PARSE_QUEUE_SIZE = int(os.environ.get("SCRAPER_PARSE_QUEUE_SIZE", str(max(2, PARSE_WORKERS * 2))))
+
+# Controle adaptativo de taxa (AIMD), por proxy/IP e global, em requisições por segundo:
+# cada resposta limpa soma um passo à taxa; um sinal de bloqueio (HTTP 429/999 ou
+# redirecionamento para o authwall) multiplica a taxa por RATE_DECREASE_FACTOR
+PROXY_RATE_INITIAL = 1 / 3.5        # Equivale ao antigo intervalo de 2 a 5 s por IP
+PROXY_RATE_LIMITS = (1 / 60, 1.0)   # Taxa mínima e máxima por proxy/IP
+PROXY_RATE_STEP = 0.01
+GLOBAL_RATE_INITIAL = 2.0
+GLOBAL_RATE_LIMITS = (0.2, float(os.environ.get("SCRAPER_MAX_RATE", "10")))
+GLOBAL_RATE_STEP = 0.05
+RATE_DECREASE_FACTOR = 0.5
+RATE_DECREASE_HOLDOFF = 10.0        # Intervalo mínimo (s) entre duas reduções da mesma taxa
+RATE_JITTER = (0.8, 1.2)            # Variação aleatória do intervalo entre requisições
+THROTTLE_STATUS_CODES = (429, 999)
+AUTHWALL_URL_MARKERS = ('/authwall', '/login', '/checkpoint/', '/uas/login')
+
+# Classificação rápida das respostas, antes do parse: pelo status, pelo URL final e
+# por marcadores nos primeiros bytes do corpo (sem montar a árvore)
+EXPIRED_STATUS_CODES = (404, 410)
+CLASSIFY_HEAD_SIZE = 16 * 1024       # Trecho inicial onde o <title> é procurado
+CLASSIFY_SCAN_LIMIT = 64 * 1024      # Trecho procurado por marcadores sem streaming
+BLOCKED_MAX_BODY_SIZE = 2048         # Corpo completo menor que isso e sem marcadores de vaga: bloqueio
+TITLE_RE = re.compile(rb'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+BLOCKED_TITLE_MARKERS = (
+    b'sign in | linkedin', b'sign up | linkedin', b'linkedin login', b'security verification',
+    b'entrar | linkedin', b'cadastre-se | linkedin', b'verifica\xc3\xa7\xc3\xa3o de seguran\xc3\xa7a',
+)
+BLOCKED_BODY_MARKERS = (b'captcha-internal', b'g-recaptcha', b'/checkpoint/challenge')
+EXPIRED_BODY_MARKERS = (
+    b'no longer accepting applications', b'this job is no longer available', b'closed-job',
+    b'n\xc3\xa3o aceita mais candidaturas', b'esta vaga n\xc3\xa3o est\xc3\xa1 mais dispon\xc3\xadvel',
+)
+JOB_PAGE_MARKERS = (b'top-card-layout', b'description__text', b'job-details', b'jobposting')
+
+# Tentativas por URL: todas por proxy, menos a última, que usa conexão direta.
+# Uma URL que falha volta para a fila de novas tentativas e é reprocessada depois,
+# com espera exponencial e aleatória (sem prender o worker)
+FETCH_MAX_ATTEMPTS = int(os.environ.get("SCRAPER_MAX_ATTEMPTS", "4"))
+RETRY_BACKOFF_BASE = 2.0   # Espera máxima (s) antes da 2ª tentativa, dobrando a cada falha
+RETRY_BACKOFF_MAX = 60.0   # Limite da espera (s)
+PROXY_AVOID_RESAMPLES = 3  # Sorteios extras para não repetir um proxy que já falhou na mesma URL
+
+# Requisições "hedged" (opcional): se o download não terminar até o p90 das latências
+# observadas, uma cópia sai por outro proxy e vale a primeira resposta
+HEDGED_REQUESTS = os.environ.get("SCRAPER_HEDGED_REQUESTS", "0") == "1"
+HEDGE_PERCENTILE = 0.9
+HEDGE_MIN_SAMPLES = 20         # Latências observadas antes de começar a duplicar
+HEDGE_MIN_DELAY = 0.5          # Espera mínima (s) antes de duplicar
+HEDGE_MAX_EXTRA_LOAD = float(os.environ.get("SCRAPER_HEDGE_MAX_EXTRA_LOAD", "0.1"))  # Cópias / downloads
+HEDGE_LATENCY_WINDOW = 200     # Latências recentes usadas no percentil
+HEDGE_THREADS_PER_WORKER = 3   # Threads do pool por worker de download: original, cópia e uma perdedora terminando
+
+# Headers padrão para simular um navegador
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Connection': 'keep-alive',
+    'Referer': 'https://www.google.com/'
+}
+
+# Parâmetros de saúde dos proxies
+PROXY_EWMA_ALPHA = 0.3              # Peso da latência mais recente na média móvel exponencial
+PROXY_DEFAULT_LATENCY = 5.0         # Latência presumida (s) para proxies ainda não medidos
+PROXY_BASE_COOLDOWN = 60            # Quarentena (s) após a primeira falha, dobrando a cada falha seguida
+PROXY_MAX_COOLDOWN = 30 * 60        # Limite da quarentena (s)
+PROXY_MAX_CONSECUTIVE_FAILURES = 5  # Falhas seguidas até o proxy ser descartado
+PROXY_MIN_AVAILABLE = 20            # Abaixo disso a lista é atualizada em segundo plano
+PROXY_MIN_REFRESH_INTERVAL = 60     # Intervalo mínimo (s) entre atualizações em segundo plano
+
+# Validação de proxies candidatos antes de entrarem no pool ativo
+PROXY_CHECK_URL = os.environ.get("PROXY_CHECK_URL", "https://www.linkedin.com/robots.txt")
+PROXY_VALIDATION_TIMEOUT = 5        # Tempo máximo (s) de cada teste
+PROXY_VALIDATION_WORKERS = 32       # Testes simultâneos
+PROXY_WARMUP_TIMEOUT = 15           # Espera máxima (s) pelo primeiro proxy validado
+
+# Pool de sessões HTTP reaproveitadas entre requisições (keep-alive)
+SESSION_POOL_MAX_IDLE = 32          # Sessões ociosas mantidas abertas no total
+SESSION_POOL_IDLE_TIMEOUT = 90      # Tempo (s) ociosa até a sessão ser fechada
+
+class ScrapeStats:
+    """
+    Contadores de instrumentação da extração (sessões criadas/reaproveitadas, etc.),
+    compartilhados entre os workers, bytes transferidos e histórico de tentativas por URL.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.transfers = {}  # url -> (bytes lidos, Content-Length ou None, leitura interrompida)
+        self.attempts = {}   # url -> [(tentativa, proxy ou None, status HTTP ou erro, duração em s)]
+    
+    def incr(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def record_transfer(self, url, bytes_read, content_length, stopped_early=False):
+        """Registra quantos bytes do corpo foram lidos da rede, frente ao Content-Length"""
+        with self.lock:
+            self.transfers[url] = (bytes_read, content_length, stopped_early)
+            self.counters['bytes_downloaded'] = self.counters.get('bytes_downloaded', 0) + bytes_read
+            if content_length:
+                self.counters['bytes_announced'] = self.counters.get('bytes_announced', 0) + content_length
+            if stopped_early:
+                self.counters['streams_stopped_early'] = self.counters.get('streams_stopped_early', 0) + 1
+    
+    def transfer_snapshot(self):
+        with self.lock:
+            return dict(self.transfers)
+    
+    def record_attempt(self, url, attempt, proxy, outcome, elapsed):
+        """Registra uma tentativa de download da URL (outcome: status HTTP ou descrição do erro)"""
+        with self.lock:
+            self.attempts.setdefault(url, []).append((attempt, proxy, outcome, round(elapsed, 3)))
+    
+    def proxies_tried(self, url):
+        """Proxies já usados em tentativas que falharam para a URL"""
+        with self.lock:
+            return {proxy for _, proxy, outcome, _ in self.attempts.get(url, ())
+                    if proxy and not (isinstance(outcome, int) and outcome < 400)}
+    
+    def attempt_snapshot(self):
+        with self.lock:
+            return {url: list(history) for url, history in self.attempts.items()}
+    
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.transfers = {}
+            self.attempts = {}
+    
+    def snapshot(self):
+        with self.lock:
+            return dict(self.counters)
+
+scrape_stats = ScrapeStats()
+
+class LatencyTracker:
+    """
+    Latências recentes dos downloads bem-sucedidos e orçamento de cópias das
+    requisições hedged (no máximo HEDGE_MAX_EXTRA_LOAD cópias por download).
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = deque(maxlen=HEDGE_LATENCY_WINDOW)
+        self.fetches = 0
+        self.hedges = 0
+    
+    def record(self, latency):
+        with self.lock:
+            self.samples.append(latency)
+    
+    def hedge_delay(self):
+        """Espera antes de duplicar um download (p90 observado), ou None sem amostras suficientes"""
+        with self.lock:
+            self.fetches += 1
+            if len(self.samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return max(HEDGE_MIN_DELAY, ordered[min(len(ordered) - 1, int(len(ordered) * HEDGE_PERCENTILE))])
+    
+    def try_acquire_hedge(self):
+        """Reserva uma cópia se o orçamento de carga extra permitir"""
+        with self.lock:
+            if self.hedges + 1 > self.fetches * HEDGE_MAX_EXTRA_LOAD:
+                return False
+            self.hedges += 1
+            return True
+
+latency_tracker = LatencyTracker()
+
+class SessionPool:
+    """
+    Pool de sessões HTTP por proxy. Sessões devolvidas ficam ociosas e são
+    reaproveitadas na próxima requisição pelo mesmo proxy, mantendo a conexão
+    (TCP/TLS) aberta. O número de sessões ociosas é limitado e as que ficam
+    paradas por mais de idle_timeout segundos são fechadas.
+    """
+    def __init__(self, max_idle=SESSION_POOL_MAX_IDLE, idle_timeout=SESSION_POOL_IDLE_TIMEOUT):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.lock = threading.Lock()
+        # (proxy, sessão) -> horário de devolução, da menos para a mais recentemente usada
+        self.idle = OrderedDict()
+    
+    def _new_session(self, proxy):
+        session = requests.Session()
+        session.headers.update(BROWSER_HEADERS)
+        if proxy:
+            session.proxies = {"http": proxy, "https": proxy}
+        scrape_stats.incr('sessions_created')
+        return session
+    
+    def _close(self, session, reason):
+        try:
+            session.close()
+        except Exception:
+            pass
+        scrape_stats.incr(f'sessions_closed_{reason}')
+    
+    def _evict_expired(self, now):
+        expired = [key for key, released_at in self.idle.items() if now - released_at > self.idle_timeout]
+        for key in expired:
+            del self.idle[key]
+        return [session for _, session in expired]
+    
+    def acquire(self, proxy):
+        """Retorna uma sessão ociosa do proxy, ou cria uma nova"""
+        with self.lock:
+            expired = self._evict_expired(time.time())
+            session = None
+            # Preferir a sessão devolvida mais recentemente (conexão mais provável de estar viva)
+            for key in reversed(self.idle):
+                if key[0] == proxy:
+                    del self.idle[key]
+                    session = key[1]
+                    break
+        
+        for old_session in expired:
+            self._close(old_session, 'idle')
+        
+        if session is None:
+            return self._new_session(proxy)
+        scrape_stats.incr('sessions_reused')
+        return session
+    
+    def release(self, proxy, session, reusable=True):
+        """Devolve a sessão ao pool; sessões com erro de conexão são fechadas"""
+        if not reusable:
+            self._close(session, 'error')
+            return
+        with self.lock:
+            self.idle[(proxy, session)] = time.time()
+            overflow = []
+            while len(self.idle) > self.max_idle:
+                key, _ = self.idle.popitem(last=False)
+                overflow.append(key[1])
+        for old_session in overflow:
+            self._close(old_session, 'overflow')
+    
+    def discard_proxy(self, proxy):
+        """Fecha todas as sessões ociosas de um proxy descartado"""
+        with self.lock:
+            keys = [key for key in self.idle if key[0] == proxy]
+            for key in keys:
+                del self.idle[key]
+        for _, session in keys:
+            self._close(session, 'discarded')
+
+class WeightedIndex:
+    """
+    Árvore de Fenwick (binary indexed tree) com um peso por posição.
+    
+    Permite alterar pesos e sortear uma posição proporcionalmente ao peso em O(log n).
+    Posições com peso zero nunca são sorteadas.
+    """
+    def __init__(self):
+        self.tree = [0.0]  # Índice 0 não utilizado (árvore indexada a partir de 1)
+        self.weights = []
+    
+    def __len__(self):
+        return len(self.weights)
+    
+    def append(self, weight):
+        """Adiciona uma nova posição com o peso informado e retorna seu índice"""
+        index = len(self.weights) + 1
+        # O nó cobre o intervalo (index - lowbit(index), index]
+        lowbit = index & -index
+        self.tree.append(weight + self._prefix_sum(index - 1) - self._prefix_sum(index - lowbit))
+        self.weights.append(weight)
+        return index - 1
+    
+    def update(self, position, weight):
+        """Altera o peso de uma posição"""
+        delta = weight - self.weights[position]
+        self.weights[position] = weight
+        index = position + 1
+        while index < len(self.tree):
+            self.tree[index] += delta
+            index += index & -index
+    
+    def total(self):
+        return self._prefix_sum(len(self.weights))
+    
+    def _prefix_sum(self, index):
+        total = 0.0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+    
+    def sample(self):
+        """Sorteia uma posição proporcionalmente ao peso, ou None se todos forem zero"""
+        total = self.total()
+        if total <= 0:
+            return None
+        target = random.uniform(0, total)
+        
+        # Descida na árvore para achar a primeira posição cuja soma acumulada passa do alvo
+        position = 0
+        step = 1 << (len(self.tree).bit_length() - 1)
+        while step:
+            next_position = position + step
+            if next_position < len(self.tree) and self.tree[next_position] < target:
+                position = next_position
+                target -= self.tree[next_position]
+            step >>= 1
+        
+        # Proteção contra arredondamento de ponto flutuante caindo em peso zero
+        if position >= len(self.weights) or self.weights[position] <= 0:
+            candidates = [i for i, w in enumerate(self.weights) if w > 0]
+            return candidates[-1] if candidates else None
+        return position
+
+class ProxyStats:
+    """
+    Estatísticas de saúde de um proxy: taxa de sucesso, latência (EWMA),
+    última falha e quarentena.
+    """
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ewma_latency = None
+        self.last_failure = None
+        self.cooldown_until = 0
+    
+    @property
+    def success_rate(self):
+        # Suavização de Laplace para que proxies novos não comecem com 0% ou 100%
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+    
+    @property
+    def is_dead(self):
+        return self.consecutive_failures >= PROXY_MAX_CONSECUTIVE_FAILURES
+    
+    def record_success(self, latency):
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.cooldown_until = 0
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency = PROXY_EWMA_ALPHA * latency + (1 - PROXY_EWMA_ALPHA) * self.ewma_latency
+    
+    def record_failure(self):
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_failure = time.time()
+        cooldown = min(PROXY_MAX_COOLDOWN, PROXY_BASE_COOLDOWN * 2 ** (self.consecutive_failures - 1))
+        self.cooldown_until = self.last_failure + cooldown
+    
+    def weight(self, now=None):
+        """Peso de escolha: proxies confiáveis e rápidos são preferidos"""
+        now = time.time() if now is None else now
+        if self.is_dead or now < self.cooldown_until:
+            return 0.0
+        latency = self.ewma_latency if self.ewma_latency is not None else PROXY_DEFAULT_LATENCY
+        return self.success_rate / max(latency, 0.1)
+
+class AIMDRate:
+    """
+    Taxa de requisições (por segundo) com aumento aditivo e redução multiplicativa.
+    Reduções seguidas dentro de RATE_DECREASE_HOLDOFF contam como uma só, para que
+    uma rajada de respostas 429 de requisições simultâneas não derrube a taxa de vez.
+    """
+    def __init__(self, initial, limits, step):
+        self.minimum, self.maximum = limits
+        self.rate = min(max(initial, self.minimum), self.maximum)
+        self.step = step
+        self.last_decrease = 0
+    
+    def increase(self):
+        self.rate = min(self.maximum, self.rate + self.step)
+    
+    def decrease(self, now):
+        if now - self.last_decrease < RATE_DECREASE_HOLDOFF:
+            return False
+        self.rate = max(self.minimum, self.rate * RATE_DECREASE_FACTOR)
+        self.last_decrease = now
+        return True
+    
+    def interval(self):
+        return random.uniform(*RATE_JITTER) / self.rate
+
+class RateController:
+    """
+    Espaça as requisições conforme as taxas AIMD de cada proxy/IP (None = conexão
+    direta) e a taxa global. Cada chamada de reserve marca o próximo horário livre,
+    de modo que workers concorrentes usando o mesmo IP ficam espaçados.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.global_rate = AIMDRate(GLOBAL_RATE_INITIAL, GLOBAL_RATE_LIMITS, GLOBAL_RATE_STEP)
+        self.proxy_rates = {}
+        self.next_allowed_at = {}  # proxy -> próximo horário permitido
+        self.next_global_at = 0
+    
+    def _proxy_rate(self, proxy):
+        rate = self.proxy_rates.get(proxy)
+        if rate is None:
+            rate = self.proxy_rates[proxy] = AIMDRate(PROXY_RATE_INITIAL, PROXY_RATE_LIMITS, PROXY_RATE_STEP)
+        return rate
+    
+    def reserve(self, proxy):
+        """Reserva o próximo horário livre para o proxy e retorna quantos segundos esperar"""
+        with self.lock:
+            now = time.time()
+            start_at = max(now, self.next_allowed_at.get(proxy, 0), self.next_global_at)
+            self.next_allowed_at[proxy] = start_at + self._proxy_rate(proxy).interval()
+            self.next_global_at = start_at + self.global_rate.interval()
+        return start_at - now
+    
+    def record(self, proxy, throttled):
+        """Ajusta as taxas do proxy e global a partir de uma resposta (limpa ou com sinal de bloqueio)"""
+        with self.lock:
+            rate = self._proxy_rate(proxy)
+            if not throttled:
+                rate.increase()
+                self.global_rate.increase()
+                return
+            now = time.time()
+            if rate.decrease(now):
+                logger.info(f"Sinal de bloqueio em {proxy or 'conexão direta'}: taxa reduzida para {rate.rate:.3f} req/s")
+            if self.global_rate.decrease(now):
+                logger.info(f"Taxa global reduzida para {self.global_rate.rate:.2f} req/s")
+                # Adiar também as requisições já reservadas para o novo ritmo
+                self.next_global_at = max(self.next_global_at, now + self.global_rate.interval())
+    
+    def current_rate(self):
+        """Taxa global atual (req/s)"""
+        with self.lock:
+            return self.global_rate.rate
+    
+    def snapshot(self):
+        with self.lock:
+            return {
+                'global': round(self.global_rate.rate, 3),
+                'proxies': {proxy or 'direct': round(rate.rate, 3) for proxy, rate in self.proxy_rates.items()},
+            }
+
+def _is_throttled(response):
+    """Sinais de que o LinkedIn está limitando este cliente: HTTP 429/999 ou redirecionamento para o authwall"""
+    if response.status_code in THROTTLE_STATUS_CODES:
+        return True
+    if response.history:
+        return any(marker in response.url for marker in AUTHWALL_URL_MARKERS)
+    return False
+
 class ProxyManager:
     """
     Gerencia uma lista de proxies gratuitos para rotacionar IPs entre as requisições.
+    
+    A construção não faz nenhuma requisição de rede: o pool é preenchido em segundo
+    plano na primeira utilização (ou antes, chamando refresh_in_background).
     """
-    def __init__(self):
-        # Lista de proxies iniciais conhecidos
+    def __init__(self, check_url=None):
+        # URL usada para validar proxies candidatos (pode apontar para um servidor local)
+        self.check_url = check_url or PROXY_CHECK_URL
+        # Lista de proxies validados; a posição de cada um é sua posição em self.index
         self.proxies = []
+        self.stats = {}                 # proxy -> ProxyStats
+        self.positions = {}             # proxy -> posição na lista/índice
+        self.index = WeightedIndex()    # Pesos para sorteio ponderado em O(log n)
+        self.cooldowns = []             # Heap de (fim da quarentena, proxy)
+        self.available = 0              # Quantidade de proxies com peso > 0
+        self.rejected = {}              # proxy -> horário em que falhou na validação
+        self.ready = threading.Event()  # Sinaliza o fim do primeiro aquecimento do pool
+        self.refresh_thread = None
+        self.sessions = SessionPool()   # Sessões reaproveitadas por proxy
         self.last_update = None
         self.update_interval = 30 * 60  # 30 minutos em segundos
-        # Inicializar a lista de proxies
-        self.update_proxy_list()
+        # Controle de concorrência entre os workers de extração
+        self.lock = threading.RLock()
+        self.update_lock = threading.Lock()
+        # Espaçamento adaptativo das requisições por proxy (None = conexão direta) e global
+        self.rates = RateController()
         
     def update_proxy_list(self):
-        """Atualiza a lista de proxies disponíveis de serviços públicos gratuitos"""
+        """
+        Atualiza o pool de proxies: obtém candidatos de serviços públicos gratuitos,
+        testa-os em paralelo contra a URL de verificação e promove ao pool ativo
+        apenas os que responderem.
+        """
+        # Evitar atualizações simultâneas disparadas por workers diferentes
+        if not self.update_lock.acquire(blocking=False):
+            logger.debug("Atualização de proxies já em andamento, ignorando nova solicitação")
+            return
+        try:
+            self._update_proxy_list()
+        finally:
+            self.update_lock.release()
+
+    def _update_proxy_list(self):
         logger.debug("Atualizando lista de proxies")
+        with self.lock:
+            # Compactar o pool, descartando proxies mortos
+            self._rebuild_index(self.proxies)
+            now = time.time()
+            known = set(self.stats)
+            known.update(proxy for proxy, rejected_at in self.rejected.items()
+                         if now - rejected_at < self.update_interval)
+        
+        candidates = [proxy for proxy in self._fetch_candidate_proxies() if proxy not in known]
+        promoted = self._validate_candidates(candidates)
+        
+        with self.lock:
+            logger.debug(f"Pool de proxies atualizado: {promoted}/{len(candidates)} candidatos aprovados. "
+                         f"Total: {len(self.proxies)} proxies, {self.available} disponíveis")
+            self.last_update = time.time()
+        self.ready.set()
+    
+    def _fetch_candidate_proxies(self):
+        """Obtém proxies candidatos (ainda não testados) de serviços públicos gratuitos"""
+        found = []
         
         # Método 1: Usar proxylist.geonode.com
         try:
@@ -51,8 +581,8 @@ class ProxyManager:
                     protocol = proxy.get('protocols')[0].lower()
                     if ip and port and protocol:
                         proxy_str = f"{protocol}://{ip}:{port}"
-                        if proxy_str not in self.proxies:
-                            self.proxies.append(proxy_str)
+                        if proxy_str not in found:
+                            found.append(proxy_str)
                 logger.debug(f"Adicionados {len(data.get('data', []))} proxies do geonode")
         except Exception as e:
             logger.warning(f"Erro ao obter proxies do geonode: {str(e)}")
@@ -73,17 +603,17 @@ class ProxyManager:
                         https = cols[6].text.strip()
                         protocol = 'https' if https == 'yes' else 'http'
                         proxy_str = f"{protocol}://{ip}:{port}"
-                        if proxy_str not in self.proxies:
-                            self.proxies.append(proxy_str)
+                        if proxy_str not in found:
+                            found.append(proxy_str)
                             count += 1
                 logger.debug(f"Adicionados {count} proxies do free-proxy-list")
         except Exception as e:
             logger.warning(f"Erro ao obter proxies do free-proxy-list: {str(e)}")
             
-        # Método 3: Adicionar alguns proxies conhecidos se a lista estiver vazia
-        if not self.proxies:
+        # Método 3: Adicionar alguns proxies conhecidos se nada foi obtido
+        if not found and not self.proxies:
             logger.warning("Nenhum proxy obtido dos serviços online. Adicionando proxies padrão.")
-            default_proxies = [
+            found = [
                 "http://34.124.225.130:8080",
                 "http://122.9.21.228:8080",
                 "http://103.149.146.252:80",
@@ -95,455 +625,1206 @@ class ProxyManager:
                 "http://20.24.43.214:80",
                 "http://45.77.198.1:80"
             ]
-            self.proxies.extend(default_proxies)
-            
-        # Filtrar proxies inválidos
-        self.proxies = list(set(self.proxies))  # Remover duplicatas
-        logger.debug(f"Lista de proxies atualizada. Total: {len(self.proxies)} proxies disponíveis")
-        self.last_update = time.time()
+        return found
+    
+    def _probe_proxy(self, proxy):
+        """Testa um proxy contra a URL de verificação. Retorna a latência em segundos ou None"""
+        try:
+            started_at = time.time()
+            response = requests.get(
+                self.check_url,
+                proxies={"http": proxy, "https": proxy},
+                headers={'User-Agent': BROWSER_HEADERS['User-Agent']},
+                timeout=PROXY_VALIDATION_TIMEOUT
+            )
+            if response.status_code < 400:
+                return time.time() - started_at
+        except Exception:
+            pass
+        return None
+    
+    def _validate_candidates(self, candidates):
+        """Testa os candidatos em paralelo, promovendo cada aprovado assim que responde"""
+        if not candidates:
+            return 0
+        promoted = 0
+        workers = min(PROXY_VALIDATION_WORKERS, len(candidates))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='proxy-check') as executor:
+            futures = {executor.submit(self._probe_proxy, proxy): proxy for proxy in candidates}
+            for future in as_completed(futures):
+                proxy = futures[future]
+                latency = future.result()
+                if latency is None:
+                    with self.lock:
+                        self.rejected[proxy] = time.time()
+                    continue
+                self._promote(proxy, latency)
+                promoted += 1
+        return promoted
+    
+    def _promote(self, proxy, latency):
+        """Adiciona ao pool ativo um proxy aprovado na validação"""
+        with self.lock:
+            if proxy in self.positions:
+                return
+            self.rejected.pop(proxy, None)
+            stats = self.stats.setdefault(proxy, ProxyStats(proxy))
+            stats.record_success(latency)
+            weight = stats.weight()
+            self.positions[proxy] = self.index.append(weight)
+            self.proxies.append(proxy)
+            if weight > 0:
+                self.available += 1
+        self.ready.set()
+    
+    def _rebuild_index(self, proxies):
+        """
+        Reconstrói a lista e o índice de pesos, descartando proxies mortos e duplicatas.
+        As estatísticas de proxies já conhecidos são preservadas.
+        """
+        now = time.time()
+        self.proxies = []
+        self.positions = {}
+        self.index = WeightedIndex()
+        self.cooldowns = []
+        self.available = 0
+        for proxy in proxies:
+            if proxy in self.positions:
+                continue
+            stats = self.stats.setdefault(proxy, ProxyStats(proxy))
+            if stats.is_dead:
+                continue
+            weight = stats.weight(now)
+            self.positions[proxy] = self.index.append(weight)
+            self.proxies.append(proxy)
+            if weight > 0:
+                self.available += 1
+            elif stats.cooldown_until > now:
+                heapq.heappush(self.cooldowns, (stats.cooldown_until, proxy))
+    
+    def _set_weight(self, proxy, weight):
+        position = self.positions.get(proxy)
+        if position is None:
+            return
+        previous = self.index.weights[position]
+        self.index.update(position, weight)
+        if previous > 0 and weight <= 0:
+            self.available -= 1
+        elif previous <= 0 and weight > 0:
+            self.available += 1
+    
+    def _release_cooldowns(self, now):
+        """Devolve ao sorteio os proxies cuja quarentena terminou"""
+        while self.cooldowns and self.cooldowns[0][0] <= now:
+            _, proxy = heapq.heappop(self.cooldowns)
+            stats = self.stats.get(proxy)
+            if stats and not stats.is_dead and stats.cooldown_until <= now:
+                self._set_weight(proxy, stats.weight(now))
+    
+    def refresh_in_background(self):
+        """Atualiza a lista de proxies em uma thread separada, sem bloquear a requisição atual"""
+        with self.lock:
+            if self.refresh_thread and self.refresh_thread.is_alive():
+                return
+            if self.last_update and time.time() - self.last_update < PROXY_MIN_REFRESH_INTERVAL:
+                return
+            self.refresh_thread = threading.Thread(target=self.update_proxy_list, name='proxy-refresh', daemon=True)
+            self.refresh_thread.start()
         
-    def get_random_proxy(self):
-        """Retorna um proxy aleatório da lista"""
-        # Atualizar a lista de proxies se necessário
-        if self.last_update is None or time.time() - self.last_update > self.update_interval or len(self.proxies) < 50:
-            self.update_proxy_list()
+    def get_random_proxy(self, avoid=()):
+        """
+        Retorna um proxy sorteado com peso proporcional à sua saúde
+        (taxa de sucesso / latência média). Proxies em quarentena não são sorteados.
+        Proxies em avoid só são escolhidos se o sorteio insistir neles.
+        """
+        # Na primeira utilização, aguardar (por tempo limitado) o aquecimento do pool
+        if not self.ready.is_set():
+            self.refresh_in_background()
+            self.ready.wait(PROXY_WARMUP_TIMEOUT)
+        
+        with self.lock:
+            now = time.time()
+            self._release_cooldowns(now)
             
-        # Se não houver proxies disponíveis, retorna None
-        if not self.proxies:
-            logger.warning("Não há proxies disponíveis, tentando fazer requisição direta")
-            return None
+            # Reabastecer o pool em segundo plano antes que se esgote, ou se a lista estiver velha
+            if now - (self.last_update or 0) > self.update_interval or self.available < PROXY_MIN_AVAILABLE:
+                self.refresh_in_background()
             
-        # Escolher um proxy aleatório
-        return random.choice(self.proxies)
-    
-    def remove_proxy(self, proxy):
-        """Remove um proxy inválido da lista"""
-        if proxy in self.proxies:
-            self.proxies.remove(proxy)
-            logger.debug(f"Proxy {proxy} removido da lista. Restante: {len(self.proxies)} proxies")
+            position = self.index.sample()
+            for _ in range(PROXY_AVOID_RESAMPLES if avoid else 0):
+                if position is None or self.proxies[position] not in avoid:
+                    break
+                position = self.index.sample()
+            
+            # Se não houver proxies disponíveis, retorna None
+            if position is None:
+                logger.warning("Não há proxies disponíveis, tentando fazer requisição direta")
+                return None
+            
+            return self.proxies[position]
+    
+    def report_success(self, proxy, latency):
+        """Registra uma requisição bem-sucedida e sua latência (em segundos)"""
+        if not proxy:
+            return
+        with self.lock:
+            stats = self.stats.get(proxy)
+            if stats is None:
+                return
+            stats.record_success(latency)
+            self._set_weight(proxy, stats.weight())
+    
+    def report_failure(self, proxy):
+        """
+        Registra uma falha do proxy, colocando-o em quarentena progressiva.
+        Após falhas seguidas demais o proxy deixa de ser sorteado.
+        """
+        if not proxy:
+            return
+        with self.lock:
+            stats = self.stats.get(proxy)
+            if stats is None:
+                return
+            stats.record_failure()
+            self._set_weight(proxy, 0.0)
+            if stats.is_dead:
+                self.sessions.discard_proxy(proxy)
+                logger.debug(f"Proxy {proxy} descartado após {stats.consecutive_failures} falhas seguidas. Disponíveis: {self.available}")
+            else:
+                heapq.heappush(self.cooldowns, (stats.cooldown_until, proxy))
+                logger.debug(f"Proxy {proxy} em quarentena até {datetime.datetime.fromtimestamp(stats.cooldown_until):%H:%M:%S}. Disponíveis: {self.available}")
             
-        # Se houver poucos proxies, atualiza a lista automaticamente
-        if len(self.proxies) < 20:
-            logger.warning(f"Poucos proxies disponíveis ({len(self.proxies)}), atualizando lista")
-            self.update_proxy_list()
+            # Se houver poucos proxies, atualiza a lista em segundo plano
+            if self.available < PROXY_MIN_AVAILABLE:
+                logger.warning(f"Poucos proxies disponíveis ({self.available}), atualizando lista em segundo plano")
+                self.refresh_in_background()
     
-    def get_session_with_proxy(self, use_html_session=True):
-        """Retorna uma sessão com um proxy configurado"""
-        # Escolher um proxy aleatório
-        proxy = self.get_random_proxy()
+    def wait_for_turn(self, proxy):
+        """
+        Aguarda a vez do proxy/IP antes de uma nova requisição, conforme a taxa
+        adaptativa dele e a global (ver RateController).
         
-        if use_html_session:
-            session = HTMLSession()
-        else:
-            session = requests.Session()
+        Cada chamada reserva o próximo horário livre do proxy, de modo que workers
+        concorrentes usando o mesmo IP ficam espaçados, enquanto proxies diferentes
+        seguem em paralelo.
+        """
+        delay = self.rates.reserve(proxy)
+        if delay > 0:
+            logger.debug(f"Aguardando {delay:.2f} segundos antes de usar {proxy or 'conexão direta'} novamente")
+            time.sleep(delay)
+    
+    def get_session_with_proxy(self, avoid=()):
+        """
+        Retorna uma sessão (reaproveitada do pool quando possível) com um proxy configurado.
+        A sessão deve ser devolvida com release_session após a requisição.
+        """
+        # Escolher um proxy aleatório
+        proxy = self.get_random_proxy(avoid)
+        session = self.sessions.acquire(proxy)
             
         if proxy:
-            session.proxies = {"http": proxy, "https": proxy}
             logger.debug(f"Usando proxy: {proxy}")
         else:
             logger.debug("Usando conexão direta (sem proxy)")
             
         return session, proxy
+    
+    def get_direct_session(self):
+        """Retorna uma sessão sem proxy (conexão direta) do pool"""
+        return self.sessions.acquire(None)
+    
+    def release_session(self, proxy, session, reusable=True):
+        """Devolve ao pool uma sessão obtida com get_session_with_proxy/get_direct_session"""
+        self.sessions.release(proxy, session, reusable)
 
-# Inicializar o gerenciador de proxies
+# Inicializar o gerenciador de proxies (sem acesso à rede; o pool é preenchido sob demanda)
 proxy_manager = ProxyManager()
 
-def extract_company_info(url):
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+def _load_tree(page):
+    """Constrói a árvore lxml da página (aceita str, bytes ou uma árvore já construída)"""
+    if isinstance(page, etree._Element):
+        return page
+    return lxml_html.fromstring(page)
+
+def _response_html(response):
     """
-    Extract company name, job title, and links from a LinkedIn job listing URL.
-    Uses rotating proxies to avoid IP blocking.
+    Corpo da resposta decodificado: usa o charset informado pelo servidor ou,
+    na falta dele, o <meta charset> da própria página (UTF-8 por padrão).
+    O lxml não reconhece sozinho o <meta charset> do HTML5.
+    """
+    if 'charset' in response.headers.get('Content-Type', '').lower():
+        return response.text
+    match = META_CHARSET_RE.search(response.content[:4096])
+    encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return response.content.decode(encoding, errors='replace')
+    except LookupError:
+        return response.content.decode('utf-8', errors='replace')
+
+DESCRIPTION_NOT_AVAILABLE = "Job description not available. Please check the original link."
+
+def _format_description(job_description_text):
+    """Formata a descrição em parágrafos, com quebras <br> para exibição na tabela"""
+    if not job_description_text:
+        return DESCRIPTION_NOT_AVAILABLE
     
-    Args:
-        url (str): LinkedIn job listing URL
+    # Preservar quebras de linha originais e formatar para melhor leitura
+    # Processar o texto para identificar parágrafos, listas e seções
+    
+    # 1. Normalizar quebras de linha
+    normalized_text = job_description_text.replace('\r\n', '\n').replace('\r', '\n')
+    
+    # 2. Dividir em parágrafos e itens de lista 
+    paragraphs = normalized_text.split('\n\n')
+    
+    # 3. Processar cada parágrafo/item com formatação apropriada
+    formatted_paragraphs = []
+    for p in paragraphs:
+        # Remover espaços extras dentro de cada parágrafo
+        p = ' '.join(p.split())
         
+        # Checar se parece um título (primeira letra maiúscula, sem ponto final)
+        if p.strip() and p.strip()[0].isupper() and not p.strip().endswith('.') and len(p.strip()) < 100:
+            # Adicionar duas quebras antes de títulos (exceto para o primeiro)
+            if formatted_paragraphs:
+                formatted_paragraphs.append("\n\n" + p.strip())
+            else:
+                formatted_paragraphs.append(p.strip())
+            
+        # Checar se é item de lista (começa com * - • ○)
+        elif p.strip() and p.strip()[0] in ['•', '*', '-', '○', '◦', '▪', '▫', '→', '»', '►']:
+            formatted_paragraphs.append(p.strip())
+            
+        # Parágrafo normal
+        else:
+            formatted_paragraphs.append(p.strip())
+    
+    # 4. Juntar tudo com quebras de linha apropriadas
+    job_description = '\n\n'.join(formatted_paragraphs)
+    
+    # 5. Adicionar quebras no HTML (para exibição na tabela)
+    job_description = job_description.replace('\n\n', '<br><br>').replace('\n', '<br>')
+    
+    logger.debug(f"Job description extracted and formatted successfully. Comprimento total: {len(job_description)} chars. Primeiros 50 chars: {job_description[:50]}...")
+    return job_description
+
+# Blocos de dados estruturados (schema.org) embutidos na página
+JSON_LD_XPATH = etree.XPath('//script[@type="application/ld+json"]/text()')
+
+# Campos que o JobPosting do JSON-LD fornece; com todos presentes, as varreduras heurísticas são dispensadas
+JSON_LD_FIELDS = ('company_name', 'job_title', 'job_description', 'city', 'date_posted')
+
+def _find_job_posting(data):
+    """Procura o objeto JobPosting dentro de um bloco JSON-LD (objeto, lista ou @graph)"""
+    if isinstance(data, list):
+        for item in data:
+            posting = _find_job_posting(item)
+            if posting is not None:
+                return posting
+        return None
+    if not isinstance(data, dict):
+        return None
+    types = data.get('@type')
+    if types == 'JobPosting' or (isinstance(types, list) and 'JobPosting' in types):
+        return data
+    return _find_job_posting(data.get('@graph', []))
+
+def _job_posting_location(posting):
+    """Cidade, região e país do jobLocation, ou 'Remote' para vagas remotas sem endereço"""
+    locations = posting.get('jobLocation') or []
+    if isinstance(locations, dict):
+        locations = [locations]
+    for location in locations:
+        address = location.get('address') if isinstance(location, dict) else None
+        if isinstance(address, dict):
+            parts = []
+            for key in ('addressLocality', 'addressRegion', 'addressCountry'):
+                value = address.get(key)
+                if isinstance(value, dict):  # addressCountry pode ser um objeto Country
+                    value = value.get('name')
+                if value and str(value).strip() not in parts:
+                    parts.append(str(value).strip())
+            if parts:
+                return ', '.join(parts)
+    if posting.get('jobLocationType') == 'TELECOMMUTE':
+        return 'Remote'
+    return None
+
+def _extract_json_ld(tree):
+    """
+    Extrai os campos do bloco JobPosting (JSON-LD) da página, se houver.
+    
     Returns:
-        dict: Dictionary containing original link, job title, company name, job description, city, announced_at, candidates
+        dict: campos de JSON_LD_FIELDS encontrados (pode estar vazio)
     """
-    # Removed searched_at field as requested
+    for script in JSON_LD_XPATH(tree):
+        try:
+            posting = _find_job_posting(json.loads(script))
+        except ValueError:
+            logger.debug("Bloco JSON-LD inválido ignorado")
+            continue
+        if posting is None:
+            continue
+        
+        organization = posting.get('hiringOrganization')
+        if isinstance(organization, dict):
+            organization = organization.get('name')
+        description = posting.get('description')
+        fields = {
+            'company_name': organization,
+            'job_title': posting.get('title'),
+            'job_description': html_fragment_text(description) if isinstance(description, str) else None,
+            'city': _job_posting_location(posting),
+            'date_posted': posting.get('datePosted'),
+        }
+        return {key: value.strip() for key, value in fields.items() if isinstance(value, str) and value.strip()}
+    return {}
+
+# Nos processos de parse, os traces do plano são devolvidos ao processo principal,
+# onde ficam as estatísticas de acertos que reordenam os extratores
+_pending_traces = None
+
+def _record_trace(plan, trace):
+    if _pending_traces is not None:
+        _pending_traces.append(trace)
+    else:
+        plan.record(trace)
+
+def _description_hash(job_description_text):
+    """Hash do texto da descrição (antes da formatação), para detectar mudanças entre extrações"""
+    if not job_description_text:
+        return None
+    normalized = ' '.join(job_description_text.split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+def parse_job_page(page, url='', skip_heuristic=False):
+    """
+    Extrai os dados de uma vaga a partir do HTML já baixado, sem acesso à rede.
+    A página é analisada uma única vez (árvore lxml) e os campos são extraídos
+    pelo plano declarativo de extraction_plan.json sobre essa mesma árvore.
+    O bloco JobPosting (JSON-LD) é lido primeiro; se estiver completo, os campos
+    restantes são extraídos sem as varreduras heurísticas do plano.
     
-    # Headers padrão para simular um navegador
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Connection': 'keep-alive',
-        'Referer': 'https://www.google.com/'
+    Args:
+        page (str | bytes | lxml element): HTML da página da vaga ou árvore já construída
+        url (str): URL da vaga (apenas para logs)
+        skip_heuristic (bool): não rodar as varreduras heurísticas do plano (ex.: em fragmentos
+            bem estruturados, onde é melhor ficar sem o campo do que com um texto qualquer)
+        
+    Returns:
+        dict: company_name, job_title, job_description, city, announced_at, candidates,
+        date_posted (data exata do JSON-LD, ou None) e description_hash
+    """
+    tree = _load_tree(page)
+    structured = _extract_json_ld(tree)
+    complete = all(field in structured for field in JSON_LD_FIELDS)
+    if structured:
+        logger.debug(f"JSON-LD JobPosting com {len(structured)} campos (completo: {complete})")
+    
+    plan = get_extraction_plan()
+    values, trace = plan.extract(tree, fields=[name for name in plan.fields if name not in structured],
+                                 skip_heuristic=complete or skip_heuristic)
+    _record_trace(plan, trace)
+    values.update(structured)
+    
+    description_hash = _description_hash(values.get('job_description'))
+    date_posted = values.get('date_posted')
+    if not values.get('announced_at') and date_posted:
+        values['announced_at'] = date_posted[:10]
+    
+    company_name = values.get('company_name') or 'Not found'
+    if company_name == 'Not found':
+        logger.warning(f"Company element not found for URL: {url}")
+    
+    job_title = values.get('job_title') or 'Not found'
+    if job_title == 'Not found':
+        logger.warning(f"Job title element not found for URL: {url}")
+    
+    if not values.get('job_description'):
+        logger.warning(f"Job description not found for URL: {url}")
+    job_description = _format_description(values.get('job_description'))
+    
+    # Informações adicionais: cidade, data de anúncio e candidatos
+    city = values.get('city') or 'Not found'
+    announced_at = values.get('announced_at') or 'Not found'
+    candidates = values.get('candidates') or 'Not found'
+    
+    logger.debug(f"Extracted job title: {job_title}, company name: {company_name}")
+    logger.debug(f"Additional info - city: {city}, announced_at: {announced_at}, candidates: {candidates}")
+    
+    return {
+        'company_name': company_name,
+        'job_title': job_title,
+        'job_description': job_description,
+        'city': city,
+        'announced_at': announced_at,
+        'candidates': candidates,
+        'date_posted': date_posted,
+        'description_hash': description_hash
     }
+
+def refresh_job_page(page, url, previous_hash):
+    """
+    Verificação barata de uma vaga já extraída: extrai só a descrição e, se o hash
+    for igual ao anterior, só o número de candidatos.
     
-    try:
-        # Obter uma sessão com proxy
-        logger.debug(f"Iniciando requisição com IP rotativo para: {url}")
-        
-        # Tentar até 3 proxies diferentes
-        for attempt in range(3):
-            try:
-                # Obter uma sessão HTMLSession com proxy configurado
-                session, proxy = proxy_manager.get_session_with_proxy(use_html_session=True)
-                
-                # Adicionar headers para simular um navegador
-                for key, value in headers.items():
-                    session.headers[key] = value
-                
-                # Enviar solicitação e renderizar JavaScript
-                r = session.get(url, timeout=30)
-                logger.debug(f"Página carregada com sucesso usando {'proxy: ' + proxy if proxy else 'conexão direta'}")
-                break  # Se chegou aqui, a requisição foi bem-sucedida
-                
-            except (ProxyError, ConnectTimeout, RequestException) as e:
-                logger.warning(f"Tentativa {attempt+1}/3 falhou: {str(e)}")
-                
-                # Se o erro foi relacionado ao proxy, removê-lo da lista
-                if proxy:
-                    proxy_manager.remove_proxy(proxy)
-                
-                # Se foi a última tentativa, fazer requisição direta
-                if attempt == 2:
-                    logger.debug("Todas as tentativas com proxy falharam. Tentando conexão direta.")
-                    session = HTMLSession()
-                    for key, value in headers.items():
-                        session.headers[key] = value
-                    r = session.get(url, timeout=30)
-                    logger.debug("Página carregada com HTMLSession sem proxy")
-                    
-        # Fallback para requests regular se HTMLSession falhar
-        if not r or not hasattr(r, 'html'):
-            logger.warning("HTMLSession falhou. Tentando com requests padrão.")
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            r = response
-        
-        # Usar BeautifulSoup para encontrar elementos fundamentais
-        soup = BeautifulSoup(r.text, 'html.parser')
-        
-        # Find company element using the topcard__org-name-link class which is the current structure
-        company_element = soup.select_one('a.topcard__org-name-link')
-        
-        # Find job title element
-        job_title_element = soup.select_one('h1.top-card-layout__title')
-        
-        # MÉTODO 1: HTML renderizado pela sessão - foco no elemento job-details
-        job_description_text = ""
-        try:
-            if hasattr(r, 'html'):
-                logger.debug("Extraindo descrição usando HTMLSession e elemento #job-details")
-                # Primeiro tentar usando o seletor CSS exato fornecido pelo usuário
-                job_details_elements = r.html.find('#job-details')
-                if job_details_elements:
-                    logger.debug(f"Encontrado elemento #job-details")
-                    # Extrair o texto completo do elemento
-                    job_description_text = job_details_elements[0].text
-                    logger.debug(f"HTMLSession extraiu texto do #job-details com {len(job_description_text)} caracteres")
-                else:
-                    # Se não encontrar o elemento específico, tentar um seletor alternativo
-                    logger.debug("Elemento #job-details não encontrado, tentando outros seletores")
-                    job_description_elements = r.html.find('div.description__text, div.show-more-less-html')
-                    if job_description_elements:
-                        logger.debug(f"Encontrados {len(job_description_elements)} elementos de descrição alternativos")
-                        # Extrair o texto completo do elemento
-                        job_description_text = job_description_elements[0].text
-                        logger.debug(f"HTMLSession extraiu texto alternativo com {len(job_description_text)} caracteres")
-        except Exception as e:
-            logger.warning(f"Erro ao extrair com HTMLSession: {str(e)}")
-        
-        # MÉTODO 2: Usar BeautifulSoup para extrair o elemento específico com ID job-details
-        if not job_description_text or len(job_description_text) < 100:
-            logger.debug("Usando BeautifulSoup para extrair o elemento #job-details")
-            job_details_element = soup.select_one('#job-details')
-            if job_details_element:
-                job_description_text = job_details_element.get_text(separator=' ', strip=True)
-                logger.debug(f"BeautifulSoup extraiu {len(job_description_text)} caracteres do #job-details")
-
-        # MÉTODO 3: Usar Trafilatura para extrair todo o conteúdo da página
-        if not job_description_text or len(job_description_text) < 100:
-            logger.debug("Usando Trafilatura para extrair todo o conteúdo")
-            downloaded = trafilatura.fetch_url(url)
-            full_text = trafilatura.extract(downloaded, include_comments=False, include_tables=True, 
-                                            no_fallback=False, include_links=False, include_formatting=False)
-            
-            if full_text and len(full_text) > 0:
-                logger.debug(f"Trafilatura extraiu {len(full_text)} caracteres")
-                # Buscar apenas a parte relevante da descrição do trabalho
-                # Geralmente começa após palavras-chave específicas
-                job_markers = ["About the job", "Job description", "Responsibilities", 
-                               "Qualifications", "Requirements", "About the role", 
-                               "Who You Are", "What You Will Do", "Working At"]
-                
-                start_pos = 0
-                for marker in job_markers:
-                    pos = full_text.find(marker)
-                    if pos > -1:
-                        start_pos = pos
-                        logger.debug(f"Encontrado marcador '{marker}' na posição {pos}")
-                        break
-                
-                if start_pos > 0:
-                    job_description_text = full_text[start_pos:]
-                    logger.debug(f"Texto extraído a partir do marcador: {len(job_description_text)} caracteres")
-                else:
-                    job_description_text = full_text
-                    logger.debug(f"Usando texto completo do Trafilatura")
+    Args:
+        page (str | bytes | lxml element): HTML da página da vaga ou árvore já construída
+        url (str): URL da vaga (apenas para logs)
+        previous_hash (str): hash da descrição na extração anterior
         
-        # MÉTODO 4: Usar XPath para extrações específicas
-        if not job_description_text or len(job_description_text) < 100:
-            try:
-                logger.debug("Tentando extrair a descrição usando XPath")
-                from lxml import html
-                if hasattr(r, 'content'):
-                    tree = html.fromstring(r.content)
-                elif hasattr(r, 'html') and hasattr(r.html, 'html'):
-                    tree = html.fromstring(r.html.html)
-                else:
-                    logger.warning("Não foi possível obter o conteúdo HTML para análise XPath")
-                    raise Exception("Conteúdo HTML não disponível")
-                
-                # Foco no elemento exato que contém a descrição completa do trabalho
-                job_description_elements = []
-                xpath_patterns = [
-                    # XPath exato fornecido pelo usuário - deve ser o mais preciso
-                    '/html/body/div[6]/div[3]/div[2]/div/div/main/div[2]/div[1]/div/div[4]/article/div/div[1]//text()',
-                    
-                    # Seletor CSS alternativo (convertido para XPath)
-                    '//*[@id="job-details"]//text()',
-                    
-                    # Backup: Descrição no formato mais recente (div.show-more-less-html)
-                    '//div[contains(@class, "show-more-less-html")]//text()',
-                    
-                    # Backup: Descrição do trabalho no formato mais recente do LinkedIn
-                    '//div[contains(@class, "mt4")]//p[@dir="ltr"]//text()',
-                    
-                    # Backup: Descrição do trabalho apenas de divs com classe mt4
-                    '//div[contains(@class, "mt4")]//text()',
-                    
-                    # Backup: Descrição do trabalho de parágrafos com direção ltr
-                    '//p[@dir="ltr"]//text()'
-                ]
-                
-                # Tentar extrair com cada padrão XPath
-                for xpath in xpath_patterns:
-                    logger.debug(f"XPath pattern: {xpath}")
-                    elements = tree.xpath(xpath)
-                    if elements and len(elements) > 0:
-                        logger.debug(f"Found {len(elements)} elements with pattern: {xpath}")
-                        job_description_elements = elements
-                        break
-                        
-                # Se encontrou elementos, juntar os textos
-                if job_description_elements:
-                    extracted_text = ' '.join([text.strip() for text in job_description_elements if text.strip()])
-                    if len(extracted_text) > len(job_description_text):
-                        job_description_text = extracted_text
-                        logger.debug(f"XPath extraiu texto maior: {len(job_description_text)} caracteres")
-            except Exception as e:
-                logger.warning(f"Erro ao extrair com XPath: {str(e)}")
-                
-        # Fechar a sessão
+    Returns:
+        dict: candidates e description_hash se a descrição não mudou; None se mudou
+        (nesse caso a página deve passar pelo parse_job_page completo)
+    """
+    tree = _load_tree(page)
+    plan = get_extraction_plan()
+    description = _extract_json_ld(tree).get('job_description')
+    if description is None:
+        values, trace = plan.extract(tree, fields=['job_description'])
+        _record_trace(plan, trace)
+        description = values.get('job_description')
+    
+    description_hash = _description_hash(description)
+    if description_hash is None or description_hash != previous_hash:
+        logger.debug(f"Descrição alterada em {url}")
+        return None
+    
+    values, trace = plan.extract(tree, fields=['candidates'])
+    _record_trace(plan, trace)
+    return {'candidates': values.get('candidates') or 'Not found', 'description_hash': description_hash}
+
+class RawPage:
+    """Corpo de uma página ainda sem parse (bytes + encoding), para o processo de parse"""
+    __slots__ = ('body', 'encoding')
+    
+    def __init__(self, body, encoding):
+        self.body = body
+        self.encoding = encoding
+    
+    def text(self):
+        return self.body.decode(self.encoding, errors='replace')
+
+def _parse_inline(page, url, skip_heuristic=False, previous_hash=None):
+    """
+    Verificação de mudança (se houver hash anterior) e, se preciso, parse completo.
+    
+    Returns:
+        tuple: (resultado de refresh_job_page ou None, resultado de parse_job_page ou None)
+    """
+    tree = _load_tree(page.text() if isinstance(page, RawPage) else page)
+    refreshed = refresh_job_page(tree, url, previous_hash) if previous_hash else None
+    if refreshed is not None:
+        return refreshed, None
+    return None, parse_job_page(tree, url, skip_heuristic)
+
+def _init_parse_worker(log_level, log_disabled):
+    global _pending_traces
+    _pending_traces = []
+    # Mesma configuração de log do processo principal
+    logging.getLogger().setLevel(log_level)
+    logging.disable(log_disabled)
+
+def _parse_in_worker(page, url, skip_heuristic, previous_hash, plan_state):
+    """
+    Executado no processo de parse. plan_state é o order_state() do plano do processo
+    principal: os extratores rodam na mesma ordem promovida por lá.
+    
+    Returns:
+        tuple: (refreshed, parsed, versão do plano usado, traces do plano)
+    """
+    del _pending_traces[:]
+    plan = get_extraction_plan()
+    plan.apply_order(*plan_state)
+    refreshed, parsed = _parse_inline(page, url, skip_heuristic, previous_hash)
+    return refreshed, parsed, plan.version, list(_pending_traces)
+
+_parse_pool = None
+_parse_slots = None
+_parse_pool_lock = threading.Lock()
+
+def _get_parse_pool():
+    """Pool de processos de parse (criado na primeira utilização) e o semáforo da fila limitada"""
+    global _parse_pool, _parse_slots
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # forkserver/spawn: não herdar locks das threads de download no fork
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=context,
+                                              initializer=_init_parse_worker,
+                                              initargs=(logging.getLogger().level, logging.root.manager.disable))
+            _parse_slots = threading.BoundedSemaphore(PARSE_QUEUE_SIZE)
+            logger.info(f"Pool de parse iniciado: {PARSE_WORKERS} processos, fila de {PARSE_QUEUE_SIZE} páginas")
+        return _parse_pool, _parse_slots
+
+def _then(future, callback):
+    """
+    Future com o resultado de callback(future) quando future terminar, sem bloquear
+    quem encadeia (callback recebe o future concluído e trata os erros dele).
+    """
+    chained = Future()
+    def run(source):
         try:
-            session.close()
-        except Exception:
-            pass
-        if not company_element:
-            logger.warning(f"Company element not found for URL: {url}")
-            company_name = 'Not found'
+            chained.set_result(callback(source))
+        except BaseException as e:
+            chained.set_exception(e)
+    future.add_done_callback(run)
+    return chained
+
+def _record_worker_traces(plan_version, traces):
+    """Contabiliza no plano atual os traces de um processo de parse, se forem da mesma versão do plano"""
+    plan = get_extraction_plan()
+    if plan_version != plan.version:
+        # Plano recarregado (ou versões diferentes entre os processos): as posições
+        # dos extratores nos traces podem não existir no plano atual
+        logger.debug(f"{len(traces)} traces do plano {plan_version} descartados (plano atual: {plan.version})")
+        return
+    for trace in traces:
+        plan.record(trace)
+
+def _uses_parse_pool(page):
+    return isinstance(page, RawPage) and PARSE_WORKERS > 0
+
+def _submit_parse(page, url, skip_heuristic=False, previous_hash=None):
+    """
+    Envia a página (RawPage) ao pool de processos de parse.
+    
+    Returns:
+        Future: resolve para (refreshed, parsed), como _parse_inline
+    """
+    pool, slots = _get_parse_pool()
+    # Fila cheia: a thread de download espera uma vaga antes de entregar mais uma página
+    slots.acquire()
+    try:
+        future = pool.submit(_parse_in_worker, page, url, skip_heuristic, previous_hash,
+                             get_extraction_plan().order_state())
+    except BaseException:
+        slots.release()
+        raise
+    
+    def done(source):
+        slots.release()
+        refreshed, parsed, plan_version, traces = source.result()
+        _record_worker_traces(plan_version, traces)
+        return refreshed, parsed
+    return _then(future, done)
+
+def _parse_page(page, url, skip_heuristic=False, previous_hash=None):
+    """
+    Parse da página baixada: no pool de processos, se a página chegou sem parse
+    (RawPage), ou na própria thread. Espera o resultado; para não ocupar a thread
+    de download durante o parse, ver _submit_parse. Ver _parse_inline.
+    """
+    if not _uses_parse_pool(page):
+        return _parse_inline(page, url, skip_heuristic, previous_hash)
+    return _submit_parse(page, url, skip_heuristic, previous_hash).result()
+
+def _read_body(url, response, reader):
+    """
+    Lê o corpo da resposta: inteiro (reader=None) ou pelo reader, que consome o
+    stream e pode parar antes do fim. Registra os bytes lidos frente ao Content-Length.
+    """
+    payload = None
+    stopped_early = False
+    try:
+        if reader is None:
+            _check_body(response, response.content[:CLASSIFY_SCAN_LIMIT],
+                        complete=len(response.content) <= CLASSIFY_SCAN_LIMIT)
         else:
-            # Extract company name only (company_link removed as requested)
-            company_name = company_element.get_text(strip=True)
+            payload, stopped_early = reader(response)
+    finally:
+        if reader is not None:
+            response.close()
+    
+    content_length = response.headers.get('Content-Length')
+    content_length = int(content_length) if content_length and content_length.isdigit() else None
+    tell = getattr(response.raw, 'tell', None)
+    bytes_read = tell() if tell else len(response.content)
+    scrape_stats.record_transfer(url, bytes_read, content_length, stopped_early)
+    return payload
+
+class BlockedPage(RequestException):
+    """Página de bloqueio (authwall, login, captcha, limite de requisições): tentar de novo por outro proxy"""
+
+class ExpiredPosting(Exception):
+    """Vaga encerrada ou removida: não há o que extrair nem por que tentar de novo"""
+
+def _check_response(response):
+    """Classifica a resposta pelo status e pelo URL final, antes de ler o corpo"""
+    if _is_throttled(response):
+        raise BlockedPage(f"HTTP {response.status_code} em {response.url}", response=response)
+    if response.status_code in EXPIRED_STATUS_CODES:
+        raise ExpiredPosting(f"HTTP {response.status_code}")
+
+def _check_body(response, data, offset=0, complete=False):
+    """
+    Classifica um trecho do corpo por marcadores de texto, sem parse.
+    
+    Args:
+        response (requests.Response): resposta (só respostas 200 são classificadas)
+        data (bytes): trecho do corpo
+        offset (int): posição do trecho no corpo
+        complete (bool): data termina o corpo (habilita a assinatura de tamanho)
+    """
+    if response.status_code != 200:
+        return
+    lowered = data.lower()
+    if offset < CLASSIFY_HEAD_SIZE:
+        title = TITLE_RE.search(lowered)
+        if title and any(marker in title.group(1) for marker in BLOCKED_TITLE_MARKERS):
+            raise BlockedPage(f"página de login/verificação em {response.url}", response=response)
+    if any(marker in lowered for marker in BLOCKED_BODY_MARKERS):
+        raise BlockedPage(f"captcha em {response.url}", response=response)
+    if any(marker in lowered for marker in EXPIRED_BODY_MARKERS):
+        raise ExpiredPosting("vaga não aceita mais candidaturas")
+    if complete and offset + len(data) < BLOCKED_MAX_BODY_SIZE and not any(marker in lowered for marker in JOB_PAGE_MARKERS):
+        raise BlockedPage(f"corpo de {offset + len(data)} bytes sem dados de vaga em {response.url}", response=response)
+
+class HedgeCancelled(Exception):
+    """Cópia de uma requisição hedged descartada porque a outra já respondeu"""
+
+class RetryLater(Exception):
+    """Falha de download de uma URL que ainda tem tentativas: deve voltar para a fila de novas tentativas"""
+    def __init__(self, url, attempt, cause):
+        super().__init__(f"{url} (tentativa {attempt+1}/{FETCH_MAX_ATTEMPTS}): {cause}")
+        self.url = url
+        self.attempt = attempt
+        self.cause = cause
+
+def _retry_delay(attempt):
+    """Espera antes da próxima tentativa: exponencial com jitter completo"""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
+
+_hedge_executor = None
+_hedge_pool_size = 0
+_hedge_executor_lock = threading.Lock()
+
+def _size_hedge_pool(max_workers):
+    """Dimensiona o pool das requisições duplicáveis conforme os workers de download"""
+    global _hedge_executor, _hedge_pool_size
+    size = max(1, max_workers) * HEDGE_THREADS_PER_WORKER
+    with _hedge_executor_lock:
+        if size > _hedge_pool_size:
+            if _hedge_executor is not None:
+                _hedge_executor.shutdown(wait=False)
+                _hedge_executor = None
+            _hedge_pool_size = size
+
+def _get_hedge_executor():
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            size = _hedge_pool_size or DEFAULT_MAX_WORKERS * HEDGE_THREADS_PER_WORKER
+            _hedge_executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='linkedin-hedge')
+        return _hedge_executor
+
+def _discard_response(future):
+    """Fecha a resposta de uma cópia perdedora que terminou depois da vencedora"""
+    if not future.cancelled() and future.exception() is None:
+        response, _ = future.result()
+        response.close()
+
+def _fetch_page(url, reader=None, extra_headers=None, attempt=0):
+    """
+    Faz uma tentativa de download da URL. As tentativas anteriores à última usam um
+    proxy (evitando os que já falharam nesta URL); a última usa conexão direta.
+    Falhas não são repetidas aqui: process_linkedin_urls devolve a URL para a fila
+    de novas tentativas, com espera exponencial, liberando o worker.
+    
+    Com SCRAPER_HEDGED_REQUESTS=1, uma tentativa por proxy que passa do p90 das
+    latências observadas ganha uma cópia por outro proxy (dentro do limite de carga
+    extra); vale a primeira resposta bem-sucedida e a outra é descartada.
+    
+    Args:
+        url (str): URL a baixar
+        reader (function, optional): consome o corpo em streaming, com assinatura
+            reader(response) -> (resultado, parou_antes_do_fim); sem reader o corpo é lido inteiro
+        extra_headers (dict, optional): cabeçalhos adicionais (ex.: If-None-Match)
+        attempt (int): número da tentativa (0 = primeira)
+    
+    Returns:
+        tuple: (requests.Response, resultado do reader ou None)
         
-        # Extract job title
-        job_title = 'Not found'
-        if job_title_element:
-            job_title = job_title_element.get_text(strip=True)
+    Raises:
+        requests.RequestException: erro de conexão/proxy ou resposta com erro HTTP
+    """
+    if not HEDGED_REQUESTS or attempt >= FETCH_MAX_ATTEMPTS - 1:
+        return _fetch_once(url, reader, extra_headers, attempt)
+    
+    delay = latency_tracker.hedge_delay()
+    if delay is None:
+        return _fetch_once(url, reader, extra_headers, attempt)
+    
+    executor = _get_hedge_executor()
+    cancelled = threading.Event()
+    # O proxy da original é escolhido antes do envio, para a cópia poder evitá-lo
+    primary_session, primary_proxy = _acquire_session(url)
+    primary = executor.submit(_fetch_once, url, reader, extra_headers, attempt, (),
+                              cancelled, (primary_session, primary_proxy))
+    done, _ = wait([primary], timeout=delay)
+    if done or not latency_tracker.try_acquire_hedge():
+        return primary.result()
+    
+    logger.debug(f"{url} sem resposta após {delay:.2f}s (p90); enviando cópia por outro proxy")
+    scrape_stats.incr('hedges_sent')
+    hedge = executor.submit(_fetch_once, url, reader, extra_headers, attempt, (primary_proxy,), cancelled)
+    
+    # Vale a primeira resposta bem-sucedida; se as duas falharem, o erro da original
+    pending = {primary, hedge}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                cancelled.set()
+                if future is hedge:
+                    scrape_stats.incr('hedges_won')
+                # A perdedora para antes da rede se ainda não começou; se responder, a resposta é fechada
+                for loser in (primary, hedge):
+                    if loser is not future:
+                        if loser.cancel() and loser is primary:
+                            # Não chegou a rodar: a sessão reservada para ela volta ao pool
+                            proxy_manager.release_session(primary_proxy, primary_session)
+                        loser.add_done_callback(_discard_response)
+                return future.result()
+    return primary.result()
+
+def _acquire_session(url, avoid=()):
+    """Sessão (reaproveitada do pool) com um proxy que ainda não falhou na URL nem está em avoid"""
+    return proxy_manager.get_session_with_proxy(avoid=scrape_stats.proxies_tried(url) | set(avoid))
+
+def _fetch_once(url, reader=None, extra_headers=None, attempt=0, avoid=(), cancelled=None, session_proxy=None):
+    """
+    Uma requisição de _fetch_page. avoid são proxies a evitar além dos que já falharam
+    na URL; session_proxy é uma (sessão, proxy) já reservada com _acquire_session; com
+    cancelled sinalizado a resposta que chegar depois é descartada (HedgeCancelled).
+    """
+    stream = reader is not None
+    payload = None
+    if cancelled is not None and cancelled.is_set():
+        # A outra cópia da requisição hedged já respondeu: não gastar a vez do proxy
+        if session_proxy is not None:
+            proxy_manager.release_session(session_proxy[1], session_proxy[0])
+        raise HedgeCancelled(url)
+    
+    if session_proxy is not None:
+        session, proxy = session_proxy
+    elif attempt < FETCH_MAX_ATTEMPTS - 1:
+        session, proxy = _acquire_session(url, avoid)
+    else:
+        logger.debug(f"Última tentativa para {url}: usando conexão direta")
+        session, proxy = proxy_manager.get_direct_session(), None
+    
+    # Respeitar o intervalo de cortesia deste proxy/IP
+    proxy_manager.wait_for_turn(proxy)
+    if cancelled is not None and cancelled.is_set():
+        proxy_manager.release_session(proxy, session)
+        raise HedgeCancelled(url)
+    
+    # Enviar solicitação (a leitura do corpo conta no tempo e nas falhas do proxy)
+    started_at = time.time()
+    r = None
+    try:
+        r = session.get(url, timeout=30, stream=stream, headers=extra_headers)
+        if cancelled is not None and cancelled.is_set():
+            # A outra cópia da requisição hedged já respondeu
+            r.close()
+            proxy_manager.release_session(proxy, session)
+            raise HedgeCancelled(url)
+        _check_response(r)
+        if r:
+            payload = _read_body(url, r, reader)
         else:
-            logger.warning(f"Job title element not found for URL: {url}")
-            
-        # Extract job description
-        job_description = 'Not found'
-        if job_description_text:
-            # Preservar quebras de linha originais e formatar para melhor leitura
-            # Processar o texto para identificar parágrafos, listas e seções
-            
-            # 1. Normalizar quebras de linha
-            normalized_text = job_description_text.replace('\r\n', '\n').replace('\r', '\n')
-            
-            # 2. Dividir em parágrafos e itens de lista 
-            paragraphs = normalized_text.split('\n\n')
-            
-            # 3. Processar cada parágrafo/item com formatação apropriada
-            formatted_paragraphs = []
-            for p in paragraphs:
-                # Remover espaços extras dentro de cada parágrafo
-                p = ' '.join(p.split())
-                
-                # Checar se parece um título (primeira letra maiúscula, sem ponto final)
-                if p.strip() and p.strip()[0].isupper() and not p.strip().endswith('.') and len(p.strip()) < 100:
-                    # Adicionar duas quebras antes de títulos (exceto para o primeiro)
-                    if formatted_paragraphs:
-                        formatted_paragraphs.append("\n\n" + p.strip())
-                    else:
-                        formatted_paragraphs.append(p.strip())
-                    
-                # Checar se é item de lista (começa com * - • ○)
-                elif p.strip() and p.strip()[0] in ['•', '*', '-', '○', '◦', '▪', '▫', '→', '»', '►']:
-                    formatted_paragraphs.append(p.strip())
-                    
-                # Parágrafo normal
-                else:
-                    formatted_paragraphs.append(p.strip())
-            
-            # 4. Juntar tudo com quebras de linha apropriadas
-            job_description = '\n\n'.join(formatted_paragraphs)
-            
-            # 5. Adicionar quebras no HTML (para exibição na tabela)
-            job_description = job_description.replace('\n\n', '<br><br>').replace('\n', '<br>')
-            
-            logger.debug(f"Job description extracted and formatted successfully. Comprimento total: {len(job_description)} chars. Primeiros 50 chars: {job_description[:50]}...")
+            r.close()
+    except ExpiredPosting as e:
+        # O proxy funcionou: a vaga é que não existe mais
+        r.close()
+        elapsed = time.time() - started_at
+        proxy_manager.report_success(proxy, elapsed)
+        proxy_manager.release_session(proxy, session)
+        proxy_manager.rates.record(proxy, throttled=False)
+        scrape_stats.record_attempt(url, attempt, proxy, f"encerrada: {str(e)}", elapsed)
+        raise
+    except BlockedPage as e:
+        # Bloqueio: o IP entra em quarentena, a taxa cai e a URL vai para a fila de novas tentativas
+        logger.warning(f"Tentativa {attempt+1}/{FETCH_MAX_ATTEMPTS} para {url} bloqueada: {str(e)}")
+        r.close()
+        proxy_manager.release_session(proxy, session, reusable=False)
+        proxy_manager.report_failure(proxy)
+        proxy_manager.rates.record(proxy, throttled=True)
+        scrape_stats.incr('blocked_pages')
+        scrape_stats.record_attempt(url, attempt, proxy, f"bloqueio: {str(e)}", time.time() - started_at)
+        raise
+    except RequestException as e:
+        logger.warning(f"Tentativa {attempt+1}/{FETCH_MAX_ATTEMPTS} para {url} falhou: {str(e)}")
+        # Sessões com erro de conexão não voltam para o pool, e o proxy entra em quarentena
+        proxy_manager.release_session(proxy, session, reusable=False)
+        proxy_manager.report_failure(proxy)
+        scrape_stats.record_attempt(url, attempt, proxy, f"{type(e).__name__}: {str(e)[:200]}",
+                                    time.time() - started_at)
+        raise
+    
+    elapsed = time.time() - started_at
+    scrape_stats.record_attempt(url, attempt, proxy, r.status_code, elapsed)
+    
+    if not r:
+        # Resposta com erro HTTP (403, 407, 5xx...): o proxy entra em quarentena, a sessão
+        # é descartada e a taxa não sobe; a URL vai para a fila de novas tentativas
+        logger.warning(f"Tentativa {attempt+1}/{FETCH_MAX_ATTEMPTS} para {url}: HTTP {r.status_code}")
+        proxy_manager.report_failure(proxy)
+        proxy_manager.release_session(proxy, session, reusable=False)
+        r.raise_for_status()
+    
+    # Resposta limpa (2xx/304): a taxa de requisições deste proxy e a global podem subir
+    proxy_manager.report_success(proxy, elapsed)
+    proxy_manager.release_session(proxy, session)
+    proxy_manager.rates.record(proxy, throttled=False)
+    latency_tracker.record(elapsed)
+    logger.debug(f"Página carregada com sucesso usando {'proxy: ' + proxy if proxy else 'conexão direta'}")
+    
+    scrape_stats.incr('pages_fetched')
+    return r, payload
+
+def _response_encoding(response, head):
+    """Charset informado pelo servidor ou, na falta dele, o <meta charset> do início do corpo"""
+    if 'charset' in response.headers.get('Content-Type', '').lower() and response.encoding:
+        return response.encoding
+    match = META_CHARSET_RE.search(head[:4096])
+    encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = 'utf-8'
+    return encoding
+
+def _stream_job_tree(response, stop_early=True):
+    """
+    Lê o corpo em blocos alimentando um parser incremental e para de ler o socket
+    assim que o top card e o contêiner da descrição tiverem sido fechados (com
+    stop_early; sem ele, o corpo é lido até o fim, como para o arquivo de páginas).
+    
+    Returns:
+        tuple: ((árvore lxml, bytes lidos, encoding), parou_antes_do_fim)
+    """
+    parser = None
+    encoding = 'utf-8'
+    chunks = []
+    offset = 0
+    top_card_closed = description_closed = False
+    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+        if not chunk:
+            continue
+        # Bloqueio ou vaga encerrada: parar antes de montar a árvore (o trecho anterior
+        # entra na busca para não perder marcadores divididos entre dois blocos)
+        tail = chunks[-1][-64:] if chunks else b''
+        _check_body(response, tail + chunk, max(0, offset - len(tail)))
+        offset += len(chunk)
+        if parser is None:
+            encoding = _response_encoding(response, chunk)
+            parser = etree.HTMLPullParser(events=('end',), tag=('section', 'div'), encoding=encoding)
+        chunks.append(chunk)
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            classes = (element.get('class') or '').split()
+            if 'top-card-layout' in classes:
+                top_card_closed = True
+            elif 'description__text' in classes or element.get('id') == 'job-details':
+                description_closed = True
+        if stop_early and top_card_closed and description_closed:
+            logger.debug(f"Top card e descrição completos; leitura interrompida em {response.url}")
+            return (parser.close(), b''.join(chunks), encoding), True
+    body = b''.join(chunks)
+    if offset < BLOCKED_MAX_BODY_SIZE:
+        _check_body(response, body, complete=True)
+    if parser is None:  # Corpo vazio
+        return (lxml_html.fromstring('<html></html>'), b'', encoding), False
+    return (parser.close(), body, encoding), False
+
+DESCRIPTION_START_RE = re.compile(rb'<div[^>]+(?:class="[^"]*\bdescription__text\b|id="job-details")')
+DIV_TAG_RE = re.compile(rb'<(/?)div[\s>]', re.IGNORECASE)
+
+def _stream_job_body(response, stop_early=True):
+    """
+    Como _stream_job_tree, mas sem montar a árvore (o parse fica com o pool de
+    processos): a leitura para quando o contêiner da descrição é fechado, o que
+    é detectado acompanhando a profundidade das tags <div> a partir do início dele.
+    
+    Returns:
+        tuple: (RawPage com os bytes lidos, parou_antes_do_fim)
+    """
+    encoding = None
+    body = bytearray()
+    description_start = None
+    scan_from = depth = 0
+    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+        if not chunk:
+            continue
+        tail = bytes(body[-64:])
+        _check_body(response, tail + chunk, max(0, len(body) - len(tail)))
+        if encoding is None:
+            encoding = _response_encoding(response, chunk)
+        body += chunk
+        if not stop_early:
+            continue
+        if description_start is None:
+            match = DESCRIPTION_START_RE.search(body, max(0, len(body) - len(chunk) - 256))
+            if match is None:
+                continue
+            description_start = scan_from = match.start()
+        for match in DIV_TAG_RE.finditer(body, scan_from):
+            depth += -1 if match.group(1) else 1
+            scan_from = match.end()
+            if depth == 0:
+                logger.debug(f"Descrição completa; leitura interrompida em {response.url}")
+                return RawPage(bytes(body), encoding), True
+        # Uma tag cortada no fim do bloco é lida de novo com o próximo
+        scan_from = max(scan_from, len(body) - 5)
+    if len(body) < BLOCKED_MAX_BODY_SIZE:
+        _check_body(response, bytes(body), complete=True)
+    return RawPage(bytes(body), encoding or 'utf-8'), False
+
+def _download_job_page(url, extra_headers=None, attempt=0):
+    """
+    Baixa a página da vaga (em streaming, se ativo).
+    
+    Returns:
+        tuple: (resposta, árvore lxml ou HTML para o parse_job_page (RawPage, com o
+                pool de processos de parse), função que retorna o HTML lido como texto)
+    """
+    # Páginas arquivadas precisam do HTML inteiro: sem interromper a leitura após a descrição
+    stop_early = get_page_archive() is None
+    if PARSE_WORKERS:
+        if STREAMING_FETCH:
+            r, page = _fetch_page(url, partial(_stream_job_body, stop_early=stop_early), extra_headers, attempt)
         else:
-            # Método de último recurso - capturar especificamente os títulos e itens da página
-            logger.warning(f"Job description not found for URL: {url}")
-            job_description = "Job description not available. Please check the original link."
-            
-        # Extrair informações adicionais: cidade, data de anúncio e candidatos
-        city = 'Not found'
-        announced_at = 'Not found'
-        candidates = 'Not found'
+            r, _ = _fetch_page(url, extra_headers=extra_headers, attempt=attempt)
+            page = RawPage(r.content, _response_encoding(r, r.content[:4096]))
+        return r, page, page.text
+    if STREAMING_FETCH:
+        r, (tree, body, encoding) = _fetch_page(url, partial(_stream_job_tree, stop_early=stop_early),
+                                                extra_headers, attempt)
+        return r, tree, lambda: body.decode(encoding, errors='replace')
+    r, _ = _fetch_page(url, extra_headers=extra_headers, attempt=attempt)
+    page = _response_html(r)
+    return r, page, lambda: page
+
+def _archive_page(job_id, kind, html_text):
+    """Guarda o HTML bruto no arquivo de páginas, para reextrações futuras sem rede"""
+    archive = get_page_archive()
+    if archive is None or not job_id:
+        return
+    try:
+        archive.append(job_id, html_text(), kind)
+    except OSError as e:
+        logger.warning(f"Não foi possível arquivar a página da vaga {job_id}: {str(e)}")
+
+def extract_job_id(url):
+    """
+    Extrai o ID numérico da vaga a partir do URL normalizado.
+    
+    Returns:
+        str: ID da vaga, ou None se o URL não for de uma vaga
+    """
+    match = re.search(r'/jobs/view/(\d+)', normalize_linkedin_url(url) or '')
+    return match.group(1) if match else None
+
+def _missing_fields(parsed, fields):
+    """Campos que a extração não encontrou"""
+    return [field for field in fields
+            if parsed.get(field) in (None, 'Not found', DESCRIPTION_NOT_AVAILABLE)]
+
+def _extract_from_guest_endpoint(url, attempt=0):
+    """
+    Extrai a vaga do fragmento do endpoint de convidado (jobs-guest), bem menor que a página.
+    
+    Returns:
+        dict: campos extraídos, ou None se for preciso baixar a página completa
+    """
+    job_id = extract_job_id(url)
+    if not job_id:
+        logger.debug(f"ID da vaga não encontrado em {url}; usando a página completa")
+        return None
+    
+    guest_url = LINKEDIN_GUEST_JOB_URL.format(job_id=job_id)
+    scrape_stats.incr('guest_fetches')
+    try:
+        _, page, html_text = _download_job_page(guest_url, attempt=attempt)
+    except (BlockedPage, ExpiredPosting):
+        # Bloqueio ou vaga encerrada: tratamento do classificador (fila de novas tentativas
+        # ou resultado de vaga encerrada), sem baixar a página completa pelo mesmo caminho
+        raise
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Endpoint de convidado falhou para {url}: {str(e)}. Usando a página completa.")
+        scrape_stats.incr('guest_fallbacks')
+        return None
+    
+    _archive_page(job_id, KIND_GUEST, html_text)
+    _, parsed = _parse_page(page, guest_url, skip_heuristic=True)
+    missing = _missing_fields(parsed, GUEST_REQUIRED_FIELDS)
+    if missing:
+        logger.info(f"Fragmento da vaga {job_id} sem {', '.join(missing)}; usando a página completa")
+        scrape_stats.incr('guest_fallbacks')
+        return None
+    return parsed
+
+def _conditional_headers(previous):
+    """Cabeçalhos de requisição condicional a partir dos validadores da extração anterior"""
+    headers = {}
+    if previous:
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+    return headers
+
+def _page_validators(response, previous):
+    """
+    Validadores da página para a próxima atualização. Sem resposta da página (modo guest:
+    os validadores do fragmento não valem para a página) ou sem ETag/Last-Modified na
+    resposta, mantém os da extração anterior em vez de apagá-los.
+    """
+    previous = previous or {}
+    headers = response.headers if response is not None else {}
+    return {
+        'etag': headers.get('ETag') or previous.get('etag'),
+        'last_modified': headers.get('Last-Modified') or previous.get('last_modified'),
+    }
+
+EXPIRED_POSTING_TEXT = "Job posting closed or no longer available."
+
+def _expired_result(url, previous=None):
+    """Resultado de uma vaga encerrada: sem parse, com os dados da extração anterior se houver"""
+    scrape_stats.incr('expired_postings')
+    result = {
+        'link': url,
+        'company_name': 'Not found',
+        'job_title': 'Not found',
+        'city': 'Not found',
+        'announced_at': 'Not found',
+        'candidates': 'Not found'
+    }
+    if previous and previous.get('row'):
+        result.update({key: previous['row'][key] for key in ('company_name', 'job_title', 'city', 'announced_at', 'announced_calc')
+                       if previous['row'].get(key)})
+    result['job_description'] = EXPIRED_POSTING_TEXT
+    result['expired'] = True
+    return result
+
+def _unchanged_result(url, previous, candidates=None):
+    """Resultado de uma vaga sem mudanças: a linha anterior, só com os candidatos atualizados"""
+    scrape_stats.incr('unchanged_jobs')
+    result = dict(previous.get('row') or {})
+    result['link'] = url
+    if candidates and candidates != 'Not found':
+        result['candidates'] = candidates
+    result['description_hash'] = previous.get('description_hash')
+    result['etag'] = previous.get('etag')
+    result['last_modified'] = previous.get('last_modified')
+    result['unchanged'] = True
+    return result
+
+def _error_result(url, error):
+    """Resultado de uma vaga que não pôde ser extraída"""
+    return {
+        'link': url,
+        'company_name': f'Error: {str(error)}',
+        'job_title': 'Not found',
+        'job_description': 'Not found',
+        'city': 'Not found',
+        'announced_at': 'Not found',
+        'candidates': 'Not found'
+    }
+
+def _page_result(url, previous, validators, refreshed, parsed):
+    """Resultado da página completa, a partir do parse (ou da verificação de mudança)"""
+    if refreshed is not None:
+        result = _unchanged_result(url, previous, refreshed['candidates'])
+        result.update(validators)
+        return result
+    result = {'link': url}
+    result.update(parsed)
+    result.update(validators)
+    return result
+
+def extract_company_info(url, fetch_mode=None, previous=None, attempt=None, deferred=False):
+    """
+    Extract company name, job title, and links from a LinkedIn job listing URL.
+    Uses rotating proxies to avoid IP blocking.
+    
+    Args:
+        url (str): LinkedIn job listing URL
+        fetch_mode (str, optional): 'page' (full public page) or 'guest'
+            (guest job-posting fragment, falling back to the full page when
+            fields are missing); default: SCRAPER_FETCH_MODE env var or 'page'
+        previous (dict, optional): refresh mode. State from the last scrape of this job
+            (etag, last_modified, description_hash and the previous result 'row').
+            Conditional headers are sent and, when the page is unchanged (304 or same
+            description hash), only candidates is updated on the previous row.
+        attempt (int, optional): attempt number when called from the retry queue of
+            process_linkedin_urls. A failed download then raises RetryLater while
+            attempts remain; without it (or on the last attempt) the error row is returned.
+        deferred (bool): when the full page goes to the parse process pool, return a
+            Future for the result instead of waiting, so the calling thread can start
+            the next download while the page is parsed.
         
-        # Encontrar o elemento que contém informações sobre cidade, data de anúncio e candidatos
-        try:
-            # MÉTODO 1: Container específico
-            tertiary_container = soup.select_one(".job-details-jobs-unified-top-card__primary-description-container") or \
-                                 soup.select_one(".job-details-jobs-unified-top-card__tertiary-description-container")
-            
-            if tertiary_container:
-                logger.debug("Container de informações adicionais encontrado (método 1)")
-                
-                # Extrair todos os spans com informações de texto
-                spans = tertiary_container.select('.tvm__text')
-                
-                # Processar cada span para identificar o tipo de informação
-                for span in spans:
-                    span_text = span.get_text(strip=True)
-                    
-                    # Verificar se o span tem conteúdo
-                    if not span_text or span_text in ['.', '·', '']:
-                        continue
-                    
-                    # Identificar o tipo de informação com base no conteúdo
-                    if 'candidates' in span_text.lower() or 'applicants' in span_text.lower():
-                        candidates = span_text
-                        logger.debug(f"Candidatos identificados: {candidates}")
-                    elif any(month in span_text.lower() for month in ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']):
-                        announced_at = span_text
-                        logger.debug(f"Data de anúncio identificada: {announced_at}")
-                    elif not any(keyword in span_text.lower() for keyword in ['ago', 'hour', 'day', 'week', 'month']):
-                        city = span_text
-                        logger.debug(f"Cidade identificada: {city}")
-            
-            # MÉTODO 2: Busca por classes específicas ou padrões comuns
-            if city == 'Not found' or announced_at == 'Not found' or candidates == 'Not found':
-                logger.debug("Tentando método 2 para encontrar informações adicionais")
-                
-                # Tentar encontrar a localização
-                location_elements = soup.select('.job-details-jobs-unified-top-card__bullet, .topcard__flavor--bullet, .job-details-jobs-unified-top-card__workplace-type')
-                for element in location_elements:
-                    text = element.get_text(strip=True)
-                    if text and text not in ['.', '·', ''] and not any(keyword in text.lower() for keyword in ['ago', 'hour', 'day', 'week', 'month', 'remote', 'hybrid']):
-                        city = text
-                        logger.debug(f"Cidade identificada (método 2): {city}")
-                        break
-                
-                # Tentar encontrar a data de anúncio
-                date_elements = soup.select('.job-details-jobs-unified-top-card__subtitle-secondary-grouping .tvm__text, .posted-time-ago__text, .job-details-jobs-unified-top-card__posted-date')
-                for element in date_elements:
-                    text = element.get_text(strip=True)
-                    if text and ('ago' in text.lower() or any(month in text.lower() for month in ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'])):
-                        announced_at = text
-                        logger.debug(f"Data de anúncio identificada (método 2): {announced_at}")
-                        break
-                
-                # Tentar encontrar o número de candidatos
-                candidate_elements = soup.select('.num-applicants__caption, .jobs-unified-top-card__applicant-count, .job-details-jobs-unified-top-card__applicant-count')
-                for element in candidate_elements:
-                    text = element.get_text(strip=True)
-                    if text and ('applicant' in text.lower() or 'candidate' in text.lower() or 'applied' in text.lower()):
-                        candidates = text
-                        logger.debug(f"Candidatos identificados (método 2): {candidates}")
-                        break
-            
-            # MÉTODO 3: Análise de texto para encontrar padrões em todo o documento
-            if city == 'Not found' or announced_at == 'Not found' or candidates == 'Not found':
-                logger.debug("Tentando método 3 para encontrar informações adicionais")
-                
-                # Obter todos os textos pequenos da página que poderiam conter informações relevantes
-                small_texts = []
-                for element in soup.select('span, div.small, p.small, .job-details-jobs-unified-top-card__subtitle-secondary-grouping'):
-                    text = element.get_text(strip=True)
-                    if len(text) < 100 and len(text) > 2:  # filtrar textos muito curtos ou muito longos
-                        small_texts.append(text)
-                
-                # Procurar padrões para localização
-                if city == 'Not found':
-                    for text in small_texts:
-                        # Verifica se o texto contém algum indicador de cidade/localização
-                        if not any(keyword in text.lower() for keyword in ['ago', 'hour', 'day', 'week', 'month', 'remote', 'hybrid', 'applicant', 'candidate']):
-                            # Verifica se o texto parece ser uma localização (não contém outros indicadores)
-                            if any(char in text for char in [',', '-']) or text.split():
-                                city = text
-                                logger.debug(f"Cidade identificada (método 3): {city}")
-                                break
-                
-                # Procurar padrões para data de anúncio
-                if announced_at == 'Not found':
-                    for text in small_texts:
-                        if 'ago' in text.lower() or 'posted' in text.lower() or any(month in text.lower() for month in ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']):
-                            announced_at = text
-                            logger.debug(f"Data de anúncio identificada (método 3): {announced_at}")
-                            break
-                
-                # Procurar padrões para número de candidatos
-                if candidates == 'Not found':
-                    for text in small_texts:
-                        if 'applicant' in text.lower() or 'candidate' in text.lower() or 'applied' in text.lower():
-                            candidates = text
-                            logger.debug(f"Candidatos identificados (método 3): {candidates}")
-                            break
-                
-        except Exception as e:
-            logger.warning(f"Erro ao extrair informações adicionais: {str(e)}")
+    Returns:
+        dict: Dictionary containing original link, job title, company name, job description, city, announced_at, candidates
+        plus refresh metadata (description_hash, etag, last_modified, unchanged)
+        (a Future resolving to it when deferred and the page went to the parse pool)
+    """
+    # Removed searched_at field as requested
+    fetch_mode = fetch_mode or FETCH_MODE
+    previous_hash = previous.get('description_hash') if previous else None
+    
+    try:
+        if fetch_mode == 'guest':
+            parsed = _extract_from_guest_endpoint(url, attempt or 0)
+            if parsed is not None:
+                if previous_hash and parsed.get('description_hash') == previous_hash:
+                    return _unchanged_result(url, previous, parsed.get('candidates'))
+                result = {'link': url}
+                result.update(parsed)
+                result.update(_page_validators(None, previous))
+                return result
         
-        logger.debug(f"Extracted job title: {job_title}, company name: {company_name}")
-        logger.debug(f"Additional info - city: {city}, announced_at: {announced_at}, candidates: {candidates}")
+        # Obter uma sessão com proxy
+        logger.debug(f"Iniciando requisição com IP rotativo para: {url}")
+        r, page, html_text = _download_job_page(url, _conditional_headers(previous), attempt or 0)
+        if r.status_code == 304 and previous:
+            logger.debug(f"Vaga não modificada (304): {url}")
+            scrape_stats.incr('not_modified')
+            return _unchanged_result(url, previous)
+        _archive_page(extract_job_id(url), KIND_PAGE, html_text)
         
-        return {
-            'link': url,
-            'company_name': company_name,
-            'job_title': job_title,
-            'job_description': job_description,
-            'city': city,
-            'announced_at': announced_at,
-            'candidates': candidates
-        }
-    
+        validators = _page_validators(r, previous)
+        
+        if deferred and _uses_parse_pool(page):
+            def finish(parse_future):
+                try:
+                    return _page_result(url, previous, validators, *parse_future.result())
+                except Exception as e:
+                    logger.error(f"Error processing URL {url}: {str(e)}")
+                    return _error_result(url, e)
+            return _then(_submit_parse(page, url, previous_hash=previous_hash), finish)
+        
+        # Vaga já extraída: comparar só a descrição antes do parse completo;
+        # senão, analisar a página uma única vez e extrair todos os campos
+        refreshed, parsed = _parse_page(page, url, previous_hash=previous_hash)
+        return _page_result(url, previous, validators, refreshed, parsed)
+    
+    except ExpiredPosting as e:
+        logger.info(f"Vaga encerrada ({str(e)}): {url}")
+        return _expired_result(url, previous)
     except requests.exceptions.RequestException as e:
+        if attempt is not None and attempt + 1 < FETCH_MAX_ATTEMPTS:
+            raise RetryLater(url, attempt, e)
         logger.error(f"Request error for URL {url}: {str(e)}")
-        return {
-            'link': url,
-            'company_name': f'Error: {str(e)}',
-            'job_title': 'Not found',
-            'job_description': 'Not found',
-            'city': 'Not found',
-            'announced_at': 'Not found',
-            'candidates': 'Not found'
-        }
+        return _error_result(url, e)
     except Exception as e:
         logger.error(f"Error processing URL {url}: {str(e)}")
-        return {
-            'link': url,
-            'company_name': f'Error: {str(e)}',
-            'job_title': 'Not found',
-            'job_description': 'Not found',
-            'city': 'Not found',
-            'announced_at': 'Not found',
-            'candidates': 'Not found'
-        }
+        return _error_result(url, e)
 
 def normalize_linkedin_url(url):
     """
@@ -578,17 +1859,27 @@ def normalize_linkedin_url(url):
     logger.debug(f"Não foi possível normalizar o URL: {url}")
     return url
 
-def calculate_announced_date(searched_at, announced_at):
+def calculate_announced_date(searched_at, announced_at, date_posted=None):
     """
     Calcula uma data compatível com Excel com base nas informações de Searched At e Announced At.
     
     Args:
         searched_at (str): Data e hora da pesquisa no formato 'YYYY-MM-DD HH:MM:SS'
         announced_at (str): Texto descritivo sobre quando o job foi anunciado, ex. '3 days ago'
+        date_posted (str, optional): Data exata em ISO 8601 (datePosted do JSON-LD);
+            quando válida, tem prioridade sobre a estimativa a partir de announced_at
         
     Returns:
         str: Data calculada no formato 'YYYY-MM-DD'
     """
+    if date_posted:
+        try:
+            # fromisoformat só aceita o sufixo 'Z' a partir do Python 3.11
+            posted = datetime.datetime.fromisoformat(date_posted.replace('Z', '+00:00'))
+            return posted.strftime('%Y-%m-%d')
+        except ValueError:
+            logger.warning(f"datePosted inválido: {date_posted}. Usando announced_at.")
+    
     try:
         # Converter searched_at para objeto datetime
         search_date = datetime.datetime.strptime(searched_at, '%Y-%m-%d %H:%M:%S')
@@ -654,20 +1945,35 @@ def calculate_announced_date(searched_at, announced_at):
         logger.error(f"Erro ao calcular data anunciada: {str(e)}")
         return 'Error calculating date'
 
-def process_linkedin_urls(urls, progress_callback=None):
+def process_linkedin_urls(urls, progress_callback=None, max_workers=None, previous=None, metadata=None,
+                          on_result=None):
     """
     Process a list of LinkedIn job URLs and return the results as a DataFrame.
-    Uses IP rotation to avoid blocking and adds random delays between requests.
+    Uses IP rotation to avoid blocking and fetches several URLs concurrently,
+    spacing out requests made through the same proxy/IP. A URL whose download
+    fails goes to a retry queue and is fetched again later (exponential backoff
+    with jitter, another proxy), so healthy URLs never wait behind failing ones.
     
     Args:
         urls (list): List of LinkedIn job URLs
         progress_callback (function, optional): Callback function to update progress
             with signature (current, total, message)
+        max_workers (int, optional): Number of concurrent fetch workers
+            (default: SCRAPER_MAX_WORKERS env var or 8; use 1 for sequential mode)
+        previous (dict, optional): refresh mode; job ID -> state of the last scrape
+            (see extract_company_info)
+        metadata (dict, optional): filled with normalized URL -> refresh metadata
+            (description_hash, etag, last_modified, unchanged, expired) for each result
+        on_result (function, optional): called with each result dict as soon as its URL
+            is done (before the whole batch finishes), e.g. to start analysing it
         
     Returns:
         pandas.DataFrame: DataFrame containing the results
     """
-    results = []
+    max_workers = max(1, max_workers or DEFAULT_MAX_WORKERS)
+    scrape_stats.reset()
+    if HEDGED_REQUESTS:
+        _size_hedge_pool(max_workers)
     
     # Embaralhar URLs para evitar padrões previsíveis de acesso
     random_urls = urls.copy()
@@ -679,42 +1985,105 @@ def process_linkedin_urls(urls, progress_callback=None):
     if progress_callback:
         progress_callback(0, total_urls, "Iniciando extração de dados do LinkedIn...")
     
-    for i, url in enumerate(random_urls):
-        url = url.strip()
-        if url:  # Skip empty URLs
-            # Atualizar progresso
-            if progress_callback:
-                progress_callback(i, total_urls, f"Processando vaga {i+1} de {total_urls}...")
-            
-            # Adicionar um atraso aleatório entre as requisições para evitar detecção de automação
-            if i > 0:
-                delay = random.uniform(2.0, 5.0)
-                logger.debug(f"Aguardando {delay:.2f} segundos antes da próxima requisição")
-                time.sleep(delay)
-            
-            # Normalizar o URL para o formato reduzido
-            normalized_url = normalize_linkedin_url(url)
-            logger.debug(f"Processando URL {i+1}/{len(random_urls)}: {normalized_url}")
-            
-            # Usar o URL normalizado para extração com IP rotativo
-            result = extract_company_info(normalized_url)
-            
-            # Substituir o link original pelo normalizado
-            result['link'] = normalized_url
-            
-            # Calcular a data de anúncio com base na data atual e announced_at
+    def process_url(i, url, attempt):
+        # Normalizar o URL para o formato reduzido
+        normalized_url = normalize_linkedin_url(url)
+        logger.debug(f"Processando URL {i+1}/{total_urls} (tentativa {attempt+1}): {normalized_url}")
+        
+        # Usar o URL normalizado para extração com IP rotativo
+        job_previous = previous.get(extract_job_id(normalized_url)) if previous else None
+        result = extract_company_info(normalized_url, previous=job_previous, attempt=attempt, deferred=True)
+        if isinstance(result, Future):
+            # Página no pool de parse: a thread já pode baixar a próxima URL
+            return _then(result, lambda parsed: finish_url(i, normalized_url, parsed.result()))
+        return finish_url(i, normalized_url, result)
+    
+    def finish_url(i, normalized_url, result):
+        # Substituir o link original pelo normalizado
+        result['link'] = normalized_url
+        
+        # Calcular a data de anúncio com base na data atual e announced_at
+        # (vagas sem mudança ou encerradas mantêm a data calculada na extração anterior)
+        if not ((result.get('unchanged') or result.get('expired')) and result.get('announced_calc')):
             current_datetime = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             result['announced_calc'] = calculate_announced_date(
                 current_datetime, 
-                result['announced_at']
+                result['announced_at'],
+                result.get('date_posted')
             )
+        
+        if metadata is not None:
+            metadata[normalized_url] = {
+                'description_hash': result.get('description_hash'),
+                'etag': result.get('etag'),
+                'last_modified': result.get('last_modified'),
+                'unchanged': bool(result.get('unchanged')),
+                'expired': bool(result.get('expired')),
+            }
+        
+        logger.debug(f"URL {i+1}/{total_urls} processada com sucesso")
+        return result
+    
+    # Resultados indexados pela posição, para manter a ordem independente da conclusão
+    results_by_position = [None] * total_urls
+    completed = 0
+    
+    # Fila de novas tentativas: heap de (horário liberado, posição, URL, tentativa)
+    retry_queue = []
+    
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='linkedin-fetch') as executor:
+        futures = {}
+        for i, url in enumerate(random_urls):
+            url = url.strip()
+            if url:  # Skip empty URLs
+                futures[executor.submit(process_url, i, url, 0)] = (i, url, 0)
+        
+        logger.debug(f"Extraindo {len(futures)} URLs com até {max_workers} requisições simultâneas")
+        
+        while futures or retry_queue:
+            # Reenviar as URLs cuja espera terminou
+            now = time.time()
+            while retry_queue and retry_queue[0][0] <= now:
+                _, i, url, attempt = heapq.heappop(retry_queue)
+                futures[executor.submit(process_url, i, url, attempt)] = (i, url, attempt)
             
-            results.append(result)
-            logger.debug(f"URL {i+1}/{len(random_urls)} processada com sucesso")
+            timeout = max(0.0, retry_queue[0][0] - now) if retry_queue else None
+            if not futures:
+                time.sleep(timeout)
+                continue
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
             
-            # Atualizar progresso após concluir o processamento
-            if progress_callback:
-                progress_callback(i+1, total_urls, f"Vaga {i+1} de {total_urls} processada")
+            for future in done:
+                i, url, attempt = futures.pop(future)
+                try:
+                    result = future.result()
+                except RetryLater as e:
+                    delay = _retry_delay(attempt)
+                    logger.info(f"Download falhou: {str(e)}. Nova tentativa em {delay:.1f}s")
+                    scrape_stats.incr('deferred_retries')
+                    heapq.heappush(retry_queue, (time.time() + delay, i, url, attempt + 1))
+                    continue
+                if isinstance(result, Future):
+                    # Download concluído, parse em andamento no pool de processos
+                    futures[result] = (i, url, attempt)
+                    continue
+                results_by_position[i] = result
+                completed += 1
+                
+                if on_result:
+                    try:
+                        on_result(results_by_position[i])
+                    except Exception as e:
+                        logger.error(f"Erro ao repassar o resultado de {url}: {str(e)}")
+                
+                # Atualizar progresso após concluir o processamento
+                if progress_callback:
+                    waiting = f", {len(retry_queue)} aguardando nova tentativa" if retry_queue else ""
+                    progress_callback(completed, total_urls,
+                                      f"Vaga {completed} de {total_urls} processada "
+                                      f"({proxy_manager.rates.current_rate():.2f} req/s{waiting})")
+    
+    results = [result for result in results_by_position if result is not None]
     
     # Create DataFrame from results with columns in the specified order (removed company_link and searched_at)
     df = pd.DataFrame(results, columns=[
@@ -722,177 +2091,29 @@ def process_linkedin_urls(urls, progress_callback=None):
         'announced_at', 'announced_calc', 'city', 'candidates'
     ])
     logger.debug(f"Processamento finalizado. {len(results)} URLs processadas com sucesso.")
+    logger.info(f"Instrumentação da extração: {scrape_stats.snapshot()}")
+    logger.info(f"Taxas de requisição (req/s): {proxy_manager.rates.snapshot()}")
+    for url, (bytes_read, content_length, stopped_early) in scrape_stats.transfer_snapshot().items():
+        logger.debug(f"{url}: {bytes_read} bytes lidos de {content_length or '?'}"
+                     f"{' (leitura interrompida)' if stopped_early else ''}")
+    for url, history in scrape_stats.attempt_snapshot().items():
+        if len(history) > 1:
+            logger.info(f"Tentativas para {url}: {history}")
+    logger.debug(f"Acertos dos extratores: {get_extraction_plan().snapshot()}")
     return df
 
-def get_results_html(urls, analyze_jobs=False, progress_callback=None):
+def build_results_table(df):
     """
-    Process LinkedIn job URLs and return HTML representation of the results.
+    Monta a tabela HTML de resultados, com a descrição completa e as colunas
+    de compatibilidade do Gemini.
     
     Args:
-        urls (list): List of LinkedIn job URLs
-        analyze_jobs (bool): Whether to analyze jobs with Gemini AI
-        progress_callback (function, optional): Callback function to update progress
-            with signature (current, total, message)
+        df (pandas.DataFrame): Resultados de process_linkedin_urls, com o link já
+            formatado como <a href> e as colunas nota_requisitos/nota_responsabilidades
         
     Returns:
-        str: HTML representation of the results table
-        dict: Dictionary containing the processed data for export (if requested)
+        str: HTML da tabela (estilos + <table>)
     """
-    if not urls:
-        return "<p>No URLs provided.</p>"
-    
-    # Processar URLs do LinkedIn
-    if progress_callback:
-        progress_callback(0, 100, "Iniciando extração de dados do LinkedIn...")
-    
-    # Obter DataFrame com os dados brutos
-    df = process_linkedin_urls(urls, progress_callback=progress_callback)
-    
-    # Criar uma cópia para exportação antes de modificar com HTML
-    df_export = df.copy()
-    
-    # Verificar comprimento das descrições para debug
-    for idx, row in df.iterrows():
-        logger.debug(f"Linha {idx}: Descrição com {len(row['job_description'])} caracteres")
-    
-    # Format links as HTML anchor tags before converting to HTML
-    df['link'] = df['link'].apply(lambda x: f'<a href="{x}" target="_blank">{x}</a>' if x != 'Not found' else 'Not found')
-    
-    # Atualizar progresso após extração do LinkedIn
-    if progress_callback:
-        progress_callback(len(urls), 100, "Extração de dados do LinkedIn concluída")
-    
-    # Adicionar colunas para análise Gemini (sem idioma_descricao e tipo_vaga conforme solicitado)
-    df['nota_requisitos'] = ""
-    df['nota_responsabilidades'] = ""
-    df['pontos_fracos'] = ""
-    
-    # Adicionar as mesmas colunas ao DataFrame de exportação
-    df_export['nota_requisitos'] = ""
-    df_export['nota_responsabilidades'] = ""
-    df_export['pontos_fracos'] = ""
-    
-    # Analisar vagas com Gemini API se solicitado
-    gemini_analyses = []
-    job_analyses_html = ""
-    
-    if analyze_jobs:
-        try:
-            # Importar o analisador de vagas
-            from gemini_analyzer import JobAnalyzer, format_analysis_html
-            logger.debug("Importação do analisador Gemini bem-sucedida")
-            
-            # Atualizar progresso - iniciando análise de vagas
-            if progress_callback:
-                progress_callback(len(urls), 100 + len(df), "Iniciando análise de compatibilidade com Gemini AI...")
-            
-            # Preparar os dados para análise
-            jobs_for_analysis = []
-            url_to_index = {}  # Mapear URLs para seus índices no DataFrame
-            
-            for i, (idx, row) in enumerate(df.iterrows()):
-                # Extrair URL sem tags HTML
-                link = row['link']
-                if '<a href=' in link:
-                    import re
-                    url_match = re.search(r'href="([^"]+)"', link)
-                    link = url_match.group(1) if url_match else link
-                
-                job_data = {
-                    'job_title': row['job_title'],
-                    'company_name': row['company_name'],
-                    'job_description': row['job_description'],
-                    'link': link,
-                    'original_index': idx  # Guardar o índice original
-                }
-                jobs_for_analysis.append(job_data)
-                url_to_index[link] = idx
-                
-                # Atualizar progresso de preparo para análise
-                if progress_callback and i % 2 == 0:
-                    progress_callback(
-                        len(urls) + i + 1, 
-                        100 + len(df) * 2, 
-                        f"Preparando análise para vaga {i+1} de {len(df)}..."
-                    )
-            
-            # Inicializar o analisador e processar as vagas
-            logger.info(f"Iniciando análise de {len(jobs_for_analysis)} vagas com Gemini API")
-            
-            # Definir um callback para a análise do Gemini
-            gemini_progress_base = len(urls) + len(df)
-            gemini_progress_total = len(jobs_for_analysis)
-            
-            def gemini_progress_callback(current, total, message):
-                if progress_callback:
-                    progress_callback(
-                        gemini_progress_base + current,
-                        100 + len(df) * 2 + gemini_progress_total,
-                        f"Análise Gemini AI: {message}"
-                    )
-            
-            analyzer = JobAnalyzer()
-            analyses_results = analyzer.analyze_jobs_batch(
-                jobs_for_analysis,
-                progress_callback=gemini_progress_callback
-            )
-            
-            # Armazenar resultados no DataFrame
-            for analysis in analyses_results:
-                job_link = analysis.get('job_link', '')
-                if job_link in url_to_index:
-                    idx = url_to_index[job_link]
-                    
-                    # Obter valores da análise (removidos idioma_descricao e tipo_vaga conforme solicitado)
-                    nota_requisitos = analysis.get('nota_requisitos', 0)
-                    nota_responsabilidades = analysis.get('nota_responsabilidades', 0)
-                    pontos_fracos = analysis.get('pontos_fracos', '')
-                    
-                    # Atualizar o DataFrame de visualização com os resultados da análise
-                    df.at[idx, 'nota_requisitos'] = f"{nota_requisitos}%"
-                    df.at[idx, 'nota_responsabilidades'] = f"{nota_responsabilidades}%"
-                    df.at[idx, 'pontos_fracos'] = pontos_fracos
-                    
-                    # Atualizar o DataFrame de exportação
-                    df_export.at[idx, 'nota_requisitos'] = f"{nota_requisitos}%"
-                    df_export.at[idx, 'nota_responsabilidades'] = f"{nota_responsabilidades}%"
-                    df_export.at[idx, 'pontos_fracos'] = pontos_fracos
-                
-                # Salvar para HTML detalhado abaixo da tabela
-                gemini_analyses.append(analysis)
-            
-            # Gerar HTML para cada análise (será exibido abaixo da tabela)
-            if progress_callback:
-                progress_callback(
-                    100 + len(df) * 2 + gemini_progress_total, 
-                    100 + len(df) * 2 + gemini_progress_total + 10,
-                    "Gerando visualização dos resultados da análise..."
-                )
-                
-            job_analyses_html = "<h2 class='mt-5 mb-4'>Análise Detalhada de Compatibilidade com Gemini AI</h2>"
-            for analysis in gemini_analyses:
-                job_analyses_html += format_analysis_html(analysis)
-            
-            logger.info("Análise de vagas concluída com sucesso")
-            
-            # Finalizar progresso
-            if progress_callback:
-                progress_callback(
-                    100 + len(df) * 2 + gemini_progress_total + 10,
-                    100 + len(df) * 2 + gemini_progress_total + 10,
-                    "Análise de compatibilidade concluída com sucesso!"
-                )
-            
-        except Exception as e:
-            logger.error(f"Erro ao analisar vagas com Gemini API: {str(e)}")
-            job_analyses_html = f"""
-            <div class="alert alert-danger mt-4">
-                <h4>Erro na análise de vagas</h4>
-                <p>Não foi possível realizar a análise de compatibilidade: {str(e)}</p>
-            </div>
-            """
-    
-    # Criar tabela HTML personalizada para exibir descrição completa na ordem solicitada
     html_table = """
     <style>
     /* Estilos adicionais aplicados diretamente na tabela */
@@ -1082,6 +2303,222 @@ def get_results_html(urls, analyze_jobs=False, progress_callback=None):
     </div>
     """
     
+    return html_table
+
+def get_results_html(urls, analyze_jobs=False, progress_callback=None, previous=None, metadata=None):
+    """
+    Process LinkedIn job URLs and return HTML representation of the results.
+    With analyze_jobs, each job is queued for Gemini analysis as soon as it is
+    scraped (AnalysisPipeline), so analysis overlaps with the remaining downloads.
+    
+    Args:
+        urls (list): List of LinkedIn job URLs
+        analyze_jobs (bool): Whether to analyze jobs with Gemini AI
+        progress_callback (function, optional): Callback function to update progress
+            with signature (current, total, message)
+        previous (dict, optional): refresh mode; job ID -> state of the last scrape,
+            including its Gemini 'analysis'. Unchanged jobs reuse that analysis
+            instead of calling Gemini again.
+        metadata (dict, optional): filled with normalized URL -> refresh metadata
+            (see process_linkedin_urls) plus the Gemini 'analysis' of the job
+        
+    Returns:
+        str: HTML representation of the results table
+        dict: Dictionary containing the processed data for export (if requested)
+    """
+    if not urls:
+        return "<p>No URLs provided.</p>"
+    
+    # Processar URLs do LinkedIn
+    if progress_callback:
+        progress_callback(0, 100, "Iniciando extração de dados do LinkedIn...")
+    
+    if metadata is None:
+        metadata = {}
+    
+    def reusable_analysis(link):
+        # Modo de atualização: vagas sem mudança na descrição reaproveitam a análise anterior
+        job_previous = (previous or {}).get(extract_job_id(link)) or {}
+        if metadata.get(link, {}).get('unchanged') and job_previous.get('analysis'):
+            return job_previous['analysis']
+        return None
+    
+    # Análise em fluxo: cada vaga extraída vai para a fila do Gemini enquanto as
+    # seguintes ainda estão sendo baixadas
+    analyzer = pipeline = None
+    analysis_error = None
+    stages = {'scraped': 0, 'queued': 0, 'skipped': 0, 'analysed': 0}
+    total_urls = len(urls)
+    
+    def report_progress(message):
+        if progress_callback:
+            scraping = stages['scraped'] < total_urls
+            # Enquanto a extração não termina, presume-se que cada vaga extraída ainda será analisada
+            analysis_total = total_urls - stages['skipped'] if scraping else stages['queued']
+            progress_callback(
+                stages['scraped'] + stages['analysed'],
+                max(1, total_urls + analysis_total),
+                f"Extração {stages['scraped']}/{total_urls} · Análise Gemini AI "
+                f"{stages['analysed']}/{stages['queued']}: {message}"
+            )
+    
+    def scrape_progress(current, total, message):
+        stages['scraped'] = current
+        report_progress(message)
+    
+    def analysis_progress(current, total, message):
+        stages['analysed'] = current
+        report_progress(message)
+    
+    def queue_for_analysis(result):
+        link = result['link']
+        if reusable_analysis(link) is not None or metadata.get(link, {}).get('expired'):
+            stages['skipped'] += 1
+            return
+        stages['queued'] += 1
+        pipeline.put({
+            'job_title': result['job_title'],
+            'company_name': result['company_name'],
+            'job_description': result['job_description'],
+            'link': link
+        })
+    
+    if analyze_jobs:
+        try:
+            # Importar o analisador de vagas
+            from gemini_analyzer import JobAnalyzer
+            analyzer = JobAnalyzer()
+            pipeline = analyzer.start_pipeline(progress_callback=analysis_progress)
+        except Exception as e:
+            logger.error(f"Erro ao iniciar a análise com Gemini API: {str(e)}")
+            analysis_error = e
+    
+    # Obter DataFrame com os dados brutos
+    try:
+        df = process_linkedin_urls(
+            urls,
+            progress_callback=scrape_progress if pipeline else progress_callback,
+            previous=previous,
+            metadata=metadata,
+            on_result=queue_for_analysis if pipeline else None
+        )
+    finally:
+        if pipeline:
+            try:
+                pipeline.close()
+            except Exception as e:
+                logger.error(f"Erro na análise com Gemini API: {str(e)}")
+                analysis_error = e
+    
+    # Criar uma cópia para exportação antes de modificar com HTML
+    df_export = df.copy()
+    
+    # Verificar comprimento das descrições para debug
+    for idx, row in df.iterrows():
+        logger.debug(f"Linha {idx}: Descrição com {len(row['job_description'])} caracteres")
+    
+    # Format links as HTML anchor tags before converting to HTML
+    df['link'] = df['link'].apply(lambda x: f'<a href="{x}" target="_blank">{x}</a>' if x != 'Not found' else 'Not found')
+    
+    # Atualizar progresso após extração do LinkedIn
+    stages['scraped'] = total_urls
+    if pipeline:
+        report_progress("Extração de dados do LinkedIn concluída")
+    elif progress_callback:
+        progress_callback(len(urls), 100, "Extração de dados do LinkedIn concluída")
+    
+    # Adicionar colunas para análise Gemini (sem idioma_descricao e tipo_vaga conforme solicitado)
+    df['nota_requisitos'] = ""
+    df['nota_responsabilidades'] = ""
+    df['pontos_fracos'] = ""
+    
+    # Adicionar as mesmas colunas ao DataFrame de exportação
+    df_export['nota_requisitos'] = ""
+    df_export['nota_responsabilidades'] = ""
+    df_export['pontos_fracos'] = ""
+    
+    # Analisar vagas com Gemini API se solicitado
+    gemini_analyses = []
+    job_analyses_html = ""
+    
+    # Modo de atualização: vagas sem mudança na descrição reaproveitam a análise anterior
+    reused_analyses = {}
+    if previous:
+        for link in metadata:
+            analysis = reusable_analysis(link)
+            if analysis is not None:
+                reused_analyses[link] = analysis
+                metadata[link]['analysis'] = analysis
+    
+    if analyze_jobs:
+        try:
+            if analysis_error is not None:
+                raise analysis_error
+            from gemini_analyzer import format_analysis_html
+            
+            # Mapear URLs para seus índices no DataFrame
+            url_to_index = {}
+            for idx, row in df_export.iterrows():
+                url_to_index[row['link']] = idx
+            
+            # Esperar as análises que ainda estão em andamento
+            report_progress("Aguardando as últimas análises...")
+            new_analyses = pipeline.join()
+            logger.info(f"{len(new_analyses)} vagas analisadas com Gemini API "
+                        f"({len(reused_analyses)} análises reaproveitadas de vagas sem mudança)")
+            for analysis in new_analyses:
+                if 'error' not in analysis and analysis.get('job_link') in metadata:
+                    metadata[analysis['job_link']]['analysis'] = analysis
+            analyses_results = list(reused_analyses.values()) + new_analyses
+            
+            # Armazenar resultados no DataFrame
+            for analysis in analyses_results:
+                job_link = analysis.get('job_link', '')
+                if job_link in url_to_index:
+                    idx = url_to_index[job_link]
+                    
+                    # Obter valores da análise (removidos idioma_descricao e tipo_vaga conforme solicitado)
+                    nota_requisitos = analysis.get('nota_requisitos', 0)
+                    nota_responsabilidades = analysis.get('nota_responsabilidades', 0)
+                    pontos_fracos = analysis.get('pontos_fracos', '')
+                    
+                    # Atualizar o DataFrame de visualização com os resultados da análise
+                    df.at[idx, 'nota_requisitos'] = f"{nota_requisitos}%"
+                    df.at[idx, 'nota_responsabilidades'] = f"{nota_responsabilidades}%"
+                    df.at[idx, 'pontos_fracos'] = pontos_fracos
+                    
+                    # Atualizar o DataFrame de exportação
+                    df_export.at[idx, 'nota_requisitos'] = f"{nota_requisitos}%"
+                    df_export.at[idx, 'nota_responsabilidades'] = f"{nota_responsabilidades}%"
+                    df_export.at[idx, 'pontos_fracos'] = pontos_fracos
+                
+                # Salvar para HTML detalhado abaixo da tabela
+                gemini_analyses.append(analysis)
+            
+            # Gerar HTML para cada análise (será exibido abaixo da tabela)
+            report_progress("Gerando visualização dos resultados da análise...")
+            job_analyses_html = "<h2 class='mt-5 mb-4'>Análise Detalhada de Compatibilidade com Gemini AI</h2>"
+            for analysis in gemini_analyses:
+                job_analyses_html += format_analysis_html(analysis)
+            
+            logger.info("Análise de vagas concluída com sucesso")
+            
+            # Finalizar progresso
+            if progress_callback:
+                progress_callback(1, 1, "Análise de compatibilidade concluída com sucesso!")
+            
+        except Exception as e:
+            logger.error(f"Erro ao analisar vagas com Gemini API: {str(e)}")
+            job_analyses_html = f"""
+            <div class="alert alert-danger mt-4">
+                <h4>Erro na análise de vagas</h4>
+                <p>Não foi possível realizar a análise de compatibilidade: {str(e)}</p>
+            </div>
+            """
+    
+    # Criar tabela HTML personalizada para exibir descrição completa na ordem solicitada
+    html_table = build_results_table(df)
+    
     # Adicionar análises de vagas se disponíveis
     html_content = html_table + job_analyses_html
     
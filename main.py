@@ -3,9 +3,9 @@ import os
 import logging
 import threading
 import json
-from datetime import datetime
-from linkedin_scraper import get_results_html, export_to_csv, export_to_excel
-from models import db, ProcessedBatch, IgnoredURL
+from datetime import datetime, timedelta
+from linkedin_scraper import get_results_html, export_to_csv, export_to_excel, normalize_linkedin_url, extract_job_id
+from models import db, ProcessedBatch, IgnoredURL, ScrapedJob, JobSnapshot
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
@@ -123,6 +123,69 @@ except Exception as e:
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 logger.debug(f"Gemini API Key está disponível: {GEMINI_API_KEY is not None}")
 
+# Vagas extraídas há menos que isso (em horas) não são extraídas de novo; 0 = sempre extrair
+JOB_FRESHNESS_HOURS = float(os.environ.get("JOB_FRESHNESS_HOURS", "168"))
+
+def filter_new_or_stale_urls(urls, freshness_hours):
+    """
+    Remove duplicatas pelo ID canônico da vaga (não pelo texto do URL) e as vagas
+    extraídas dentro da janela de validade, consultando o índice em bloco.
+    
+    Returns:
+        tuple: (URLs a extrair, quantidade de vagas puladas por já estarem atualizadas)
+    """
+    ignored_job_ids = {extract_job_id(url) for url in processing_progress['ignored_urls']} - {None}
+    
+    # Deduplicar pelo ID da vaga, mantendo a ordem original
+    urls_by_job_id = {}
+    without_id = []
+    for url in urls:
+        job_id = extract_job_id(url)
+        if job_id is None:
+            if url not in without_id:
+                without_id.append(url)
+        elif job_id not in ignored_job_ids and job_id not in urls_by_job_id:
+            urls_by_job_id[job_id] = url
+    
+    fresh = set()
+    if freshness_hours > 0 and urls_by_job_id:
+        try:
+            with app.app_context():
+                fresh = ScrapedJob.fresh_job_ids(urls_by_job_id, datetime.utcnow() - timedelta(hours=freshness_hours))
+        except Exception as e:
+            logger.error(f"Erro ao consultar o índice de vagas extraídas: {str(e)}")
+    
+    selected = [url for job_id, url in urls_by_job_id.items() if job_id not in fresh]
+    return selected + without_id, len(fresh)
+
+def record_scraped_jobs(df_export):
+    """Registra no índice as vagas extraídas sem erro (o commit fica a cargo de quem chama)"""
+    urls_by_job_id = {}
+    for _, row in df_export.iterrows():
+        if str(row.get('company_name', '')).startswith('Error:'):
+            continue
+        job_id = extract_job_id(row['link'])
+        if job_id:
+            urls_by_job_id[job_id] = normalize_linkedin_url(row['link'])
+    if urls_by_job_id:
+        ScrapedJob.mark_scraped(urls_by_job_id)
+
+def record_job_snapshots(df_export, metadata):
+    """
+    Grava o estado de cada vaga extraída sem erro (validadores HTTP, hash da descrição,
+    linha do resultado e análise), base do modo de atualização. O commit fica a cargo de quem chama.
+    """
+    states = {}
+    for row in df_export.to_dict(orient='records'):
+        if str(row.get('company_name', '')).startswith('Error:'):
+            continue
+        job_id = extract_job_id(row['link'])
+        job_metadata = metadata.get(row['link'], {})
+        if job_id and job_metadata.get('description_hash'):
+            states[job_id] = dict(job_metadata, row=row)
+    if states:
+        JobSnapshot.save(states)
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     """
@@ -649,6 +712,16 @@ def process_async():
         linkedin_urls_text = request.form.get('linkedin_urls', '')
         ignore_urls_text = request.form.get('ignore_urls', '')
         batch_size_text = request.form.get('batch_size', '10')
+        try:
+            freshness_hours = float(request.form.get('freshness_hours', JOB_FRESHNESS_HOURS))
+        except ValueError:
+            freshness_hours = JOB_FRESHNESS_HOURS
+        
+        # Modo de atualização: extrai de novo as vagas já conhecidas (sem a janela de validade),
+        # com requisições condicionais e só refazendo parse/análise se a descrição mudou
+        refresh = 'refresh_mode' in request.form
+        if refresh:
+            freshness_hours = 0
         
         # Converter o tamanho do lote para inteiro ou usar "all" para lote completo
         if batch_size_text == 'all':
@@ -687,15 +760,20 @@ def process_async():
         # Processar URLs a serem analisadas
         linkedin_urls_raw = [url.strip() for url in linkedin_urls_text.split('\n') if url.strip()]
         
-        # Remover duplicatas mantendo a ordem original
-        linkedin_urls = []
-        seen_urls = set()
-        for url in linkedin_urls_raw:
-            if url not in seen_urls and url not in processing_progress['ignored_urls']:
-                linkedin_urls.append(url)
-                seen_urls.add(url)
+        # Remover URLs ignorados, duplicatas (pelo ID da vaga) e vagas extraídas recentemente
+        linkedin_urls, skipped_fresh = filter_new_or_stale_urls(
+            [url for url in linkedin_urls_raw if url not in processing_progress['ignored_urls']],
+            freshness_hours
+        )
+        if skipped_fresh:
+            logger.debug(f"{skipped_fresh} vagas já extraídas nas últimas {freshness_hours:g} horas foram puladas")
         
         if not linkedin_urls:
+            if skipped_fresh:
+                return jsonify({
+                    'success': False,
+                    'message': f'Todas as vagas enviadas já foram extraídas nas últimas {freshness_hours:g} horas.'
+                })
             return jsonify({
                 'success': False,
                 'message': 'Por favor, forneça pelo menos um URL válido do LinkedIn que não esteja na lista de ignorados.'
@@ -723,7 +801,8 @@ def process_async():
             # Adicionar novo trabalho à fila
             new_job = {
                 'batches': batches,
-                'analyze_jobs': analyze_jobs
+                'analyze_jobs': analyze_jobs,
+                'refresh': refresh
             }
             processing_progress['job_queue'].append(new_job)
             logger.debug(f"Processamento já em andamento. Trabalho adicionado à fila. Fila atual: {len(processing_progress['job_queue'])}")
@@ -740,15 +819,17 @@ def process_async():
             processing_progress['analyze_jobs'] = analyze_jobs
             
             # Iniciar o processamento em uma thread separada
-            thread = threading.Thread(target=process_batches_background, args=(batches, analyze_jobs))
+            thread = threading.Thread(target=process_batches_background, args=(batches, analyze_jobs, refresh))
             thread.daemon = True
             thread.start()
             
             logger.debug(f"Iniciado processamento assíncrono com {len(batches)} lotes")
+            skipped_message = f' {skipped_fresh} vagas já extraídas recentemente foram puladas.' if skipped_fresh else ''
             return jsonify({
                 'success': True,
-                'message': f'Iniciado processamento assíncrono de {len(linkedin_urls)} URLs em {len(batches)} lotes.',
-                'batch_count': len(batches)
+                'message': f'Iniciado processamento assíncrono de {len(linkedin_urls)} URLs em {len(batches)} lotes.{skipped_message}',
+                'batch_count': len(batches),
+                'skipped_fresh': skipped_fresh
             })
     
     except Exception as e:
@@ -768,13 +849,15 @@ def update_progress(current, total, message):
     processing_progress['message'] = message
     logger.debug(f"Progresso atualizado: {current}/{total} - {message}")
 
-def process_batches_background(batches, analyze_jobs=False):
+def process_batches_background(batches, analyze_jobs=False, refresh=False):
     """
     Processa lotes de URLs sequencialmente
     
     Args:
         batches (list): Lista de lotes, cada lote é uma lista de URLs
         analyze_jobs (bool): Se True, analisa as vagas com a API Gemini
+        refresh (bool): Se True, usa o estado da última extração de cada vaga
+            (requisição condicional e comparação do hash da descrição)
     """
     global processing_progress
     
@@ -789,8 +872,9 @@ def process_batches_background(batches, analyze_jobs=False):
             batch_index = i
             
             # Verificar se este lote já foi processado e salvo no banco de dados
+            # (no modo de atualização o lote é sempre processado de novo)
             with app.app_context():
-                existing_batch = ProcessedBatch.query.filter_by(batch_index=batch_index).first()
+                existing_batch = None if refresh else ProcessedBatch.query.filter_by(batch_index=batch_index).first()
                 if existing_batch and existing_batch.df_json:
                     # Adicionar à lista de lotes processados
                     batch_data = existing_batch.to_dict()
@@ -819,12 +903,25 @@ def process_batches_background(batches, analyze_jobs=False):
             
             logger.debug(f"Iniciando processamento do lote {batch_index} com {len(batch_urls)} URLs")
             
+            # Estado da última extração das vagas deste lote (modo de atualização)
+            previous = None
+            metadata = {}
+            if refresh:
+                try:
+                    with app.app_context():
+                        previous = JobSnapshot.load({extract_job_id(url) for url in batch_urls} - {None})
+                    logger.debug(f"Lote {batch_index}: {len(previous)} vagas com extração anterior")
+                except Exception as e:
+                    logger.error(f"Erro ao carregar o estado anterior das vagas: {str(e)}")
+            
             # Executar o processamento deste lote
             try:
                 results_html, df_export = get_results_html(
                     batch_urls, 
                     analyze_jobs=analyze_jobs, 
-                    progress_callback=batch_progress_callback
+                    progress_callback=batch_progress_callback,
+                    previous=previous,
+                    metadata=metadata
                 )
                 
                 # Salvar resultados
@@ -886,6 +983,11 @@ def process_batches_background(batches, analyze_jobs=False):
                         )
                         db.session.add(new_batch)
                     
+                    # Atualizar o índice de vagas extraídas na mesma transação
+                    if batch_success and df_export is not None:
+                        record_scraped_jobs(df_export)
+                        record_job_snapshots(df_export, metadata)
+                    
                     db.session.commit()
                     logger.debug(f"Lote {batch_index} salvo no banco de dados com sucesso")
             except Exception as e:
@@ -904,7 +1006,7 @@ def process_batches_background(batches, analyze_jobs=False):
             # Iniciar processamento do próximo trabalho
             thread = threading.Thread(
                 target=process_batches_background, 
-                args=(next_job['batches'], next_job['analyze_jobs'])
+                args=(next_job['batches'], next_job['analyze_jobs'], next_job.get('refresh', False))
             )
             thread.daemon = True
             thread.start()
@@ -935,8 +1037,10 @@ def clear_history():
         
         # Limpar o banco de dados
         with app.app_context():
-            # Excluir todos os lotes processados
+            # Excluir todos os lotes processados (e o índice de vagas extraídas, que aponta para eles)
             ProcessedBatch.query.delete()
+            ScrapedJob.query.delete()
+            JobSnapshot.query.delete()
             
             # Opcionalmente, limpar URLs ignoradas se solicitado
             clear_ignored = request.args.get('clear_ignored', 'false').lower() == 'true'
@@ -42,4 +42,135 @@ class IgnoredURL(db.Model):
     """
     id = db.Column(db.Integer, primary_key=True)
     url = db.Column(db.String(1024), unique=True, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class ScrapedJob(db.Model):
+    """
+    Índice das vagas já extraídas, pelo ID canônico (normalize_linkedin_url),
+    com o horário da última extração. Evita extrair de novo a mesma vaga
+    enviada em outro lote, em outra execução ou com outros parâmetros no URL.
+    """
+    job_id = db.Column(db.String(32), primary_key=True)
+    url = db.Column(db.String(1024), nullable=False)
+    last_scraped_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    scrape_count = db.Column(db.Integer, nullable=False, default=1)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Quantidade de IDs por consulta IN (limite de parâmetros dos bancos)
+    QUERY_CHUNK_SIZE = 500
+    
+    @classmethod
+    def fresh_job_ids(cls, job_ids, scraped_after):
+        """
+        Retorna, entre os IDs informados, os que foram extraídos depois de scraped_after
+        (uma consulta indexada por bloco de IDs).
+        """
+        job_ids = list(job_ids)
+        fresh = set()
+        for i in range(0, len(job_ids), cls.QUERY_CHUNK_SIZE):
+            chunk = job_ids[i:i + cls.QUERY_CHUNK_SIZE]
+            rows = db.session.query(cls.job_id).filter(
+                cls.job_id.in_(chunk), cls.last_scraped_at >= scraped_after
+            ).all()
+            fresh.update(row.job_id for row in rows)
+        return fresh
+    
+    @classmethod
+    def mark_scraped(cls, urls_by_job_id, scraped_at=None):
+        """
+        Registra (ou atualiza) o horário da última extração das vagas.
+        O commit fica a cargo de quem chama.
+        
+        Args:
+            urls_by_job_id (dict): ID da vaga -> URL normalizado
+            scraped_at (datetime, optional): horário da extração (padrão: agora, UTC)
+        """
+        scraped_at = scraped_at or datetime.utcnow()
+        job_ids = list(urls_by_job_id)
+        existing = {}
+        for i in range(0, len(job_ids), cls.QUERY_CHUNK_SIZE):
+            chunk = job_ids[i:i + cls.QUERY_CHUNK_SIZE]
+            existing.update((job.job_id, job) for job in cls.query.filter(cls.job_id.in_(chunk)).all())
+        
+        for job_id, url in urls_by_job_id.items():
+            job = existing.get(job_id)
+            if job is None:
+                db.session.add(cls(job_id=job_id, url=url, last_scraped_at=scraped_at))
+            else:
+                job.url = url
+                job.last_scraped_at = scraped_at
+                job.scrape_count = (job.scrape_count or 0) + 1
+
+
+class JobSnapshot(db.Model):
+    """
+    Estado da última extração completa de cada vaga, usado pelo modo de atualização:
+    validadores HTTP (ETag/Last-Modified) para requisições condicionais, hash da
+    descrição para detectar mudanças, e a última linha de resultado com a análise
+    do Gemini, reaproveitadas quando a vaga não mudou.
+    """
+    job_id = db.Column(db.String(32), primary_key=True)
+    etag = db.Column(db.String(256), nullable=True)
+    last_modified = db.Column(db.String(64), nullable=True)
+    description_hash = db.Column(db.String(64), nullable=True)
+    row_json = db.Column(db.Text, nullable=True)       # Última linha do resultado (JSON)
+    analysis_json = db.Column(db.Text, nullable=True)  # Última análise do Gemini (JSON)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    QUERY_CHUNK_SIZE = ScrapedJob.QUERY_CHUNK_SIZE
+    
+    def to_state(self):
+        """Estado no formato esperado pelo extract_company_info (parâmetro previous)"""
+        try:
+            row = json.loads(self.row_json) if self.row_json else {}
+            analysis = json.loads(self.analysis_json) if self.analysis_json else None
+        except ValueError:
+            row, analysis = {}, None
+        return {
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'description_hash': self.description_hash,
+            'row': row,
+            'analysis': analysis
+        }
+    
+    @classmethod
+    def load(cls, job_ids):
+        """Retorna {ID da vaga: estado da última extração} para os IDs que têm snapshot"""
+        job_ids = list(job_ids)
+        states = {}
+        for i in range(0, len(job_ids), cls.QUERY_CHUNK_SIZE):
+            chunk = job_ids[i:i + cls.QUERY_CHUNK_SIZE]
+            states.update((snapshot.job_id, snapshot.to_state())
+                          for snapshot in cls.query.filter(cls.job_id.in_(chunk)).all())
+        return states
+    
+    @classmethod
+    def save(cls, states):
+        """
+        Grava (ou atualiza) o snapshot das vagas. O commit fica a cargo de quem chama.
+        
+        Args:
+            states (dict): ID da vaga -> dict com etag, last_modified, description_hash,
+                row (linha do resultado) e analysis (análise do Gemini, opcional)
+        """
+        job_ids = list(states)
+        existing = {}
+        for i in range(0, len(job_ids), cls.QUERY_CHUNK_SIZE):
+            chunk = job_ids[i:i + cls.QUERY_CHUNK_SIZE]
+            existing.update((snapshot.job_id, snapshot) for snapshot in cls.query.filter(cls.job_id.in_(chunk)).all())
+        
+        for job_id, state in states.items():
+            snapshot = existing.get(job_id)
+            if snapshot is None:
+                snapshot = cls(job_id=job_id)
+                db.session.add(snapshot)
+            snapshot.etag = state.get('etag')
+            snapshot.last_modified = state.get('last_modified')
+            snapshot.description_hash = state.get('description_hash')
+            snapshot.row_json = json.dumps(state.get('row') or {}, ensure_ascii=False, default=str)
+            # Sem análise (ou descrição alterada sem nova análise): a anterior deixa de valer
+            analysis = state.get('analysis')
+            snapshot.analysis_json = json.dumps(analysis, ensure_ascii=False, default=str) if analysis else None
+            snapshot.updated_at = datetime.utcnow()
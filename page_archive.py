@@ -0,0 +1,339 @@
+"""
+Arquivo de páginas brutas das vagas, para reextrair campos sem acessar a rede.
+
+Cada página baixada é gravada comprimida (zlib) no fim de pages.dat, e um registro
+de tamanho fixo (ID da vaga, posição, tamanho, horário, tipo) vai para pages.idx.
+Os dois arquivos só recebem dados no fim (append-only): regravar uma vaga apenas
+adiciona uma versão nova, e a mais recente prevalece. A leitura usa mmap sobre
+pages.dat, sem copiar o arquivo para a memória.
+
+O arquivo é opcional: só é gravado com PAGE_ARCHIVE_DIR definido (por exemplo,
+page_archive/ ao lado deste arquivo, o padrão dos comandos abaixo). Acima de
+PAGE_ARCHIVE_MAX_MB megabytes em pages.dat, novas páginas deixam de ser gravadas;
+o comando compact regrava o arquivo só com a versão mais recente de cada vaga.
+Com o arquivo ativo, o scraper lê as páginas inteiras (sem interromper a leitura
+após a descrição), para que a reextração tenha o HTML completo.
+
+Reextração (processos paralelos, sem rede):
+    python page_archive.py stats
+    python page_archive.py show 4197948497
+    python page_archive.py reextract --output vagas.csv [--workers 8] [--job-ids 4197948497 ...]
+    python page_archive.py compact [--max-mb 512]
+"""
+import argparse
+import datetime
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'page_archive')
+PAGE_ARCHIVE_DIR = os.environ.get("PAGE_ARCHIVE_DIR", "")
+PAGE_ARCHIVE_MAX_MB = int(os.environ.get("PAGE_ARCHIVE_MAX_MB", "1024"))  # Limite de pages.dat (0 = sem limite)
+ARCHIVE_COMPRESSION_LEVEL = 6
+REEXTRACT_CHUNK_SIZE = 200  # Páginas por tarefa enviada a cada processo
+
+# Tipos de página
+KIND_PAGE = 0    # Página pública completa (ou o trecho lido até a descrição)
+KIND_GUEST = 1   # Fragmento do endpoint de convidado
+KIND_NAMES = {KIND_PAGE: 'page', KIND_GUEST: 'guest'}
+
+# Registro do índice: ID da vaga, posição e tamanho em pages.dat, horário (epoch), tipo
+INDEX_RECORD = struct.Struct('<QQIdB')
+
+
+class PageArchive:
+    """
+    Arquivo append-only de páginas comprimidas com índice por ID da vaga.
+    Seguro para várias threads; entre processos, a gravação usa flock (quando disponível).
+    """
+
+    def __init__(self, directory, max_bytes=PAGE_ARCHIVE_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.full = False        # Limite atingido: novas páginas não são gravadas
+        os.makedirs(directory, exist_ok=True)
+        self.data_path = os.path.join(directory, 'pages.dat')
+        self.index_path = os.path.join(directory, 'pages.idx')
+        self.lock = threading.Lock()
+        self.entries = {}        # job_id -> (posição, tamanho, horário, tipo)
+        self.index_size = 0      # Bytes de pages.idx já carregados
+        self.map = None
+        self.map_file = None
+        with self.lock:
+            self._load_index()
+
+    def _load_index(self):
+        """Carrega os registros novos de pages.idx (gravados por esta ou outra instância)"""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'rb') as f:
+            f.seek(self.index_size)
+            data = f.read()
+        # Um registro incompleto no fim (gravação interrompida) é ignorado
+        usable = len(data) - len(data) % INDEX_RECORD.size
+        for job_id, offset, length, stored_at, kind in INDEX_RECORD.iter_unpack(data[:usable]):
+            self.entries[job_id] = (offset, length, stored_at, kind)
+        self.index_size += usable
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, job_id):
+        return int(job_id) in self.entries
+
+    def job_ids(self):
+        with self.lock:
+            return list(self.entries)
+
+    def append(self, job_id, html_text, kind=KIND_PAGE, stored_at=None):
+        """
+        Grava uma versão da página da vaga (texto HTML) no fim do arquivo.
+
+        Returns:
+            bool: False se o limite de tamanho (max_bytes) impediu a gravação
+        """
+        job_id = int(job_id)
+        stored_at = stored_at or time.time()
+        if self.full:
+            return False
+        compressed = zlib.compress(html_text.encode('utf-8'), ARCHIVE_COMPRESSION_LEVEL)
+
+        with self.lock:
+            with open(self.data_path, 'ab') as data_file, open(self.index_path, 'ab') as index_file:
+                if fcntl:
+                    fcntl.flock(data_file, fcntl.LOCK_EX)
+                try:
+                    # Registros gravados por outros processos desde a última leitura do índice
+                    self._load_index()
+                    data_file.seek(0, os.SEEK_END)
+                    offset = data_file.tell()
+                    if self.max_bytes and offset + len(compressed) > self.max_bytes:
+                        self.full = True
+                        logger.warning(f"Arquivo de páginas em {self.directory} atingiu o limite de "
+                                       f"{self.max_bytes / 1024 / 1024:.1f} MB; novas páginas não serão "
+                                       f"gravadas (use 'python page_archive.py compact')")
+                        return False
+                    data_file.write(compressed)
+                    data_file.flush()
+                    # O índice só é gravado depois dos dados: um registro no índice sempre aponta para dados completos
+                    index_file.write(INDEX_RECORD.pack(job_id, offset, len(compressed), stored_at, kind))
+                    index_file.flush()
+                    self.index_size = index_file.tell()
+                finally:
+                    if fcntl:
+                        fcntl.flock(data_file, fcntl.LOCK_UN)
+            self.entries[job_id] = (offset, len(compressed), stored_at, kind)
+        return True
+
+    def _view(self, offset, length):
+        """Bytes de pages.dat via mmap, remapeando se o arquivo cresceu"""
+        if self.map is None or offset + length > len(self.map):
+            if self.map is not None:
+                self.map.close()
+                self.map_file.close()
+            self.map_file = open(self.data_path, 'rb')
+            self.map = mmap.mmap(self.map_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.map[offset:offset + length]
+
+    def entry(self, job_id):
+        """(posição, tamanho, horário, tipo) da versão mais recente da vaga, ou None"""
+        job_id = int(job_id)
+        with self.lock:
+            # Índice cresceu (gravações de outra instância): pode haver uma versão mais nova
+            if os.path.exists(self.index_path) and os.path.getsize(self.index_path) > self.index_size:
+                self._load_index()
+            return self.entries.get(job_id)
+
+    def get(self, job_id):
+        """
+        Retorna (texto HTML, horário da gravação, tipo) da versão mais recente da vaga,
+        ou None se ela não estiver no arquivo.
+        """
+        entry = self.entry(job_id)
+        if entry is None:
+            return None
+        offset, length, stored_at, kind = entry
+        with self.lock:
+            compressed = self._view(offset, length)
+        return zlib.decompress(compressed).decode('utf-8'), stored_at, kind
+
+    def close(self):
+        with self.lock:
+            if self.map is not None:
+                self.map.close()
+                self.map_file.close()
+                self.map = self.map_file = None
+
+
+def compact(directory, max_bytes=None):
+    """
+    Regrava o arquivo só com a versão mais recente de cada vaga. Com max_bytes, as
+    vagas gravadas há mais tempo ficam de fora até o resultado caber no limite.
+    Deve rodar com o scraper parado: outras instâncias abertas apontariam para
+    posições antigas de pages.dat.
+
+    Returns:
+        tuple: (vagas mantidas, bytes de pages.dat antes, bytes depois)
+    """
+    archive = PageArchive(directory, max_bytes=0)
+    before = os.path.getsize(archive.data_path) if os.path.exists(archive.data_path) else 0
+    # Mais recentes primeiro, para que o limite descarte as mais antigas
+    latest = sorted(archive.entries.items(), key=lambda item: item[1][2], reverse=True)
+    data_tmp = archive.data_path + '.tmp'
+    index_tmp = archive.index_path + '.tmp'
+    kept = 0
+    with open(data_tmp, 'wb') as data_file, open(index_tmp, 'wb') as index_file:
+        for job_id, (offset, length, stored_at, kind) in latest:
+            if max_bytes and data_file.tell() + length > max_bytes:
+                break
+            new_offset = data_file.tell()
+            data_file.write(archive._view(offset, length))
+            index_file.write(INDEX_RECORD.pack(job_id, new_offset, length, stored_at, kind))
+            kept += 1
+    archive.close()
+    # Dados antes do índice: um índice novo nunca aponta para o pages.dat antigo
+    os.replace(data_tmp, archive.data_path)
+    os.replace(index_tmp, archive.index_path)
+    return kept, before, os.path.getsize(archive.data_path)
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+def get_page_archive():
+    """Arquivo de páginas compartilhado (aberto na primeira utilização), ou None se desativado"""
+    global _archive
+    if not PAGE_ARCHIVE_DIR:
+        return None
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                _archive = PageArchive(PAGE_ARCHIVE_DIR)
+                logger.info(f"Arquivo de páginas em {PAGE_ARCHIVE_DIR} ({len(_archive)} vagas)")
+    return _archive
+
+
+# Reextração em processos paralelos: cada processo abre o arquivo (mmap) uma vez
+_worker_archive = None
+
+def _init_worker(directory):
+    global _worker_archive
+    logging.disable(logging.WARNING)
+    _worker_archive = PageArchive(directory)
+
+def _reextract_chunk(job_ids):
+    from linkedin_scraper import calculate_announced_date, parse_job_page
+
+    rows = []
+    for job_id in job_ids:
+        archived = _worker_archive.get(job_id)
+        if archived is None:
+            continue
+        page, stored_at, kind = archived
+        link = f"https://www.linkedin.com/jobs/view/{job_id}"
+        try:
+            row = {'link': link}
+            row.update(parse_job_page(page, link, skip_heuristic=(kind == KIND_GUEST)))
+        except Exception as e:
+            logger.error(f"Erro ao reextrair a vaga {job_id}: {str(e)}")
+            continue
+        searched_at = datetime.datetime.fromtimestamp(stored_at).strftime('%Y-%m-%d %H:%M:%S')
+        row['announced_calc'] = calculate_announced_date(searched_at, row['announced_at'], row.get('date_posted'))
+        row['archived_at'] = searched_at
+        rows.append(row)
+    return rows
+
+def reextract(directory, job_ids=None, workers=None, progress=None):
+    """
+    Reexecuta o parser sobre as páginas arquivadas, em processos paralelos.
+
+    Returns:
+        list: linhas com os mesmos campos de process_linkedin_urls, mais archived_at
+    """
+    archive = PageArchive(directory)
+    job_ids = [int(job_id) for job_id in job_ids] if job_ids else archive.job_ids()
+    archive.close()
+    chunks = [job_ids[i:i + REEXTRACT_CHUNK_SIZE] for i in range(0, len(job_ids), REEXTRACT_CHUNK_SIZE)]
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(directory,)) as executor:
+        for chunk_rows in executor.map(_reextract_chunk, chunks):
+            rows.extend(chunk_rows)
+            if progress:
+                progress(len(rows), len(job_ids))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default=PAGE_ARCHIVE_DIR or DEFAULT_ARCHIVE_DIR, help='Diretório do arquivo')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('stats', help='Resumo do arquivo')
+    show = commands.add_parser('show', help='Imprime o HTML arquivado de uma vaga')
+    show.add_argument('job_id')
+    run = commands.add_parser('reextract', help='Reextrai os campos de todas as páginas arquivadas')
+    run.add_argument('--output', required=True, help='Arquivo de saída (.csv ou .jsonl)')
+    run.add_argument('--workers', type=int, default=None, help='Processos (padrão: número de CPUs)')
+    run.add_argument('--job-ids', nargs='+', help='Apenas estas vagas')
+    shrink = commands.add_parser('compact', help='Mantém só a versão mais recente de cada vaga')
+    shrink.add_argument('--max-mb', type=int, default=None,
+                        help='Tamanho máximo do resultado (descarta as vagas gravadas há mais tempo)')
+    args = parser.parse_args()
+
+    if args.command == 'stats':
+        archive = PageArchive(args.dir)
+        kinds = {}
+        for _, _, _, kind in archive.entries.values():
+            kinds[KIND_NAMES.get(kind, kind)] = kinds.get(KIND_NAMES.get(kind, kind), 0) + 1
+        data_size = os.path.getsize(archive.data_path) if os.path.exists(archive.data_path) else 0
+        print(f"{len(archive)} vagas {kinds}, {data_size / 1024 / 1024:.1f} MB comprimidos em {args.dir}")
+        return
+
+    if args.command == 'compact':
+        max_bytes = args.max_mb * 1024 * 1024 if args.max_mb else None
+        kept, before, after = compact(args.dir, max_bytes)
+        print(f"{kept} vagas mantidas; pages.dat: {before / 1024 / 1024:.1f} MB -> {after / 1024 / 1024:.1f} MB")
+        return
+
+    if args.command == 'show':
+        archived = PageArchive(args.dir).get(args.job_id)
+        if archived is None:
+            sys.exit(f"Vaga {args.job_id} não está no arquivo")
+        sys.stdout.write(archived[0])
+        return
+
+    import pandas as pd
+
+    started_at = time.perf_counter()
+    rows = reextract(args.dir, args.job_ids, args.workers,
+                     progress=lambda done, total: print(f"\r{done}/{total} páginas", end='', file=sys.stderr))
+    elapsed = time.perf_counter() - started_at
+    print(file=sys.stderr)
+
+    df = pd.DataFrame(rows, columns=[
+        'link', 'company_name', 'job_title', 'job_description',
+        'announced_at', 'announced_calc', 'city', 'candidates', 'archived_at'
+    ])
+    if args.output.endswith('.jsonl'):
+        df.to_json(args.output, orient='records', lines=True, force_ascii=False)
+    else:
+        df.to_csv(args.output, index=False, encoding='utf-8')
+    print(f"{len(df)} vagas reextraídas em {elapsed:.1f}s ({len(df) / elapsed if elapsed else 0:.0f} páginas/s) "
+          f"-> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+import json
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Os módulos do projeto ficam na raiz do repositório (sem pacote); o servidor
+# que imita o LinkedIn fica em benchmarks/
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+# Sem arquivos persistentes (cache de análises, arquivo de páginas) durante os testes
+os.environ['ANALYSIS_CACHE_PATH'] = ''
+os.environ['PAGE_ARCHIVE_DIR'] = ''
+
+from standin_server import build_guest_fragment, make_handler  # noqa: E402
+
+SAMPLE_PAGE = os.path.join(ROOT, 'linkedin_sample.html')
+JOB_ID = '4197948497'
+
+
+class StandIn:
+    """Servidor local do standin_server.py, com registro dos caminhos pedidos e falhas programadas"""
+
+    def __init__(self, guest_missing=()):
+        with open(SAMPLE_PAGE, 'rb') as f:
+            self.page_body = f.read()
+        fragment_body = build_guest_fragment(self.page_body.decode('utf-8'), guest_missing)
+        self.paths = []
+        self.conditional = []  # If-None-Match recebido em cada requisição (ou None)
+        self.failures = {}  # caminho -> [status, vezes restantes]
+        self.page_etag = None  # com valor, a página completa tem ETag e responde 304 a ele
+        self.lock = threading.Lock()
+        standin = self
+
+        class Handler(make_handler(self.page_body, fragment_body)):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                with standin.lock:
+                    standin.paths.append(path)
+                    standin.conditional.append(self.headers.get('If-None-Match'))
+                    failure = standin.failures.get(path)
+                    if failure and failure[1] > 0:
+                        failure[1] -= 1
+                        status = failure[0]
+                    else:
+                        status = None
+                    etag = standin.page_etag if path.startswith('/jobs/view/') else None
+                if status:
+                    self.send_error(status)
+                    return
+                if etag and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.etag = etag
+                super().do_GET()
+
+            def end_headers(self):
+                if getattr(self, 'etag', None):
+                    self.send_header('ETag', self.etag)
+                    self.etag = None
+                super().end_headers()
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def job_url(self, job_id=JOB_ID):
+        return f"{self.base_url}/jobs/view/{job_id}"
+
+    def fail(self, path, times, status=503):
+        """As próximas `times` requisições a path respondem com o status HTTP informado"""
+        with self.lock:
+            self.failures[path] = [status, times]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def standin():
+    server = StandIn()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def standin_guest_missing_description():
+    server = StandIn(guest_missing=('description',))
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def direct_fetch(monkeypatch):
+    """Downloads sem proxies nem espaçamento entre requisições, com estatísticas zeradas"""
+    import linkedin_scraper
+
+    monkeypatch.setattr(linkedin_scraper.proxy_manager, 'get_random_proxy', lambda avoid=(): None)
+    monkeypatch.setattr(linkedin_scraper.proxy_manager, 'wait_for_turn', lambda proxy: None)
+    monkeypatch.setattr(linkedin_scraper, 'HEDGED_REQUESTS', False)
+    linkedin_scraper.scrape_stats.reset()
+    return linkedin_scraper
+
+
+class FakeChunk:
+    def __init__(self, text, usage_metadata=None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class FakeModels:
+    """
+    Substitui client.models do Gemini: responde com respond(texto enviado, config)
+    e registra as chamadas. A resposta padrão dá notas fixas, uma por vaga do pacote.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+        self.respond = self.default_response
+
+    @staticmethod
+    def default_response(text, config):
+        analysis = {"pontuacao_requisitos": 70, "pontuacao_responsabilidades": 60, "pontos_fracos": "Nenhum"}
+        pack_ids = re.findall(r"=== ID_VAGA: (\d+) ===", text)
+        if pack_ids:
+            return json.dumps([dict(analysis, id_vaga=job_id) for job_id in pack_ids])
+        return json.dumps(analysis)
+
+    def generate_content_stream(self, model, contents, config):
+        text = contents[0].parts[0].text
+        with self.lock:
+            self.calls.append((text, config))
+        yield FakeChunk(self.respond(text, config))
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    """JobAnalyzer com o cliente do Gemini substituído por FakeModels (sem rede, sem cache)"""
+    from types import SimpleNamespace
+
+    from gemini_analyzer import JobAnalyzer
+
+    monkeypatch.setenv('GEMINI_API_KEY', 'test-key')
+    job_analyzer = JobAnalyzer()
+    job_analyzer.client = SimpleNamespace(models=FakeModels())
+    job_analyzer.cache = None
+    return job_analyzer
+
+
+def make_jobs(count, prefix='Vaga'):
+    return [{
+        'job_title': f'{prefix} {n}',
+        'company_name': 'ACME',
+        'job_description': f'Requisitos<br><br>Experiência com Python número {n}.',
+        'link': f'https://www.linkedin.com/jobs/view/{4100000000 + n}',
+    } for n in range(count)]
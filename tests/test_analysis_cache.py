@@ -0,0 +1,90 @@
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+import analysis_cache
+from analysis_cache import AnalysisCache, analysis_cache_key
+from conftest import make_jobs
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Relógio que avança um segundo por leitura, para a ordem LRU não depender de empates"""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(analysis_cache, 'time', SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+def test_key_changes_with_each_part():
+    base = ('vaga', 'prompt', 'modelo', '{}')
+    keys = {analysis_cache_key(*base)}
+    for position in range(len(base)):
+        parts = list(base)
+        parts[position] += 'x'
+        keys.add(analysis_cache_key(*parts))
+    assert len(keys) == len(base) + 1
+    assert analysis_cache_key(*base) == analysis_cache_key(*base)
+
+
+def test_key_parts_do_not_run_together():
+    assert analysis_cache_key('ab', 'c', 'm', '{}') != analysis_cache_key('a', 'bc', 'm', '{}')
+
+
+def test_get_put_and_replace_without_double_count(tmp_path):
+    cache = AnalysisCache(str(tmp_path / 'cache.sqlite3'), max_entries=10)
+    assert cache.get('k') is None
+    cache.put('k', {'nota': 1})
+    cache.put('k', {'nota': 2})
+    assert cache.get('k') == {'nota': 2}
+    assert len(cache) == 1
+    cache.close()
+
+    reopened = AnalysisCache(str(tmp_path / 'cache.sqlite3'), max_entries=10)
+    assert len(reopened) == 1
+    assert reopened.get('k') == {'nota': 2}
+    reopened.close()
+
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    cache = AnalysisCache(str(tmp_path / 'cache.sqlite3'), max_entries=10)
+    for n in range(10):
+        cache.put(f'k{n}', {'n': n})
+    # Usar k0 o torna o mais recente; a próxima gravação passa do limite
+    assert cache.get('k0') == {'n': 0}
+    cache.put('k10', {'n': 10})
+
+    # Remove o excesso mais a folga (10%): k1 e k2, as usadas há mais tempo
+    assert len(cache) == 9
+    assert cache.get('k1') is None and cache.get('k2') is None
+    assert cache.get('k0') == {'n': 0}
+    assert cache.get('k10') == {'n': 10}
+    cache.close()
+
+
+def test_default_path_disables_cache(monkeypatch):
+    monkeypatch.setattr(analysis_cache, 'ANALYSIS_CACHE_PATH', '')
+    monkeypatch.setattr(analysis_cache, '_cache', None)
+    assert analysis_cache.get_analysis_cache() is None
+
+
+def test_single_analysis_is_cached_and_reused(analyzer, tmp_path):
+    analyzer.cache = AnalysisCache(str(tmp_path / 'cache.sqlite3'))
+    job = make_jobs(1)[0]
+    first = analyzer.analyze_job(dict(job))
+    assert first['nota_requisitos'] == 70
+    assert len(analyzer.client.models.calls) == 1
+
+    cached = analyzer.cached_analysis(dict(job))
+    assert cached['nota_requisitos'] == 70
+    assert cached['job_link'] == job['link']
+    analyzer.analyze_job(dict(job))
+    assert len(analyzer.client.models.calls) == 1
+
+
+def test_pack_results_are_not_stored_as_single_analyses(analyzer, tmp_path):
+    analyzer.cache = AnalysisCache(str(tmp_path / 'cache.sqlite3'))
+    jobs = make_jobs(3)
+    results = analyzer.analyze_job_pack([dict(job) for job in jobs])
+    assert all(result is not None for result in results)
+    assert len(analyzer.cache) == 0
+    assert analyzer.cached_analysis(dict(jobs[0])) is None
@@ -0,0 +1,92 @@
+import json
+import re
+
+import gemini_analyzer
+from conftest import make_jobs
+
+
+def _pack_response(scores):
+    """respond que dá a cada vaga do pacote a nota scores(id_vaga), ou a omite se for None"""
+    def respond(text, config):
+        ids = re.findall(r"=== ID_VAGA: (\d+) ===", text)
+        if not ids:
+            return json.dumps({"pontuacao_requisitos": 50, "pontuacao_responsabilidades": 50,
+                               "pontos_fracos": "Individual"})
+        items = [{"id_vaga": job_id, "pontuacao_requisitos": scores(int(job_id)),
+                  "pontuacao_responsabilidades": 40, "pontos_fracos": f"Vaga {job_id}"}
+                 for job_id in ids if scores(int(job_id)) is not None]
+        return json.dumps(list(reversed(items)))
+    return respond
+
+
+def test_pack_results_are_matched_by_id(analyzer):
+    analyzer.client.models.respond = _pack_response(lambda job_id: job_id * 10)
+    jobs = make_jobs(3)
+
+    results = analyzer.analyze_job_pack(jobs)
+
+    assert [result['nota_requisitos'] for result in results] == [10, 20, 30]
+    assert [result['job_link'] for result in results] == [job['link'] for job in jobs]
+    assert all('id_vaga' not in result for result in results)
+    # Uma requisição, com o schema de lista e as vagas identificadas no texto
+    [(text, config)] = analyzer.client.models.calls
+    assert config is analyzer.pack_generation_config
+    assert config.response_schema.type == gemini_analyzer.types.Type.ARRAY
+    assert 'id_vaga' in config.response_schema.items.required
+    assert [f"=== ID_VAGA: {n} ===" in text for n in (1, 2, 3)] == [True] * 3
+
+
+def test_missing_duplicate_and_incomplete_items_are_left_out(analyzer):
+    items = [
+        {"id_vaga": "1", "pontuacao_requisitos": 10, "pontuacao_responsabilidades": 1, "pontos_fracos": "a"},
+        {"id_vaga": "1", "pontuacao_requisitos": 99, "pontuacao_responsabilidades": 1, "pontos_fracos": "b"},
+        {"id_vaga": "2", "pontuacao_requisitos": 20},
+        {"id_vaga": "7", "pontuacao_requisitos": 70, "pontuacao_responsabilidades": 1, "pontos_fracos": "c"},
+        {"id_vaga": "x", "pontuacao_requisitos": 0, "pontuacao_responsabilidades": 1, "pontos_fracos": "d"},
+    ]
+    analyzer.client.models.respond = lambda text, config: json.dumps(items)
+
+    results = analyzer.analyze_job_pack(make_jobs(3))
+
+    assert results[0]['nota_requisitos'] == 10
+    assert results[1:] == [None, None]
+
+
+def test_unusable_pack_response_gives_no_results(analyzer):
+    analyzer.client.models.respond = lambda text, config: json.dumps({"pontuacao_requisitos": 1})
+    assert analyzer.analyze_job_pack(make_jobs(2)) == [None, None]
+
+    def fail(text, config):
+        raise RuntimeError("cota excedida")
+
+    analyzer.client.models.respond = fail
+    assert analyzer.analyze_job_pack(make_jobs(2)) == [None, None]
+
+
+def test_jobs_missing_from_the_pack_are_analyzed_individually(analyzer):
+    analyzer.client.models.respond = _pack_response(lambda job_id: None if job_id == 2 else job_id * 10)
+
+    results = analyzer.analyze_jobs_batch(make_jobs(3), delay_between_calls=0, max_concurrency=1, pack_size=3)
+
+    assert [result['nota_requisitos'] for result in results] == [10, 50, 30]
+    assert results[1]['pontos_fracos'] == 'Individual'
+    assert len(analyzer.client.models.calls) == 2
+
+
+def test_batch_is_split_by_pack_size_and_token_budget(analyzer, monkeypatch):
+    analyzer.client.models.respond = _pack_response(lambda job_id: job_id)
+
+    results = analyzer.analyze_jobs_batch(make_jobs(7), delay_between_calls=0, max_concurrency=1, pack_size=3)
+    pack_sizes = [len(re.findall(r"=== ID_VAGA", text)) for text, _ in analyzer.client.models.calls]
+
+    assert None not in results and not any('error' in result for result in results)
+    # 3 + 3 + 1: a última vaga sozinha vai como análise individual
+    assert pack_sizes == [3, 3, 0]
+
+    analyzer.client.models.calls.clear()
+    jobs = make_jobs(4, prefix='Outra')
+    monkeypatch.setattr(gemini_analyzer, 'GEMINI_PACK_MAX_TOKENS', 2 * analyzer._pack_tokens(dict(jobs[0])) + 1)
+    analyzer.analyze_jobs_batch(jobs, delay_between_calls=0, max_concurrency=1, pack_size=4)
+    pack_sizes = [len(re.findall(r"=== ID_VAGA", text)) for text, _ in analyzer.client.models.calls]
+
+    assert pack_sizes == [2, 2]
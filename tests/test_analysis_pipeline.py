@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+
+import gemini_analyzer
+from conftest import make_jobs
+
+
+def _join_with_timeout(pipeline, timeout=10):
+    """join em outra thread, para que um dispatcher travado falhe o teste em vez de travá-lo"""
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.setdefault('results', pipeline.join()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "join não terminou"
+    return outcome['results']
+
+
+def test_results_keep_input_order(analyzer):
+    jobs = make_jobs(6)
+    pipeline = analyzer.start_pipeline(delay_between_calls=0, max_concurrency=3)
+    for job_data in jobs:
+        pipeline.put(job_data)
+    pipeline.close()
+    results = _join_with_timeout(pipeline)
+
+    assert [result['job_link'] for result in results] == [job['link'] for job in jobs]
+    assert pipeline.requests == 6
+
+
+def test_dispatcher_failure_errors_pending_jobs_and_raises_on_put(analyzer, monkeypatch):
+    lookups = []
+
+    def failing_lookup(job_data):
+        lookups.append(job_data)
+        if len(lookups) == 3:
+            raise ValueError("cache quebrado")
+        return None
+
+    monkeypatch.setattr(analyzer, 'cached_analysis', failing_lookup)
+    monkeypatch.setattr(gemini_analyzer, 'GEMINI_PIPELINE_QUEUE_SIZE', 2)
+    pipeline = analyzer.start_pipeline(delay_between_calls=0, max_concurrency=2)
+
+    with pytest.raises(RuntimeError, match="cache quebrado"):
+        for job_data in make_jobs(50):
+            pipeline.put(job_data)
+    with pytest.raises(RuntimeError):
+        pipeline.close()
+    results = _join_with_timeout(pipeline)
+
+    assert None not in results
+    assert any('error' in result and 'cache quebrado' in result['error'] for result in results)
+    assert len(results) == pipeline.submitted
+
+
+def test_failure_after_end_does_not_hang_join(analyzer, monkeypatch):
+    def failing_submit(self, unit):
+        raise RuntimeError("executor indisponível")
+
+    monkeypatch.setattr(gemini_analyzer.AnalysisPipeline, '_submit', failing_submit)
+    # Pacotes de 3: as duas vagas só são enviadas no último pacote, depois de _END
+    pipeline = analyzer.start_pipeline(delay_between_calls=0, max_concurrency=2, pack_size=3)
+    for job_data in make_jobs(2):
+        pipeline.put(job_data)
+    try:
+        pipeline.close()
+    except RuntimeError:
+        pass
+    results = _join_with_timeout(pipeline)
+
+    assert len(results) == 2
+    assert all('executor indisponível' in result['error'] for result in results)
+
+
+def test_progress_callback_failure_does_not_lose_results(analyzer):
+    def broken_progress(current, total, message):
+        raise ValueError("interface fechada")
+
+    pipeline = analyzer.start_pipeline(delay_between_calls=0, max_concurrency=2, progress_callback=broken_progress)
+    for job_data in make_jobs(4):
+        pipeline.put(job_data)
+    pipeline.close()
+    results = _join_with_timeout(pipeline)
+
+    assert len(results) == 4
+    assert all('error' not in result for result in results)
+
+
+def test_progress_callback_failure_during_error_handling(analyzer, monkeypatch):
+    def failing_lookup(job_data):
+        raise ValueError("cache quebrado")
+
+    def broken_progress(current, total, message):
+        raise ValueError("interface fechada")
+
+    monkeypatch.setattr(analyzer, 'cached_analysis', failing_lookup)
+    pipeline = analyzer.start_pipeline(delay_between_calls=0, max_concurrency=2, progress_callback=broken_progress)
+    pipeline.put(make_jobs(1)[0])
+    for job_data in make_jobs(3, prefix='Outra'):
+        try:
+            pipeline.put(job_data)
+        except RuntimeError:
+            break
+    try:
+        pipeline.close()
+    except RuntimeError:
+        pass
+    results = _join_with_timeout(pipeline)
+
+    assert results and None not in results
+    assert all('error' in result for result in results)
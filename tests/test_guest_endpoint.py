@@ -0,0 +1,48 @@
+from conftest import JOB_ID
+
+FIELDS = ('company_name', 'job_title', 'job_description', 'city', 'announced_at')
+
+
+def _guest_url_template(server):
+    return f"{server.base_url}/jobs-guest/jobs/api/jobPosting/{{job_id}}"
+
+
+def test_guest_fragment_gives_the_same_fields_as_the_full_page(standin, direct_fetch, monkeypatch):
+    scraper = direct_fetch
+    monkeypatch.setattr(scraper, 'LINKEDIN_GUEST_JOB_URL', _guest_url_template(standin))
+
+    page = scraper.extract_company_info(standin.job_url(), fetch_mode='page')
+    guest = scraper.extract_company_info(standin.job_url(), fetch_mode='guest')
+
+    assert page['company_name'] == 'NEORIS'
+    assert {field: guest[field] for field in FIELDS} == {field: page[field] for field in FIELDS}
+    # O modo guest não baixou a página completa
+    assert standin.paths[-1] == f"/jobs-guest/jobs/api/jobPosting/{JOB_ID}"
+    stats = scraper.scrape_stats.snapshot()
+    assert stats['guest_fetches'] == 1
+    assert 'guest_fallbacks' not in stats
+
+
+def test_guest_fragment_without_description_falls_back_to_full_page(
+        standin_guest_missing_description, direct_fetch, monkeypatch):
+    scraper = direct_fetch
+    server = standin_guest_missing_description
+    monkeypatch.setattr(scraper, 'LINKEDIN_GUEST_JOB_URL', _guest_url_template(server))
+
+    result = scraper.extract_company_info(server.job_url(), fetch_mode='guest')
+
+    assert server.paths == [f"/jobs-guest/jobs/api/jobPosting/{JOB_ID}", f"/jobs/view/{JOB_ID}"]
+    assert result['company_name'] == 'NEORIS'
+    assert result['job_description'] not in (None, 'Not found')
+    assert scraper.scrape_stats.snapshot()['guest_fallbacks'] == 1
+
+
+def test_guest_http_error_falls_back_to_full_page(standin, direct_fetch, monkeypatch):
+    scraper = direct_fetch
+    monkeypatch.setattr(scraper, 'LINKEDIN_GUEST_JOB_URL', _guest_url_template(standin))
+    standin.fail(f"/jobs-guest/jobs/api/jobPosting/{JOB_ID}", times=1, status=500)
+
+    result = scraper.extract_company_info(standin.job_url(), fetch_mode='guest')
+
+    assert standin.paths == [f"/jobs-guest/jobs/api/jobPosting/{JOB_ID}", f"/jobs/view/{JOB_ID}"]
+    assert result['company_name'] == 'NEORIS'
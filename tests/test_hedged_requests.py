@@ -0,0 +1,107 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+
+class DelayedSession(requests.Session):
+    """Sessão que espera antes de cada requisição, como um proxy lento"""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def get(self, *args, **kwargs):
+        time.sleep(self.delay)
+        return super().get(*args, **kwargs)
+
+
+@pytest.fixture
+def hedging(direct_fetch, monkeypatch):
+    """
+    Requisições hedged com dois proxies simulados: 'lento' (o primeiro sorteado) e
+    'rapido'. Registra os proxies evitados em cada escolha e as sessões devolvidas.
+    """
+    scraper = direct_fetch
+    picks = []
+    released = []
+    delays = {'lento': 1.0, 'rapido': 0.0}
+    pick_delay = [0.0]  # espera na primeira escolha de proxy (ex.: aquecimento do pool)
+    lock = threading.Lock()
+
+    def get_session_with_proxy(avoid=()):
+        with lock:
+            wait, pick_delay[0] = pick_delay[0], 0.0
+        time.sleep(wait)
+        proxy = next(name for name in delays if name not in avoid)
+        with lock:
+            picks.append((set(avoid), proxy))
+        return DelayedSession(delays[proxy]), proxy
+
+    def release_session(proxy, session, reusable=True):
+        with lock:
+            released.append(proxy)
+        session.close()
+
+    monkeypatch.setattr(scraper.proxy_manager, 'get_session_with_proxy', get_session_with_proxy)
+    monkeypatch.setattr(scraper.proxy_manager, 'release_session', release_session)
+    monkeypatch.setattr(scraper, 'HEDGED_REQUESTS', True)
+    monkeypatch.setattr(scraper.latency_tracker, 'hedge_delay', lambda: 0.1)
+    monkeypatch.setattr(scraper.latency_tracker, 'try_acquire_hedge', lambda: True)
+    return SimpleNamespace(scraper=scraper, picks=picks, released=released, delays=delays, pick_delay=pick_delay)
+
+
+def test_slow_primary_is_hedged_through_another_proxy(standin, hedging):
+    scraper, picks, released = hedging.scraper, hedging.picks, hedging.released
+
+    started = time.time()
+    response, _ = scraper._fetch_page(standin.job_url())
+
+    assert response.status_code == 200
+    assert time.time() - started < 0.9
+    # A cópia evitou o proxy já escolhido para a original
+    assert picks == [(set(), 'lento'), ({'lento'}, 'rapido')]
+    stats = scraper.scrape_stats.snapshot()
+    assert stats['hedges_sent'] == 1
+    assert stats['hedges_won'] == 1
+
+    # A original perdedora termina depois, e sua sessão também volta ao pool
+    deadline = time.time() + 3
+    while 'lento' not in released and time.time() < deadline:
+        time.sleep(0.05)
+    assert sorted(released) == ['lento', 'rapido']
+
+
+def test_hedge_avoids_primary_proxy_even_when_its_choice_is_slow(standin, hedging):
+    scraper, picks = hedging.scraper, hedging.picks
+    # A escolha do proxy da original demora mais que a espera da cópia
+    hedging.pick_delay[0] = 0.3
+
+    response, _ = scraper._fetch_page(standin.job_url())
+
+    assert response.status_code == 200
+    assert picks == [(set(), 'lento'), ({'lento'}, 'rapido')]
+
+
+def test_fast_primary_is_not_hedged(standin, hedging):
+    scraper, picks = hedging.scraper, hedging.picks
+    hedging.delays['lento'] = 0.0
+
+    response, _ = scraper._fetch_page(standin.job_url())
+
+    assert response.status_code == 200
+    assert picks == [(set(), 'lento')]
+    assert 'hedges_sent' not in scraper.scrape_stats.snapshot()
+
+
+def test_last_attempt_is_never_hedged(standin, hedging):
+    scraper, picks = hedging.scraper, hedging.picks
+
+    response, _ = scraper._fetch_page(standin.job_url(), attempt=scraper.FETCH_MAX_ATTEMPTS - 1)
+
+    assert response.status_code == 200
+    # Última tentativa: conexão direta, sem sorteio de proxy
+    assert picks == []
+    assert 'hedges_sent' not in scraper.scrape_stats.snapshot()
@@ -0,0 +1,51 @@
+import random
+
+import page_archive
+from page_archive import KIND_GUEST, KIND_PAGE, PageArchive
+
+
+def test_two_instances_share_one_directory(tmp_path):
+    first, second = PageArchive(str(tmp_path)), PageArchive(str(tmp_path))
+    expected = {}
+    for job_id in range(1, 21):
+        writer = first if job_id % 2 else second
+        html_text = f"<html>vaga {job_id}</html>"
+        assert writer.append(job_id, html_text, KIND_PAGE if job_id % 3 else KIND_GUEST)
+        expected[job_id] = html_text
+    # Nova versão de uma vaga gravada pela outra instância: a mais recente prevalece
+    second.append(1, "<html>vaga 1 v2</html>")
+    expected[1] = "<html>vaga 1 v2</html>"
+
+    for archive in (first, second, PageArchive(str(tmp_path))):
+        for job_id, html_text in expected.items():
+            assert archive.get(job_id)[0] == html_text
+    third = PageArchive(str(tmp_path))
+    assert sorted(third.job_ids()) == sorted(expected)
+    assert third.get(3)[2] == KIND_GUEST
+
+
+def test_append_stops_at_the_size_limit(tmp_path):
+    archive = PageArchive(str(tmp_path), max_bytes=2000)
+    # Conteúdo aleatório: não comprime, cerca de 1,2 KB por página
+    body = "<html>" + random.Random(1).randbytes(600).hex() + "</html>"
+    results = [archive.append(job_id, body) for job_id in range(1, 10)]
+    assert results[0] and not results[-1]
+    assert archive.full
+
+
+def test_compact_keeps_latest_versions_and_respects_max_bytes(tmp_path):
+    archive = PageArchive(str(tmp_path), max_bytes=0)
+    for version in range(3):
+        for job_id in (1, 2, 3):
+            archive.append(job_id, f"<html>vaga {job_id} versão {version}</html>", stored_at=100 + version * 10 + job_id)
+    archive.close()
+
+    kept, before, after = page_archive.compact(str(tmp_path))
+    assert kept == 3 and after < before
+    compacted = PageArchive(str(tmp_path))
+    assert compacted.get(2)[0] == "<html>vaga 2 versão 2</html>"
+
+    entry_size = compacted.entry(3)[1]
+    kept, _, _ = page_archive.compact(str(tmp_path), max_bytes=entry_size * 2)
+    # As vagas gravadas há mais tempo ficam de fora
+    assert sorted(PageArchive(str(tmp_path)).job_ids()) == [2, 3]
@@ -0,0 +1,122 @@
+from concurrent.futures import Future
+
+import pytest
+
+import linkedin_scraper
+from conftest import SAMPLE_PAGE
+from extraction_plan import get_extraction_plan
+
+URL = 'https://www.linkedin.com/jobs/view/4197948497'
+
+
+@pytest.fixture
+def raw_page():
+    with open(SAMPLE_PAGE, 'rb') as f:
+        return linkedin_scraper.RawPage(f.read(), 'utf-8')
+
+
+@pytest.fixture
+def parse_pool(monkeypatch):
+    """Pool de parse com um processo, criado para o teste e encerrado ao fim"""
+    monkeypatch.setattr(linkedin_scraper, 'PARSE_WORKERS', 1)
+    monkeypatch.setattr(linkedin_scraper, 'PARSE_QUEUE_SIZE', 2)
+    monkeypatch.setattr(linkedin_scraper, '_parse_pool', None)
+    monkeypatch.setattr(linkedin_scraper, '_parse_slots', None)
+    yield
+    if linkedin_scraper._parse_pool is not None:
+        linkedin_scraper._parse_pool.shutdown()
+
+
+@pytest.fixture
+def plan_order():
+    """Restaura a ordem dos extratores do plano depois do teste"""
+    plan = get_extraction_plan()
+    state = plan.order_state()
+    yield plan
+    plan.apply_order(*state)
+
+
+def test_then_chains_result_and_errors():
+    source = Future()
+    chained = linkedin_scraper._then(source, lambda done: done.result() * 2)
+    assert not chained.done()
+    source.set_result(21)
+    assert chained.result(timeout=1) == 42
+
+    failed = Future()
+    chained = linkedin_scraper._then(failed, lambda done: done.result())
+    failed.set_exception(ValueError('parse'))
+    with pytest.raises(ValueError):
+        chained.result(timeout=1)
+
+
+def test_then_on_finished_future_runs_callback_immediately():
+    source = Future()
+    source.set_result('ok')
+    assert linkedin_scraper._then(source, lambda done: done.result().upper()).result(timeout=0) == 'OK'
+
+
+def test_pool_parse_matches_inline_parse(raw_page, parse_pool):
+    expected = linkedin_scraper._parse_inline(raw_page, URL)[1]
+    plan = get_extraction_plan()
+    pages_before = plan.pages
+
+    refreshed, parsed = linkedin_scraper._submit_parse(raw_page, URL).result(timeout=60)
+
+    assert refreshed is None
+    assert parsed == expected
+    # O trace do processo de parse foi contabilizado no plano deste processo
+    assert plan.pages == pages_before + 1
+    # A vaga na fila limitada foi devolvida
+    slots = linkedin_scraper._parse_slots
+    assert all(slots.acquire(blocking=False) for _ in range(linkedin_scraper.PARSE_QUEUE_SIZE))
+
+
+def test_pool_refresh_with_same_hash(raw_page, parse_pool):
+    _, parsed = linkedin_scraper._parse_inline(raw_page, URL)
+
+    refreshed, reparsed = linkedin_scraper._submit_parse(
+        raw_page, URL, previous_hash=parsed['description_hash']).result(timeout=60)
+
+    assert refreshed['description_hash'] == parsed['description_hash']
+    assert reparsed is None
+
+
+def test_deferred_extraction_returns_future(standin, direct_fetch, parse_pool):
+    result = direct_fetch.extract_company_info(standin.job_url(), fetch_mode='page', deferred=True)
+
+    assert isinstance(result, Future)
+    assert result.result(timeout=60)['company_name'] == 'NEORIS'
+
+
+def test_traces_from_another_plan_version_are_dropped(plan_order):
+    plan = plan_order
+    pages_before = plan.pages
+    _, trace = plan.extract(linkedin_scraper._load_tree('<html><body></body></html>'))
+
+    linkedin_scraper._record_worker_traces('outra-versao', [trace])
+    assert plan.pages == pages_before
+    linkedin_scraper._record_worker_traces(plan.version, [trace])
+    assert plan.pages == pages_before + 1
+
+
+def test_worker_adopts_main_process_order(raw_page, plan_order, monkeypatch):
+    # Como no processo de parse (_init_parse_worker): traces guardados para o processo principal
+    monkeypatch.setattr(linkedin_scraper, '_pending_traces', [])
+    plan = plan_order
+    pages_before = plan.pages
+    version, orders = plan.order_state()
+    name = next(name for name, order in orders.items() if len(order) > 1)
+    reversed_orders = dict(orders, **{name: list(reversed(orders[name]))})
+
+    _, parsed, used_version, traces = linkedin_scraper._parse_in_worker(raw_page, URL, False, None,
+                                                                        (version, reversed_orders))
+
+    assert used_version == version
+    assert parsed['company_name'] == 'NEORIS'
+    assert len(traces) == 1
+    assert plan.pages == pages_before
+    assert plan.order_state()[1][name] == reversed_orders[name]
+    # Ordem de outra versão do plano: ignorada
+    assert plan.apply_order('outra-versao', orders) is False
+    assert plan.order_state()[1][name] == reversed_orders[name]
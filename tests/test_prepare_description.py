@@ -0,0 +1,66 @@
+import gemini_analyzer
+from gemini_analyzer import JobAnalyzer, prepare_description
+
+
+def test_boilerplate_section_is_removed_until_content_heading():
+    description = (
+        "Desenvolvedor Python<br><br>Benefícios<br><br>Vale-refeição<br><br>Plano de saúde"
+        "<br><br>Requisitos<br><br>Experiência com Django."
+    )
+    text, original_tokens, final_tokens = prepare_description(description, max_tokens=0)
+    assert text == "Desenvolvedor Python\n\nRequisitos\n\nExperiência com Django."
+    assert final_tokens < original_tokens
+
+
+def test_boilerplate_heading_merged_with_requirements_keeps_block():
+    description = (
+        "About us<br>We are a software company founded in 1990.<br>Requirements: 5+ years of Python"
+        "<br><br>Responsibilities<br><br>Build APIs."
+    )
+    text, _, _ = prepare_description(description, max_tokens=0)
+    assert "Requirements: 5+ years of Python" in text
+    assert text.startswith("About us\n")
+    assert text.endswith("Responsibilities\n\nBuild APIs.")
+
+
+def test_requirements_inline_in_boilerplate_paragraph_keeps_block():
+    description = (
+        "About us<br><br>We are great. Requirements: 5+ years of Python and Django."
+        "<br><br>Equal opportunity employer."
+    )
+    text, _, _ = prepare_description(description, max_tokens=0)
+    assert text == "We are great. Requirements: 5+ years of Python and Django."
+
+
+def test_section_after_merged_block_is_kept():
+    description = (
+        "Sobre nós<br>Somos uma fintech.<br>Responsabilidades:<br>Manter as APIs"
+        "<br><br>Trabalho em equipe com o time de dados."
+    )
+    text, _, _ = prepare_description(description, max_tokens=0)
+    assert "Manter as APIs" in text
+    assert "Trabalho em equipe com o time de dados." in text
+
+
+def test_token_limit_truncates_at_sentence():
+    description = "<br><br>".join(f"Parágrafo {n}. Texto da vaga com detalhes." for n in range(200))
+    text, original_tokens, final_tokens = prepare_description(description, max_tokens=100)
+    assert final_tokens <= 100 + len(gemini_analyzer.TRUNCATION_MARK)
+    assert final_tokens < original_tokens
+    assert text.endswith(gemini_analyzer.TRUNCATION_MARK.strip())
+
+
+def test_description_is_prepared_once_per_job(monkeypatch):
+    calls = []
+
+    def counting_prepare(description, max_tokens=None):
+        calls.append(description)
+        return prepare_description(description, max_tokens)
+
+    monkeypatch.setattr(gemini_analyzer, 'prepare_description', counting_prepare)
+    job_data = {'job_title': 'Dev', 'company_name': 'ACME', 'job_description': 'Requisitos<br><br>Python'}
+    first = JobAnalyzer._prepare_job(job_data)
+    second = JobAnalyzer._prepare_job(job_data)
+    assert first == second == "Requisitos\n\nPython"
+    assert len(calls) == 1
+    assert job_data['clean_description_tokens'] <= job_data['description_tokens']
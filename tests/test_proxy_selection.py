@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+import linkedin_scraper
+from linkedin_scraper import ProxyManager, ProxyStats, WeightedIndex
+
+
+def test_weighted_index_samples_proportionally_to_weight():
+    index = WeightedIndex()
+    for weight in (1.0, 0.0, 3.0, 0.0):
+        index.append(weight)
+    random.seed(1234)
+    counts = [0] * len(index)
+    for _ in range(20000):
+        counts[index.sample()] += 1
+
+    assert counts[1] == counts[3] == 0
+    assert counts[2] / counts[0] == pytest.approx(3.0, rel=0.1)
+
+
+def test_weighted_index_update_changes_sampling_and_total():
+    random.seed(99)
+    weights = [random.uniform(0, 5) for _ in range(37)]
+    index = WeightedIndex()
+    for weight in weights:
+        index.append(weight)
+    for position in random.sample(range(len(weights)), 15):
+        weights[position] = random.choice((0.0, random.uniform(0, 5)))
+        index.update(position, weights[position])
+
+    assert index.total() == pytest.approx(sum(weights))
+    for prefix in range(len(weights) + 1):
+        assert index._prefix_sum(prefix) == pytest.approx(sum(weights[:prefix]))
+
+    for position in range(len(weights)):
+        index.update(position, 0.0)
+    index.update(7, 2.0)
+    assert {index.sample() for _ in range(200)} == {7}
+    index.update(7, 0.0)
+    assert index.sample() is None
+
+
+def test_proxy_weight_prefers_fast_reliable_proxies_and_skips_cooldown():
+    fast, slow = ProxyStats('fast'), ProxyStats('slow')
+    fast.record_success(0.5)
+    slow.record_success(4.0)
+    assert fast.weight() > slow.weight() > 0
+
+    slow.record_failure()
+    assert slow.weight() == 0.0
+    assert slow.weight(now=slow.cooldown_until + 1) > 0
+    for _ in range(linkedin_scraper.PROXY_MAX_CONSECUTIVE_FAILURES):
+        slow.record_failure()
+    assert slow.is_dead
+    assert slow.weight(now=slow.cooldown_until + 1) == 0.0
+
+
+def test_failed_proxy_leaves_the_draw_until_its_cooldown_ends(monkeypatch):
+    manager = ProxyManager()
+    manager.ready.set()
+    manager.last_update = 10 ** 12  # Sem atualização da lista em segundo plano
+    monkeypatch.setattr(manager, 'refresh_in_background', lambda: None)
+    for proxy in ('http://a', 'http://b'):
+        manager._promote(proxy, 1.0)
+
+    manager.report_failure('http://a')
+    assert manager.available == 1
+    assert {manager.get_random_proxy() for _ in range(50)} == {'http://b'}
+
+    # Fim da quarentena: o proxy volta ao sorteio
+    cooldown_until = manager.stats['http://a'].cooldown_until
+    monkeypatch.setattr(linkedin_scraper.time, 'time', lambda: cooldown_until + 1)
+    manager.get_random_proxy()
+    assert manager.available == 2
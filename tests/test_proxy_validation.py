@@ -0,0 +1,88 @@
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import linkedin_scraper
+from linkedin_scraper import ProxyManager
+
+
+class ForwardingProxy:
+    """Proxy HTTP mínimo: repassa o GET (URL absoluta) e devolve a resposta, ou sempre `status`"""
+
+    def __init__(self, status=None):
+        proxy = self
+        self.requested = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                proxy.requested.append(self.path)
+                if status:
+                    self.send_error(status)
+                    return
+                with urllib.request.urlopen(self.path, timeout=5) as response:
+                    body = response.read()
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def proxies():
+    working, forbidden = ForwardingProxy(), ForwardingProxy(status=403)
+    yield working, forbidden
+    working.close()
+    forbidden.close()
+
+
+def _closed_port_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), BaseHTTPRequestHandler)
+    port = server.server_address[1]
+    server.server_close()
+    return f"http://127.0.0.1:{port}"
+
+
+def test_proxy_validation_against_local_check_url(standin, proxies, monkeypatch):
+    working, forbidden = proxies
+    unreachable = _closed_port_url()
+    check_url = standin.job_url()
+    manager = ProxyManager(check_url=check_url)
+    monkeypatch.setattr(manager, '_fetch_candidate_proxies', lambda: [working.url, forbidden.url, unreachable])
+    monkeypatch.setattr(linkedin_scraper, 'PROXY_VALIDATION_TIMEOUT', 2)
+
+    manager.update_proxy_list()
+
+    assert manager.proxies == [working.url]
+    assert manager.available == 1
+    assert set(manager.rejected) == {forbidden.url, unreachable}
+    # A verificação passou pelo proxy até o servidor local
+    assert working.requested == [check_url]
+    assert standin.paths == ['/jobs/view/4197948497']
+    assert manager.stats[working.url].ewma_latency is not None
+    assert manager.ready.is_set()
+
+
+def test_rejected_candidates_are_not_probed_again(standin, proxies, monkeypatch):
+    working, forbidden = proxies
+    manager = ProxyManager(check_url=standin.job_url())
+    monkeypatch.setattr(manager, '_fetch_candidate_proxies', lambda: [working.url, forbidden.url])
+
+    manager.update_proxy_list()
+    manager.update_proxy_list()
+
+    assert len(forbidden.requested) == 1
+    assert len(working.requested) == 1
+    assert manager.proxies == [working.url]
@@ -0,0 +1,65 @@
+import pytest
+
+import linkedin_scraper
+from linkedin_scraper import RateController
+
+
+def test_rate_controller_additive_increase_up_to_maximum(monkeypatch):
+    monkeypatch.setattr(linkedin_scraper, 'PROXY_RATE_INITIAL', 0.5)
+    monkeypatch.setattr(linkedin_scraper, 'PROXY_RATE_STEP', 0.1)
+    monkeypatch.setattr(linkedin_scraper, 'PROXY_RATE_LIMITS', (0.1, 1.0))
+    rates = RateController()
+
+    for _ in range(3):
+        rates.record('proxy-a', throttled=False)
+    assert rates.proxy_rates['proxy-a'].rate == pytest.approx(0.8)
+    assert rates.current_rate() == pytest.approx(linkedin_scraper.GLOBAL_RATE_INITIAL
+                                                 + 3 * linkedin_scraper.GLOBAL_RATE_STEP)
+
+    for _ in range(10):
+        rates.record('proxy-a', throttled=False)
+    assert rates.proxy_rates['proxy-a'].rate == pytest.approx(1.0)
+    # Outros proxies seguem com a própria taxa
+    rates.record('proxy-b', throttled=False)
+    assert rates.proxy_rates['proxy-b'].rate == pytest.approx(0.6)
+
+
+def test_rate_controller_multiplicative_decrease_with_holdoff(monkeypatch):
+    monkeypatch.setattr(linkedin_scraper, 'PROXY_RATE_INITIAL', 0.8)
+    monkeypatch.setattr(linkedin_scraper, 'PROXY_RATE_LIMITS', (0.1, 1.0))
+    monkeypatch.setattr(linkedin_scraper, 'RATE_DECREASE_HOLDOFF', 10.0)
+    clock = [1000.0]
+    monkeypatch.setattr(linkedin_scraper.time, 'time', lambda: clock[0])
+    rates = RateController()
+    global_initial = rates.current_rate()
+
+    rates.record('proxy-a', throttled=True)
+    assert rates.proxy_rates['proxy-a'].rate == pytest.approx(0.4)
+    assert rates.current_rate() == pytest.approx(global_initial * linkedin_scraper.RATE_DECREASE_FACTOR)
+    # Requisições já reservadas são adiadas para o novo ritmo
+    assert rates.next_global_at > clock[0]
+
+    # Uma rajada de bloqueios dentro do holdoff conta como uma redução só
+    clock[0] += 1
+    rates.record('proxy-a', throttled=True)
+    assert rates.proxy_rates['proxy-a'].rate == pytest.approx(0.4)
+
+    for _ in range(5):
+        clock[0] += 11
+        rates.record('proxy-a', throttled=True)
+    assert rates.proxy_rates['proxy-a'].rate == pytest.approx(0.1)
+
+
+def test_rate_controller_spaces_reservations_per_proxy(monkeypatch):
+    monkeypatch.setattr(linkedin_scraper, 'RATE_JITTER', (1.0, 1.0))
+    monkeypatch.setattr(linkedin_scraper, 'PROXY_RATE_INITIAL', 0.5)
+    monkeypatch.setattr(linkedin_scraper, 'GLOBAL_RATE_INITIAL', 10.0)
+    monkeypatch.setattr(linkedin_scraper, 'GLOBAL_RATE_LIMITS', (0.2, 10.0))
+    clock = [1000.0]
+    monkeypatch.setattr(linkedin_scraper.time, 'time', lambda: clock[0])
+    rates = RateController()
+
+    assert rates.reserve('proxy-a') == 0
+    # Outro proxy: só o intervalo global (1 / 10 req/s); mesmo proxy: o intervalo dele (1 / 0.5 req/s)
+    assert rates.reserve('proxy-b') == pytest.approx(0.1)
+    assert rates.reserve('proxy-a') == pytest.approx(2.0)
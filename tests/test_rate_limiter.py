@@ -0,0 +1,78 @@
+import threading
+import time
+
+from gemini_analyzer import GeminiRateLimiter, TokenBucket
+
+
+def test_bucket_starts_full_then_waits_for_refill():
+    bucket = TokenBucket(capacity=2, rate=20)
+    started = time.monotonic()
+    bucket.acquire()
+    bucket.acquire()
+    assert time.monotonic() - started < 0.02
+    bucket.acquire()
+    # Uma ficha a 20 fichas/s: cerca de 50 ms
+    assert 0.03 < time.monotonic() - started < 0.5
+
+
+def test_request_larger_than_capacity_is_capped():
+    bucket = TokenBucket(capacity=5, rate=1000)
+    started = time.monotonic()
+    bucket.acquire(50)
+    assert time.monotonic() - started < 0.05
+    assert bucket.tokens < 1
+
+
+def test_zero_rate_or_capacity_is_unlimited():
+    for bucket in (TokenBucket(capacity=10, rate=0), TokenBucket(capacity=0, rate=10)):
+        assert bucket.unlimited
+        started = time.monotonic()
+        for _ in range(1000):
+            bucket.acquire(100)
+        bucket.adjust(-10 ** 6)
+        assert time.monotonic() - started < 0.1
+
+
+def test_adjust_refunds_and_charges_tokens():
+    bucket = TokenBucket(capacity=100, rate=0.001)
+    bucket.acquire(80)
+    bucket.adjust(30)
+    assert 49 < bucket.tokens < 51
+    bucket.adjust(-70)
+    # O saldo pode ficar negativo; a devolução nunca passa da capacidade
+    assert bucket.tokens < -19
+    bucket.adjust(1000)
+    assert bucket.tokens == 100
+
+
+def test_refund_wakes_waiting_thread():
+    bucket = TokenBucket(capacity=10, rate=0.01)
+    bucket.acquire(10)
+    acquired = threading.Event()
+    waiter = threading.Thread(target=lambda: (bucket.acquire(5), acquired.set()))
+    waiter.start()
+    assert not acquired.wait(0.1)
+    bucket.adjust(5)
+    assert acquired.wait(1)
+    waiter.join()
+
+
+def test_limiter_paces_requests_per_minute():
+    # 1200 RPM = 20 requisições/s, com rajada inicial de até 1200
+    limiter = GeminiRateLimiter(rpm=1200, tpm=0)
+    limiter.requests.tokens = 1
+    started = time.monotonic()
+    limiter.acquire(10 ** 6)
+    limiter.acquire(10 ** 6)
+    assert 0.03 < time.monotonic() - started < 0.5
+
+
+def test_limiter_settles_tokens_with_actual_usage():
+    limiter = GeminiRateLimiter(rpm=0, tpm=6000)
+    limiter.acquire(1000)
+    limiter.settle(1000, 400)
+    assert 5599 < limiter.tokens.tokens <= 6000
+    limiter.settle(1000, None)
+    assert 5599 < limiter.tokens.tokens <= 6000
+    limiter.settle(1000, 3000)
+    assert 3599 < limiter.tokens.tokens < 3700
@@ -0,0 +1,82 @@
+import pytest
+
+from conftest import JOB_ID
+
+
+def _previous(result):
+    """Estado gravado de uma extração (como o JobSnapshot devolve para o modo de atualização)"""
+    return {
+        'etag': result.get('etag'),
+        'last_modified': result.get('last_modified'),
+        'description_hash': result['description_hash'],
+        'row': {key: value for key, value in result.items()
+                if key not in ('etag', 'last_modified', 'description_hash')},
+    }
+
+
+@pytest.fixture
+def first_scrape(standin, direct_fetch):
+    standin.page_etag = '"v1"'
+    result = direct_fetch.extract_company_info(standin.job_url(), fetch_mode='page')
+    assert result['etag'] == '"v1"'
+    assert result['description_hash']
+    return result
+
+
+def test_not_modified_page_keeps_previous_row_and_validators(standin, direct_fetch, first_scrape):
+    result = direct_fetch.extract_company_info(standin.job_url(), fetch_mode='page',
+                                               previous=_previous(first_scrape))
+
+    assert standin.conditional[-1] == '"v1"'
+    assert result['unchanged'] is True
+    assert result['etag'] == '"v1"'
+    assert result['job_description'] == first_scrape['job_description']
+    assert direct_fetch.scrape_stats.snapshot()['not_modified'] == 1
+
+
+def test_same_description_with_new_etag_is_unchanged(standin, direct_fetch, first_scrape):
+    standin.page_etag = '"v2"'
+
+    result = direct_fetch.extract_company_info(standin.job_url(), fetch_mode='page',
+                                               previous=_previous(first_scrape))
+
+    assert result['unchanged'] is True
+    assert result['etag'] == '"v2"'
+    assert 'not_modified' not in direct_fetch.scrape_stats.snapshot()
+
+
+def test_changed_description_is_parsed_again(standin, direct_fetch, first_scrape):
+    previous = dict(_previous(first_scrape), description_hash='outro')
+    standin.page_etag = '"v2"'
+
+    result = direct_fetch.extract_company_info(standin.job_url(), fetch_mode='page', previous=previous)
+
+    assert not result.get('unchanged')
+    assert result['description_hash'] == first_scrape['description_hash']
+    assert result['etag'] == '"v2"'
+
+
+def test_page_without_validators_keeps_previous_ones(standin, direct_fetch, first_scrape):
+    previous = dict(_previous(first_scrape), last_modified='Mon, 01 Sep 2025 10:00:00 GMT')
+    standin.page_etag = None
+
+    result = direct_fetch.extract_company_info(standin.job_url(), fetch_mode='page', previous=previous)
+
+    assert result['etag'] == '"v1"'
+    assert result['last_modified'] == 'Mon, 01 Sep 2025 10:00:00 GMT'
+
+
+@pytest.mark.parametrize('description_hash', ['same', 'outro'])
+def test_guest_refresh_keeps_page_validators(standin, direct_fetch, first_scrape, monkeypatch, description_hash):
+    monkeypatch.setattr(direct_fetch, 'LINKEDIN_GUEST_JOB_URL',
+                        f"{standin.base_url}/jobs-guest/jobs/api/jobPosting/{{job_id}}")
+    previous = _previous(first_scrape)
+    if description_hash != 'same':
+        previous['description_hash'] = description_hash
+
+    result = direct_fetch.extract_company_info(standin.job_url(), fetch_mode='guest', previous=previous)
+
+    assert standin.paths[-1] == f"/jobs-guest/jobs/api/jobPosting/{JOB_ID}"
+    assert bool(result.get('unchanged')) == (description_hash == 'same')
+    # O fragmento não tem os validadores da página: os anteriores continuam valendo
+    assert result['etag'] == '"v1"'
@@ -0,0 +1,99 @@
+import pytest
+import requests
+
+from conftest import JOB_ID, SAMPLE_PAGE
+from linkedin_scraper import (CLASSIFY_HEAD_SIZE, BlockedPage, ExpiredPosting, RetryLater, _check_body,
+                              _check_response)
+
+
+def _response(status_code=200, url='https://www.linkedin.com/jobs/view/4197948497', history=()):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = url
+    response.history = list(history)
+    return response
+
+
+@pytest.mark.parametrize('body', [
+    b'<html><head><title>Sign In | LinkedIn</title></head><body>' + b'x' * 4096,
+    b'<html><head><title>Verifica\xc3\xa7\xc3\xa3o de seguran\xc3\xa7a</title></head>' + b'x' * 4096,
+    b'<html><body><div id="captcha-internal"></div>' + b'x' * 4096,
+    b'<html><body><script src="https://www.google.com/recaptcha/api.js"></script><div class="g-recaptcha">',
+])
+def test_login_and_captcha_pages_are_blocked(body):
+    with pytest.raises(BlockedPage):
+        _check_body(_response(), body)
+
+
+@pytest.mark.parametrize('marker', [
+    b'No longer accepting applications',
+    b'<div class="closed-job">',
+    b'Esta vaga n\xc3\xa3o est\xc3\xa1 mais dispon\xc3\xadvel',
+])
+def test_closed_postings_are_expired(marker):
+    with pytest.raises(ExpiredPosting):
+        _check_body(_response(), b'<html><body><section class="top-card-layout">' + marker)
+
+
+def test_small_complete_body_without_job_markers_is_blocked():
+    with pytest.raises(BlockedPage):
+        _check_body(_response(), b'<html><body>Too many requests</body></html>', complete=True)
+    # Incompleto (o resto ainda vai chegar) ou com marcadores de vaga: não é bloqueio
+    _check_body(_response(), b'<html><body>Too many requests</body></html>')
+    _check_body(_response(), b'<html><body><div class="description__text">ok</div></body></html>', complete=True)
+
+
+def test_title_is_only_checked_at_the_head_of_the_body():
+    chunk = b'<title>Sign In | LinkedIn</title>'
+    with pytest.raises(BlockedPage):
+        _check_body(_response(), chunk, offset=CLASSIFY_HEAD_SIZE - 1)
+    _check_body(_response(), chunk, offset=CLASSIFY_HEAD_SIZE)
+
+
+def test_job_page_and_non_200_responses_pass():
+    with open(SAMPLE_PAGE, 'rb') as f:
+        body = f.read()
+    _check_body(_response(), body, complete=True)
+    _check_body(_response(status_code=304), b'', complete=True)
+    _check_body(_response(status_code=500), b'<div class="g-recaptcha">')
+
+
+@pytest.mark.parametrize('status_code', [429, 999])
+def test_throttle_status_is_blocked(status_code):
+    with pytest.raises(BlockedPage):
+        _check_response(_response(status_code))
+
+
+@pytest.mark.parametrize('status_code', [404, 410])
+def test_missing_posting_is_expired(status_code):
+    with pytest.raises(ExpiredPosting):
+        _check_response(_response(status_code))
+
+
+def test_redirect_to_authwall_is_blocked():
+    redirect = _response(302)
+    with pytest.raises(BlockedPage):
+        _check_response(_response(url='https://www.linkedin.com/authwall?trk=x', history=[redirect]))
+    _check_response(_response(url='https://www.linkedin.com/jobs/view/4197948497', history=[redirect]))
+
+
+def test_expired_posting_keeps_previous_row(standin, direct_fetch):
+    standin.fail(f'/jobs/view/{JOB_ID}', 1, status=404)
+    previous = {'row': {'company_name': 'NEORIS', 'job_title': 'Dev'}, 'description_hash': 'h'}
+
+    result = direct_fetch.extract_company_info(standin.job_url(), fetch_mode='page', previous=previous, attempt=0)
+
+    assert result['expired'] is True
+    assert result['company_name'] == 'NEORIS'
+    assert direct_fetch.scrape_stats.snapshot()['expired_postings'] == 1
+
+
+def test_blocked_attempt_goes_back_to_the_retry_queue(standin, direct_fetch):
+    standin.fail(f'/jobs/view/{JOB_ID}', 1, status=429)
+
+    with pytest.raises(RetryLater):
+        direct_fetch.extract_company_info(standin.job_url(), fetch_mode='page', attempt=0)
+    assert direct_fetch.scrape_stats.snapshot()['blocked_pages'] == 1
+
+    result = direct_fetch.extract_company_info(standin.job_url(), fetch_mode='page', attempt=1)
+    assert result['company_name'] == 'NEORIS'
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+import linkedin_scraper
+
+
+@pytest.fixture
+def scraper(direct_fetch, monkeypatch):
+    # URLs do servidor local: sem a normalização para www.linkedin.com
+    monkeypatch.setattr(direct_fetch, 'normalize_linkedin_url', lambda url: url)
+    return direct_fetch
+
+
+def test_retry_delay_grows_exponentially_up_to_the_limit(monkeypatch):
+    # Jitter completo: a espera é sorteada entre 0 e o limite da tentativa
+    monkeypatch.setattr(linkedin_scraper.random, 'uniform', lambda low, high: (low, high))
+    base = linkedin_scraper.RETRY_BACKOFF_BASE
+    assert linkedin_scraper._retry_delay(0) == (0, base)
+    assert linkedin_scraper._retry_delay(1) == (0, base * 2)
+    assert linkedin_scraper._retry_delay(3) == (0, base * 8)
+    assert linkedin_scraper._retry_delay(20) == (0, linkedin_scraper.RETRY_BACKOFF_MAX)
+
+
+def test_failed_url_is_requeued_without_blocking_the_others(standin, scraper, monkeypatch):
+    monkeypatch.setattr(scraper, '_retry_delay', lambda attempt: 0.3)
+    urls = [standin.job_url(4197948490 + n) for n in range(6)]
+    standin.fail('/jobs/view/4197948490', times=2)
+    finished = []
+
+    started_at = time.monotonic()
+    df = scraper.process_linkedin_urls(urls, max_workers=2, on_result=lambda result: finished.append(result['link']))
+    elapsed = time.monotonic() - started_at
+
+    assert len(df) == 6
+    assert set(df['company_name']) == {'NEORIS'}
+    # As vagas saudáveis terminaram enquanto a que falhou esperava na fila
+    assert finished[-1] == urls[0]
+    assert elapsed >= 0.6
+    assert standin.paths.count('/jobs/view/4197948490') == 3
+    assert scraper.scrape_stats.snapshot()['deferred_retries'] == 2
+    history = scraper.scrape_stats.attempt_snapshot()[urls[0]]
+    assert [entry[0] for entry in history] == [0, 1, 2]
+
+
+def test_url_gives_error_row_after_the_last_attempt(standin, scraper, monkeypatch):
+    monkeypatch.setattr(scraper, '_retry_delay', lambda attempt: 0.01)
+    url = standin.job_url()
+    standin.fail('/jobs/view/4197948497', times=100)
+
+    df = scraper.process_linkedin_urls([url], max_workers=1)
+
+    assert df['company_name'][0].startswith('Error:')
+    assert standin.paths.count('/jobs/view/4197948497') == scraper.FETCH_MAX_ATTEMPTS
+    assert scraper.scrape_stats.snapshot()['deferred_retries'] == scraper.FETCH_MAX_ATTEMPTS - 1
@@ -0,0 +1,92 @@
+import importlib
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def main_module(tmp_path_factory):
+    """main.py importado com um banco SQLite temporário no lugar do PostgreSQL"""
+    database = tmp_path_factory.mktemp('db') / 'scraper.sqlite3'
+    previous = os.environ.get('DATABASE_URL')
+    os.environ['DATABASE_URL'] = f'sqlite:///{database}'
+    try:
+        return importlib.import_module('main')
+    finally:
+        if previous is None:
+            os.environ.pop('DATABASE_URL')
+        else:
+            os.environ['DATABASE_URL'] = previous
+
+
+@pytest.fixture
+def app_context(main_module):
+    from models import ScrapedJob, db
+
+    with main_module.app.app_context():
+        ScrapedJob.query.delete()
+        db.session.commit()
+        yield db
+
+
+def test_mark_scraped_inserts_and_updates(app_context):
+    from models import ScrapedJob
+
+    first = datetime(2025, 6, 1, 12, 0)
+    ScrapedJob.mark_scraped({'1': 'https://www.linkedin.com/jobs/view/1'}, scraped_at=first)
+    app_context.session.commit()
+    ScrapedJob.mark_scraped({'1': 'https://www.linkedin.com/jobs/view/1',
+                             '2': 'https://www.linkedin.com/jobs/view/2'}, scraped_at=first + timedelta(days=1))
+    app_context.session.commit()
+
+    job = app_context.session.get(ScrapedJob, '1')
+    assert job.scrape_count == 2
+    assert job.last_scraped_at == first + timedelta(days=1)
+    assert app_context.session.get(ScrapedJob, '2').scrape_count == 1
+
+
+def test_fresh_job_ids_uses_the_cutoff(app_context):
+    from models import ScrapedJob
+
+    now = datetime.utcnow()
+    ScrapedJob.mark_scraped({'old': 'u-old'}, scraped_at=now - timedelta(days=10))
+    ScrapedJob.mark_scraped({'new': 'u-new'}, scraped_at=now - timedelta(hours=1))
+    app_context.session.commit()
+
+    assert ScrapedJob.fresh_job_ids(['old', 'new', 'unknown'], now - timedelta(days=1)) == {'new'}
+    assert ScrapedJob.fresh_job_ids([], now) == set()
+
+
+def test_fresh_job_ids_queries_in_chunks(app_context, monkeypatch):
+    from models import ScrapedJob
+
+    monkeypatch.setattr(ScrapedJob, 'QUERY_CHUNK_SIZE', 3)
+    now = datetime.utcnow()
+    ScrapedJob.mark_scraped({str(n): f'u{n}' for n in range(10)}, scraped_at=now)
+    app_context.session.commit()
+
+    assert ScrapedJob.fresh_job_ids([str(n) for n in range(0, 12, 2)], now - timedelta(hours=1)) == \
+        {'0', '2', '4', '6', '8'}
+
+
+def test_filter_skips_fresh_jobs_and_duplicate_ids(main_module, app_context):
+    from models import ScrapedJob
+
+    ScrapedJob.mark_scraped({'4100000001': 'https://www.linkedin.com/jobs/view/4100000001'})
+    app_context.session.commit()
+    urls = [
+        'https://www.linkedin.com/jobs/view/4100000001',
+        'https://www.linkedin.com/jobs/view/4100000002?refId=abc',
+        'https://br.linkedin.com/jobs/view/4100000002/?trk=public_jobs',
+        'https://example.com/sem-id',
+    ]
+
+    selected, skipped = main_module.filter_new_or_stale_urls(urls, freshness_hours=24)
+
+    assert skipped == 1
+    assert selected == ['https://www.linkedin.com/jobs/view/4100000002?refId=abc', 'https://example.com/sem-id']
+    # Janela 0: nada é pulado, mas as duplicatas continuam de fora
+    selected, skipped = main_module.filter_new_or_stale_urls(urls, freshness_hours=0)
+    assert skipped == 0
+    assert len(selected) == 3
@@ -0,0 +1,102 @@
+import io
+
+import pytest
+import requests
+
+import linkedin_scraper
+from conftest import SAMPLE_PAGE
+
+FIELDS = ('company_name', 'job_title', 'job_description', 'city', 'announced_at', 'description_hash')
+
+
+@pytest.fixture(scope='module')
+def sample_body():
+    with open(SAMPLE_PAGE, 'rb') as f:
+        return f.read()
+
+
+def _response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = 'https://www.linkedin.com/jobs/view/4197948497'
+    response.headers['Content-Type'] = 'text/html; charset=utf-8'
+    response.raw = io.BytesIO(body)
+    return response
+
+
+def _fields(page):
+    _, parsed = linkedin_scraper._parse_inline(page, 'https://www.linkedin.com/jobs/view/4197948497')
+    return {field: parsed[field] for field in FIELDS}
+
+
+def test_body_reader_stops_after_description(sample_body):
+    page, stopped = linkedin_scraper._stream_job_body(_response(sample_body))
+
+    assert stopped is True
+    assert len(page.body) < len(sample_body) // 2
+    assert sample_body.startswith(page.body)
+    # A parte lida já tem todos os campos da página inteira
+    assert _fields(page) == _fields(linkedin_scraper.RawPage(sample_body, 'utf-8'))
+
+
+def test_body_reader_without_stop_reads_everything(sample_body):
+    page, stopped = linkedin_scraper._stream_job_body(_response(sample_body), stop_early=False)
+
+    assert stopped is False
+    assert page.body == sample_body
+
+
+def test_tree_reader_stops_after_top_card_and_description(sample_body):
+    (tree, body, encoding), stopped = linkedin_scraper._stream_job_tree(_response(sample_body))
+
+    assert stopped is True
+    assert len(body) < len(sample_body) // 2
+    assert encoding.lower() == 'utf-8'
+    assert _fields(tree) == _fields(linkedin_scraper.RawPage(sample_body, 'utf-8'))
+
+
+def test_tree_reader_without_stop_reads_everything(sample_body):
+    (_, body, _), stopped = linkedin_scraper._stream_job_tree(_response(sample_body), stop_early=False)
+
+    assert stopped is False
+    assert body == sample_body
+
+
+def test_page_without_description_is_read_to_the_end(sample_body):
+    body = sample_body.replace(b'description__text', b'sem-descricao')
+    page, stopped = linkedin_scraper._stream_job_body(_response(body))
+
+    assert stopped is False
+    assert page.body == body
+
+
+def test_fetch_records_early_stop(standin, direct_fetch, monkeypatch):
+    monkeypatch.setattr(direct_fetch, 'STREAMING_FETCH', True)
+    url = standin.job_url()
+
+    result = direct_fetch.extract_company_info(url, fetch_mode='page')
+
+    assert result['company_name'] == 'NEORIS'
+    bytes_read, content_length, stopped_early = direct_fetch.scrape_stats.transfers[url]
+    assert stopped_early is True
+    assert content_length == len(standin.page_body)
+    assert bytes_read < content_length
+
+
+def test_page_archive_reads_the_whole_page(standin, direct_fetch, monkeypatch):
+    archived = []
+
+    class Archive:
+        def append(self, job_id, html_text, kind):
+            archived.append(html_text)
+
+    monkeypatch.setattr(direct_fetch, 'STREAMING_FETCH', True)
+    monkeypatch.setattr(direct_fetch, 'get_page_archive', lambda: Archive())
+    url = standin.job_url()
+
+    direct_fetch.extract_company_info(url, fetch_mode='page')
+
+    bytes_read, content_length, stopped_early = direct_fetch.scrape_stats.transfers[url]
+    assert stopped_early is False
+    assert bytes_read == content_length
+    assert archived == [standin.page_body.decode('utf-8')]